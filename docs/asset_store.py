@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from resource_model import Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+RESOURCES_DIR = Path("assets/resources")        # per-submission folders from CataLogger ZIPs
+STORE_DIR = Path("assets/store")                # content-addressed figures
+MANIFEST_FILE = STORE_DIR / "manifest.json"     # <stem>/<fig id> -> stored blob
+
+HASH_CHARS = 20          # hex chars of the sha256 used in file names (80 bits)
+CHUNK_SIZE = 1 << 20     # hash / copy files in 1 MiB chunks
+
+# Same naming convention as the CataLogger ZIP export: <stem>_fig<ID>.<ext>
+FIGURE_NAME_RE = re.compile(r"^(?P<stem>.+)_fig(?P<id>\d+)(?P<ext>\.[A-Za-z0-9]+)$")
+
+logger = logging.getLogger("asset_store")
+
+
+# -------------------------------------------------
+# HASHING + STORAGE
+# -------------------------------------------------
+def hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def store_path_for(digest: str, ext: str) -> Path:
+    """
+    assets/store/<first 2 hex>/<HASH_CHARS hex><ext>
+    """
+    return STORE_DIR / digest[:2] / f"{digest[:HASH_CHARS]}{ext.lower()}"
+
+
+def store_url(store_path: Path) -> str:
+    """
+    Site URL of a stored blob. The name changes whenever the content does,
+    so these URLs can be served with an immutable, far-future cache policy.
+    """
+    return "/" + Path(store_path).as_posix()
+
+
+def _atomic_write(target: Path, write) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def store_file(path: Path) -> Tuple[str, Path]:
+    """
+    Copy a file into the store (once per distinct content).
+    Returns (sha256 hex digest, store path).
+    """
+    path = Path(path)
+    digest = hash_file(path)
+    target = store_path_for(digest, path.suffix)
+    if not target.exists():
+        def _copy(out):
+            with open(path, "rb") as src:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+
+        _atomic_write(target, _copy)
+    return digest, target
+
+
+def store_bytes(data: bytes, ext: str) -> Tuple[str, Path]:
+    """
+    Same as store_file for in-memory content (e.g. fresh uploads).
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    target = store_path_for(digest, ext)
+    if not target.exists():
+        _atomic_write(target, lambda out: out.write(data))
+    return digest, target
+
+
+# -------------------------------------------------
+# MANIFEST
+# -------------------------------------------------
+def figure_key(stem: str, fig_id: Any) -> str:
+    return f"{stem}/{fig_id}"
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Figure manifest: {"<stem>/<fig id>": {"hash", "path", "bytes"}}.
+    Missing manifest -> empty (the build then falls back to per-resource files).
+    """
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")).get("figures", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(figures: Dict[str, Dict[str, Any]], path: Path = MANIFEST_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": 1, "figures": dict(sorted(figures.items()))}
+    path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+
+
+def scan_files(root: Path) -> Set[str]:
+    """
+    One walk over a tree; returns POSIX paths relative to root.
+    """
+    found: Set[str] = set()
+    root = Path(root)
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root)
+        for name in filenames:
+            found.add((rel_dir / name).as_posix())
+    return found
+
+
+def ingest(
+    resources_dir: Path = RESOURCES_DIR,
+    manifest_path: Path = MANIFEST_FILE,
+    prune: bool = False,
+) -> Dict[str, Any]:
+    """
+    Move every <stem>_fig<ID>.<ext> under resources_dir into the store and
+    record it in the manifest. Identical images are stored once.
+    With prune=True the per-resource copies are deleted afterwards.
+    """
+    figures = load_manifest(manifest_path)
+    stats = {"figures": 0, "new_blobs": 0, "deduplicated": 0, "pruned": 0}
+    seen_digests = {entry["hash"] for entry in figures.values()}
+
+    for rel in sorted(scan_files(resources_dir)):
+        m = FIGURE_NAME_RE.match(Path(rel).name)
+        if not m:
+            continue
+        src = Path(resources_dir) / rel
+        digest, target = store_file(src)
+
+        stats["figures"] += 1
+        if digest in seen_digests:
+            stats["deduplicated"] += 1
+        else:
+            stats["new_blobs"] += 1
+            seen_digests.add(digest)
+
+        figures[figure_key(m.group("stem"), m.group("id"))] = {
+            "hash": digest,
+            "path": target.as_posix(),
+            "bytes": src.stat().st_size,
+        }
+        if prune:
+            src.unlink()
+            stats["pruned"] += 1
+
+    save_manifest(figures, manifest_path)
+    return stats
+
+
+# -------------------------------------------------
+# BUILD-TIME VALIDATION
+# -------------------------------------------------
+def figure_file_index(
+    resources_dir: Path = RESOURCES_DIR, store_dir: Path = STORE_DIR
+) -> Tuple[Set[str], Set[str]]:
+    """
+    (stored blob paths, legacy per-resource files) from exactly one walk per
+    tree, instead of one stat per figure.
+    """
+    stored = {f"{store_dir.as_posix()}/{p}" for p in scan_files(store_dir)} if store_dir.exists() else set()
+    legacy = scan_files(resources_dir) if resources_dir.exists() else set()
+    return stored, legacy
+
+
+def resolve_figure_urls(
+    all_resources: Dict[str, List["Resource"]],
+    manifest: Dict[str, Dict[str, Any]],
+    resources_dir: Path = RESOURCES_DIR,
+    store_dir: Path = STORE_DIR,
+    file_index: Optional[Tuple[Set[str], Set[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Resolve every figure reference in one pass and set fig.url.
+
+    A figure resolves to its hashed store URL if the manifest lists it and
+    the blob exists, else to the legacy /assets/resources/<stem>/... file if
+    that exists. Unresolvable references get url = None and are returned
+    as a list of broken references. Pass file_index (figure_file_index())
+    to reuse one scan across several calls.
+    """
+    stored, legacy = file_index or figure_file_index(resources_dir, store_dir)
+
+    broken: List[Dict[str, Any]] = []
+    for group in all_resources.values():
+        for res in group:
+            stem = res.file_stem
+            for fig in res.figures:
+                fig_id, ext = fig.id, fig.ext
+                fig.resolved = True
+
+                entry = manifest.get(figure_key(stem, fig_id))
+                if entry and entry.get("path") in stored:
+                    fig.url = store_url(entry["path"])
+                    continue
+
+                legacy_rel = f"{stem}/{stem}_fig{fig_id}{ext}"
+                if fig_id and ext and legacy_rel in legacy:
+                    fig.url = f"/{Path(resources_dir).as_posix()}/{legacy_rel}"
+                    continue
+
+                fig.url = None
+                broken.append(
+                    {
+                        "resource": res.file_path,
+                        "figure_id": fig_id,
+                        "expected": legacy_rel if ext else f"{stem}/{stem}_fig{fig_id}.<ext>",
+                    }
+                )
+    return broken
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Content-addressed figure store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="Hash figures into assets/store and update the manifest.")
+    p_ingest.add_argument("--prune", action="store_true", help="Delete per-resource copies once stored.")
+
+    sub.add_parser("check", help="Report figure references that resolve to no file.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    if args.command == "ingest":
+        stats = ingest(prune=args.prune)
+        logger.info(
+            "Stored %d figure(s): %d new blob(s), %d duplicate(s), %d pruned. Manifest: %s",
+            stats["figures"], stats["new_blobs"], stats["deduplicated"], stats["pruned"], MANIFEST_FILE,
+        )
+    else:
+        from generate_docs import load_all_resources
+
+        broken = resolve_figure_urls(load_all_resources(RESOURCES_DIR), load_manifest())
+        for b in broken:
+            logger.warning("Broken figure %s in %s (expected %s)", b["figure_id"], b["resource"], b["expected"])
+        logger.info("%d broken figure reference(s).", len(broken))
+        if broken:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# -------------------------------------------------
+# BUILD PROFILER
+# -------------------------------------------------
+class BuildProfiler:
+    """
+    Collects per-stage and per-page timings for a generator run.
+
+    Stages can be entered many times (e.g. "render" once per page); their
+    wall time, CPU time and call count are accumulated, and the tracemalloc
+    peak is the highest peak seen in any single entry of that stage.
+
+    A disabled profiler keeps the same interface but records nothing, so the
+    generator can call it unconditionally without paying for tracemalloc.
+    """
+
+    def __init__(self, enabled: bool = False, cprofile_path: Optional[Path] = None):
+        self.enabled = enabled
+        self.cprofile_path = Path(cprofile_path) if cprofile_path else None
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.pages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self._profile: Optional[cProfile.Profile] = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._overall_peak = 0
+
+    # --- lifecycle -------------------------------------------------
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        tracemalloc.start()
+        if self.cprofile_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.stages["total"] = {
+            "calls": 1,
+            "wall_s": time.perf_counter() - self._wall_start,
+            "cpu_s": time.process_time() - self._cpu_start,
+            "peak_mem_bytes": max(self._overall_peak, tracemalloc.get_traced_memory()[1]),
+        }
+        if self._profile is not None:
+            self._profile.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profile.dump_stats(str(self.cprofile_path))
+        tracemalloc.stop()
+
+    # --- measurements ----------------------------------------------
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time one entry into a named stage.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        # Remember the overall peak so the per-stage reset does not lose it.
+        self._overall_peak = max(self._overall_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            _, peak = tracemalloc.get_traced_memory()
+
+            entry = self.stages.setdefault(
+                name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_mem_bytes": 0}
+            )
+            entry["calls"] += 1
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            entry["peak_mem_bytes"] = max(entry["peak_mem_bytes"], peak)
+
+    def record_page(self, page_id: str, seconds: float) -> None:
+        if self.enabled:
+            self.pages[page_id] = self.pages.get(page_id, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # --- reporting -------------------------------------------------
+    def slowest_pages(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        ranked = sorted(self.pages.items(), key=lambda kv: kv[1], reverse=True)
+        return [{"page_id": pid, "seconds": round(sec, 6)} for pid, sec in ranked[:top_n]]
+
+    def report(self, top_n: int = 10) -> Dict[str, Any]:
+        stages = {
+            name: {
+                "calls": int(v["calls"]),
+                "wall_s": round(v["wall_s"], 6),
+                "cpu_s": round(v["cpu_s"], 6),
+                "peak_mem_bytes": int(v["peak_mem_bytes"]),
+            }
+            for name, v in self.stages.items()
+        }
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "stages": stages,
+            "counters": dict(self.counters),
+            "pages_rendered": len(self.pages),
+            "slowest_pages": self.slowest_pages(top_n),
+            "cprofile": str(self.cprofile_path) if self.cprofile_path else None,
+        }
+
+    def write_report(self, path: Path, top_n: int = 10) -> Dict[str, Any]:
+        report = self.report(top_n)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return report
+
+    def summary_lines(self, top_n: int = 10) -> List[str]:
+        """
+        Human-readable summary for the log.
+        """
+        lines = []
+        for name, v in self.report(top_n)["stages"].items():
+            lines.append(
+                f"{name:<16} calls={v['calls']:<5} wall={v['wall_s']:.3f}s "
+                f"cpu={v['cpu_s']:.3f}s peak={v['peak_mem_bytes'] / 1024:.0f} KiB"
+            )
+        for p in self.slowest_pages(top_n):
+            lines.append(f"slow page {p['page_id']}: {p['seconds'] * 1000:.1f} ms")
+        return lines
+
+
+def print_cprofile_stats(path: Path, limit: int = 25) -> None:
+    """
+    Convenience for inspecting a cProfile dump written by --cprofile.
+    """
+    pstats.Stats(str(path)).sort_stats("cumulative").print_stats(limit)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python build_profile.py <cprofile dump> [limit]")
+        sys.exit(1)
+    print_cprofile_stats(Path(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) > 2 else 25)
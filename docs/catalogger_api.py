@@ -0,0 +1,500 @@
+import argparse
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from io import BytesIO
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from wsgiref.simple_server import WSGIServer, make_server
+
+from catalogger_core import (
+    CATALOG,
+    LANGUAGE_OPTIONS,
+    apply_language_to_prefix,
+    build_yaml_text,
+    build_zip_bytes,
+    resolve_page,
+    slugify,
+    strip_numeric_prefix,
+    yaml_to_pdf_bytes,
+)
+from pdf_render_pool import FigureBytes
+from resource_schema import decode_resource
+from upload_limits import MAX_FIGURES, MAX_FILE_MB, MAX_PIXELS, image_dimensions
+from worker_pool import WorkerPool
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"       # local API; put a proxy with TLS in front to expose it
+DEFAULT_PORT = 8502
+ARTIFACT_DIR = Path(os.environ.get("CATALOGGER_API_STORE", "api_artifacts"))
+RECORDS_DIR = "requests"         # ARTIFACT_DIR/requests/<request key>.json
+API_TOKEN = os.environ.get("CATALOGGER_API_TOKEN", "")   # if set, required as "Authorization: Bearer <token>"
+
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_BATCH = 100                  # submissions per request
+MAX_REQUEST_MB = 200
+JOB_TIMEOUT_S = 300
+
+SUBMISSION_TYPES = ("Streamlit app", "Jupyter Notebook", "Other")
+STREAMLIT_FLAGS = {               # flag -> count field, as asked by the form
+    "multipage_app": "num_pages",
+    "interactive_plots": "num_interactive_plots",
+    "assessments_included": "num_assessment_questions",
+    "videos_included": "num_videos",
+}
+ARTIFACT_RE = re.compile(r"^/v1/artifacts/(?P<name>[0-9a-f]{64}\.(?:yaml|pdf|zip))$")
+CONTENT_TYPES = {".yaml": "text/yaml; charset=utf-8", ".pdf": "application/pdf", ".zip": "application/zip"}
+
+logger = logging.getLogger("catalogger_api")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# -------------------------------------------------
+# REQUEST PAYLOAD
+# -------------------------------------------------
+def _text(item: Dict[str, Any], field: str, required: bool = False) -> str:
+    value = item.get(field, "")
+    if not isinstance(value, str):
+        raise ApiError(422, f"'{field}' must be a string")
+    if required and not value.strip():
+        raise ApiError(422, f"'{field}' is required")
+    return value.strip()
+
+
+def _string_list(item: Dict[str, Any], field: str) -> List[str]:
+    value = item.get(field, [])
+    if isinstance(value, str):
+        value = [v for v in value.split(",")]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ApiError(422, f"'{field}' must be a list of strings")
+    return [v.strip() for v in value if v.strip()]
+
+
+def _decode_figure(index: int, fig: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(fig.get("filename") or f"figure_{index}.png")
+    if Path(name).suffix.lower() not in (".png", ".jpg", ".jpeg"):
+        raise ApiError(422, f"figure {index}: only PNG and JPEG files are accepted")
+    try:
+        data = base64.b64decode(fig.get("data") or "", validate=True)
+    except (binascii.Error, TypeError):
+        raise ApiError(422, f"figure {index}: 'data' must be base64") from None
+    if len(data) > MAX_FILE_MB * 1024 * 1024:
+        raise ApiError(422, f"figure {index}: larger than {MAX_FILE_MB} MB")
+    dims = image_dimensions(BytesIO(data))
+    if dims is None:
+        raise ApiError(422, f"figure {index}: not a readable PNG or JPEG image")
+    if dims[0] * dims[1] > MAX_PIXELS:
+        raise ApiError(422, f"figure {index}: {dims[0]} x {dims[1]} px is above {MAX_PIXELS // 1_000_000} megapixels")
+    return {
+        "name": name,
+        "data": data,
+        "type": str(fig.get("type") or ""),
+        "caption": str(fig.get("caption") or "").strip(),
+        "is_cover": bool(fig.get("is_cover", False)),
+    }
+
+
+def parse_submission(item: Any) -> Dict[str, Any]:
+    """
+    Validate one submission of the API and normalize it to the values the
+    CataLogger form collects. Placement must name an existing catalog page.
+    """
+    if not isinstance(item, dict):
+        raise ApiError(422, "a submission must be a JSON object")
+
+    language = _text(item, "language") or "English"
+    if language not in LANGUAGE_OPTIONS:
+        raise ApiError(422, f"'language' must be one of {', '.join(LANGUAGE_OPTIONS)}")
+
+    placement = item.get("placement") or {}
+    if not isinstance(placement, dict):
+        raise ApiError(422, "'placement' must be an object {category, subcategory, subsubcategory}")
+    category = str(placement.get("category") or "")
+    subcategory = str(placement.get("subcategory") or "(Category homepage)")
+    # same defaults as the form's selectboxes
+    default_subsub = "" if subcategory == "(Category homepage)" else "(Attach to subcategory)"
+    subsubcategory = str(placement.get("subsubcategory") or default_subsub)
+    try:
+        page_id, topic_title = resolve_page(category, subcategory, subsubcategory)
+    except KeyError:
+        raise ApiError(422, "'placement' does not name a catalog page (see GET /v1/catalog)") from None
+
+    submission_type = _text(item, "type") or "Streamlit app"
+    if submission_type not in SUBMISSION_TYPES:
+        raise ApiError(422, f"'type' must be one of {', '.join(SUBMISSION_TYPES)}")
+
+    authors = item.get("authors") or []
+    if not isinstance(authors, list) or not any(isinstance(a, dict) and a.get("name") for a in authors):
+        raise ApiError(422, "'authors' must list at least one {name, affiliation}")
+
+    streamlit = item.get("streamlit") or {}
+    if not isinstance(streamlit, dict):
+        raise ApiError(422, "'streamlit' must be an object of app flags and counts")
+    app_details: Dict[str, Any] = {}
+    for flag, count in STREAMLIT_FLAGS.items():
+        enabled = submission_type == "Streamlit app" and bool(streamlit.get(flag, False))
+        app_details[flag] = enabled
+        try:
+            app_details[count] = max(1, int(streamlit.get(count) or 1)) if enabled else 0
+        except (TypeError, ValueError):
+            raise ApiError(422, f"'streamlit.{count}' must be a number") from None
+
+    figures = item.get("figures") or []
+    if not isinstance(figures, list) or len(figures) > MAX_FIGURES:
+        raise ApiError(422, f"'figures' must be a list of at most {MAX_FIGURES} figures")
+
+    return {
+        "language_label": language,
+        "lang_code": LANGUAGE_OPTIONS[language],
+        "placement": [category, subcategory, subsubcategory],
+        "page_id": page_id,
+        "topic_title": topic_title,
+        "resource_title": _text(item, "title", required=True),
+        "submission_type": submission_type,
+        "access_url": _text(item, "access_url", required=True),
+        "description_short": _text(item, "description"),
+        "keywords": _string_list(item, "keywords"),
+        "time_required": _text(item, "time_required"),
+        "prerequisites": _text(item, "prerequisites"),
+        "fit_for": _string_list(item, "fit_for"),
+        "references": _string_list(item, "references"),
+        "authors": [
+            {"name": str(a.get("name") or ""), "affiliation": str(a.get("affiliation") or "")}
+            for a in authors if isinstance(a, dict)
+        ],
+        "app": app_details,
+        "figures": [_decode_figure(i, f if isinstance(f, dict) else {}) for i, f in enumerate(figures, start=1)],
+    }
+
+
+def submission_key(sub: Dict[str, Any]) -> str:
+    """
+    Content address of a submission: its normalized fields plus the hash of
+    every figure. Repeating a request gives the same key.
+    """
+    fields = {k: v for k, v in sub.items() if k != "figures"}
+    fields["figures"] = [
+        {**{k: v for k, v in f.items() if k != "data"}, "sha256": hashlib.sha256(f["data"]).hexdigest()}
+        for f in sub["figures"]
+    ]
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------
+# ARTIFACT STORE
+# -------------------------------------------------
+def _atomic_write(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as out:
+        out.write(data)
+    os.replace(tmp, target)
+
+
+def put_artifact(data: bytes, ext: str, store_dir: Path = ARTIFACT_DIR) -> str:
+    """
+    Store bytes under their sha256; returns the artifact name.
+    """
+    name = hashlib.sha256(data).hexdigest() + ext
+    target = Path(store_dir) / name
+    if not target.exists():
+        _atomic_write(target, data)
+    return name
+
+
+def load_record(key: str, store_dir: Path = ARTIFACT_DIR) -> Optional[Dict[str, Any]]:
+    """
+    The result of an earlier identical request, if all its artifacts still exist.
+    """
+    try:
+        record = json.loads((Path(store_dir) / RECORDS_DIR / f"{key}.json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if all((Path(store_dir) / name).exists() for name in record["artifacts"].values()):
+        return record
+    return None
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+def build_submission(sub: Dict[str, Any], key: str, store_dir: Path = ARTIFACT_DIR) -> Dict[str, Any]:
+    """
+    YAML, PDF and ZIP for one submission, exactly as the CataLogger form
+    builds them for an existing catalog page. Runs in a worker process.
+    """
+    t0 = time.perf_counter()
+    category, subcategory, subsubcategory = sub["placement"]
+    figures_meta = [
+        {"id": i, "original_filename": f["name"], "type": f["type"], "caption": f["caption"], "is_cover": f["is_cover"]}
+        for i, f in enumerate(sub["figures"], start=1)
+    ]
+    app = sub["app"]
+    yaml_text = build_yaml_text(
+        topic_title=strip_numeric_prefix(sub["topic_title"]),
+        resource_title=sub["resource_title"],
+        resource_type=sub["submission_type"],
+        access_url=sub["access_url"],
+        description_short=sub["description_short"],
+        keywords_list=sub["keywords"],
+        time_required=sub["time_required"],
+        prerequisites_text=sub["prerequisites"],
+        fit_for_list=sub["fit_for"],
+        authors=sub["authors"],
+        figures_meta=figures_meta,
+        references_list=sub["references"],
+        catalog_category=category,
+        catalog_subcategory=subcategory,
+        catalog_subsubcategory=subsubcategory or "—",
+        **app,
+    )
+
+    prefix_with_lang = apply_language_to_prefix(sub["page_id"], sub["lang_code"])
+    first_author = next((a["name"] for a in sub["authors"] if a["name"].strip()), "")
+    base_name = f"{prefix_with_lang}_{slugify(first_author or 'unknown')}_{time.strftime('%Y%m%d_%H%M%S')}"
+    filename = f"{base_name}.yaml"
+    figures = [FigureBytes(f["name"], f["data"]) for f in sub["figures"]]
+
+    artifacts = {
+        "yaml": put_artifact(yaml_text.encode("utf-8"), ".yaml", store_dir),
+        "pdf": put_artifact(yaml_to_pdf_bytes(yaml_text, sub["language_label"], figures), ".pdf", store_dir),
+    }
+    if figures:
+        artifacts["zip"] = put_artifact(build_zip_bytes(filename, yaml_text, base_name, figures), ".zip", store_dir)
+
+    _, schema_errors = decode_resource(yaml_text)
+    record = {
+        "key": key,
+        "base_name": base_name,
+        "filename": filename,
+        "page_id": sub["page_id"],
+        "artifacts": artifacts,
+        "schema_errors": [str(e) for e in schema_errors],
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    _atomic_write(Path(store_dir) / RECORDS_DIR / f"{key}.json", json.dumps(record, indent=1).encode("utf-8"))
+    return record
+
+
+class SubmissionProcessor:
+    """
+    Worker pool shared by all requests of a server process. Identical
+    submissions (same key) that are in flight share one job; finished
+    ones are served from the artifact store without any rendering.
+    """
+
+    def __init__(self, store_dir: Path = ARTIFACT_DIR, max_workers: int = MAX_WORKERS):
+        self.store_dir = Path(store_dir)
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def _submit(self, key: str, sub: Dict[str, Any]) -> Future:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                if self._pool is None:
+                    self._pool = WorkerPool(max_workers=self.max_workers)
+                # by module name: pool workers never import __main__ (see worker_pool)
+                import catalogger_api
+
+                future = self._pool.submit(catalogger_api.build_submission, sub, key, self.store_dir)
+                self._in_flight[key] = future
+                future.add_done_callback(lambda f, key=key: self._in_flight.pop(key, None))
+        return future
+
+    def process(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """
+        One result per item, in order: status "cached", "created" or "error".
+        All uncached submissions are queued before the first is awaited.
+        """
+        results: List[Dict[str, Any]] = [{} for _ in items]
+        jobs: List[Tuple[int, Future]] = []
+        for i, item in enumerate(items):
+            try:
+                sub = parse_submission(item)
+                key = submission_key(sub)
+                record = load_record(key, self.store_dir)
+                if record is not None:
+                    results[i] = {"status": "cached", **record}
+                else:
+                    jobs.append((i, self._submit(key, sub)))
+            except ApiError as e:
+                results[i] = {"status": "error", "error": e.message}
+            except Exception as e:
+                # one malformed item must not fail the rest of the batch
+                logger.exception("Submission %d could not be read", i)
+                results[i] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+        deadline = time.monotonic() + JOB_TIMEOUT_S
+        for i, future in jobs:
+            try:
+                results[i] = {"status": "created", **future.result(timeout=max(0.0, deadline - time.monotonic()))}
+            except FutureTimeout:
+                results[i] = {"status": "error", "error": "timed out; repeat the request to collect the result"}
+            except Exception as e:
+                logger.exception("Submission %d failed", i)
+                results[i] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        for result in results:
+            if "artifacts" in result:
+                result["urls"] = {kind: f"/v1/artifacts/{name}" for kind, name in result["artifacts"].items()}
+        return results
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+
+# -------------------------------------------------
+# WSGI APPLICATION
+# -------------------------------------------------
+def catalog_tree() -> Dict[str, Any]:
+    return {
+        category: {
+            "page_id": entry["page_id"],
+            "subcategories": {
+                name: {"page_id": sub["page_id"], "subsubcategories": sorted(sub["sub"])}
+                for name, sub in entry["sub"].items()
+            },
+        }
+        for category, entry in CATALOG.items()
+    }
+
+
+def _json_response(start_response: Callable, status: int, payload: Any) -> Iterable[bytes]:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    reason = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+              405: "Method Not Allowed", 413: "Payload Too Large", 422: "Unprocessable Entity"}
+    start_response(
+        f"{status} {reason.get(status, 'Error')}",
+        [("Content-Type", "application/json; charset=utf-8"), ("Content-Length", str(len(body)))],
+    )
+    return [body]
+
+
+def _read_json(environ: Dict[str, Any]) -> Any:
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if length > MAX_REQUEST_MB * 1024 * 1024:
+        raise ApiError(413, f"request body above {MAX_REQUEST_MB} MB")
+    try:
+        return json.loads(environ["wsgi.input"].read(length) or b"null")
+    except ValueError:
+        raise ApiError(400, "request body is not valid JSON") from None
+
+
+def make_app(processor: Optional[SubmissionProcessor] = None) -> Callable:
+    """
+    WSGI application:
+      GET  /v1/catalog                 catalog pages a submission can attach to
+      POST /v1/submissions             one submission, or {"submissions": [...]} as a batch
+      GET  /v1/artifacts/<sha256>.ext  YAML / PDF / ZIP by content hash
+      GET  /healthz
+    """
+    processor = processor or SubmissionProcessor()
+
+    def application(environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        method, path = environ["REQUEST_METHOD"], environ.get("PATH_INFO", "")
+        try:
+            if path == "/healthz":
+                return _json_response(start_response, 200, {"ok": True})
+            if API_TOKEN and environ.get("HTTP_AUTHORIZATION", "") != f"Bearer {API_TOKEN}":
+                raise ApiError(401, "missing or wrong API token")
+
+            if path == "/v1/catalog" and method == "GET":
+                return _json_response(
+                    start_response, 200, {"languages": list(LANGUAGE_OPTIONS), "catalog": catalog_tree()}
+                )
+
+            if path == "/v1/submissions":
+                if method != "POST":
+                    raise ApiError(405, "use POST")
+                payload = _read_json(environ)
+                if isinstance(payload, dict) and isinstance(payload.get("submissions"), list):
+                    if len(payload["submissions"]) > MAX_BATCH:
+                        raise ApiError(413, f"at most {MAX_BATCH} submissions per request")
+                    return _json_response(start_response, 200, {"results": processor.process(payload["submissions"])})
+                (result,) = processor.process([payload])
+                status = {"created": 201, "cached": 200}.get(result["status"], 422)
+                return _json_response(start_response, status, result)
+
+            m = ARTIFACT_RE.match(path)
+            if m and method == "GET":
+                target = processor.store_dir / m.group("name")
+                if not target.exists():
+                    raise ApiError(404, "unknown artifact")
+                if environ.get("HTTP_IF_NONE_MATCH") == f'"{target.stem}"':
+                    start_response("304 Not Modified", [("ETag", f'"{target.stem}"')])
+                    return [b""]
+                data = target.read_bytes()
+                start_response("200 OK", [
+                    ("Content-Type", CONTENT_TYPES[target.suffix]),
+                    ("Content-Length", str(len(data))),
+                    ("ETag", f'"{target.stem}"'),
+                    ("Cache-Control", "public, max-age=31536000, immutable"),   # the name is the content hash
+                ])
+                return [data]
+            raise ApiError(404, "not found")
+        except ApiError as e:
+            return _json_response(start_response, e.status, {"error": e.message})
+
+    return application
+
+
+# For WSGI servers, e.g. `gunicorn -w 1 --threads 8 catalogger_api:application`
+application = make_app()
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless CataLogger submission API (WSGI).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help=f"Render processes (default: {MAX_WORKERS}).")
+    parser.add_argument("--store", type=Path, default=ARTIFACT_DIR, help=f"Artifact folder (default: {ARTIFACT_DIR}).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    processor = SubmissionProcessor(args.store, args.workers)
+    server = make_server(args.host, args.port, make_app(processor), server_class=ThreadingWSGIServer)
+    logger.info("CataLogger API on http://%s:%d/ (%d workers, artifacts in %s)", args.host, args.port,
+                args.workers, args.store)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        processor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+import streamlit as st
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+# Opt-in: CATALOGGER_DIAGNOSTICS=1 for every session, or ?diagnostics=1 in the URL for one
+DIAGNOSTICS_ENV = "CATALOGGER_DIAGNOSTICS"
+DIAGNOSTICS_QUERY_PARAM = "diagnostics"
+# One JSON object per line and timed stage
+TIMING_LOG_FILE = os.environ.get("CATALOGGER_TIMING_LOG", "catalogger_timings.jsonl")
+SIDEBAR_HISTORY_RUNS = 5          # earlier runs of the session shown below the current one
+
+logger = logging.getLogger("catalogger.timings")
+
+
+# -------------------------------------------------
+# STRUCTURED TIMING LOG
+# -------------------------------------------------
+@st.cache_resource
+def _timing_log_handler() -> logging.Handler:
+    # Attached once per server process (cache_resource), not once per rerun.
+    handler = logging.FileHandler(TIMING_LOG_FILE, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
+
+
+def diagnostics_enabled() -> bool:
+    if os.environ.get(DIAGNOSTICS_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get(DIAGNOSTICS_QUERY_PARAM, "") in ("1", "true", "yes")
+
+
+# -------------------------------------------------
+# PER-RUN TIMER
+# -------------------------------------------------
+class RunTimer:
+    """
+    Wall time per stage of one script run. Disabled timers cost one
+    attribute check per stage, so the calls can stay in the app.
+
+    Every finished stage is logged right away (a run can end early through
+    st.stop()) and the sidebar panel is redrawn from the stages so far.
+    """
+
+    def __init__(self, session_id: str = "", run_no: int = 0, enabled: bool = False):
+        self.enabled = enabled
+        self.session_id = session_id
+        self.run_no = run_no
+        self.started = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+        self._panel = st.sidebar.empty() if enabled else None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        self.stages.append((name, seconds))
+        logger.info(
+            json.dumps(
+                {
+                    "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "session": self.session_id,
+                    "run": self.run_no,
+                    "stage": name,
+                    "ms": round(1000 * seconds, 2),
+                }
+            )
+        )
+        # kept for the history of the next run, as the timer itself is per run
+        st.session_state["diag_last_run"] = {"run": self.run_no, "stages": self.totals()}
+        self.render()
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Milliseconds per stage name (repeated stages, e.g. one preview per figure, are summed).
+        """
+        totals: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            totals[name] = totals.get(name, 0.0) + 1000 * seconds
+        return totals
+
+    def render(self) -> None:
+        with self._panel.container():
+            st.markdown("### ⏱️ Diagnostics")
+            st.caption(
+                f"Session `{self.session_id}` · run {self.run_no} · "
+                f"{1000 * (time.perf_counter() - self.started):.0f} ms so far"
+            )
+            st.table({"stage": list(self.totals()), "ms": [f"{ms:.1f}" for ms in self.totals().values()]})
+            history = st.session_state.get("diag_history", [])
+            if history:
+                st.caption("Earlier runs (ms)")
+                st.table(
+                    {
+                        "run": [h["run"] for h in history],
+                        "stages": [", ".join(f"{k} {v:.0f}" for k, v in h["stages"].items()) for h in history],
+                    }
+                )
+
+
+def begin_run() -> RunTimer:
+    """
+    Timer for the current script run. Returns a disabled timer unless
+    diagnostics are switched on for this session.
+    """
+    if not diagnostics_enabled():
+        return RunTimer()
+    _timing_log_handler()
+
+    state = st.session_state
+    if "diag_session_id" not in state:
+        state["diag_session_id"] = uuid.uuid4().hex[:12]
+        state["diag_run_no"] = 0
+        state["diag_history"] = []
+    previous = state.pop("diag_last_run", None)
+    if previous:
+        state["diag_history"] = [previous, *state["diag_history"]][:SIDEBAR_HISTORY_RUNS]
+    state["diag_run_no"] += 1
+
+    timer = RunTimer(state["diag_session_id"], state["diag_run_no"], enabled=True)
+    timer.render()
+    return timer
@@ -0,0 +1,267 @@
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from PIL import Image
+from streamlit.testing.v1 import AppTest
+
+import catalogger_core
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+APP_FILE = Path(__file__).with_name("CataLogger.py")
+REPORT_FILE = Path("catalogger_loadtest.json")
+
+DEFAULT_SESSIONS = 4
+DEFAULT_PARALLEL = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_AUTHORS = 2
+DEFAULT_FIGURES = 3
+DEFAULT_FIGURE_PX = 3000          # longest side of the generated test figures
+RERUN_TIMEOUT_S = 120.0
+
+logger = logging.getLogger("catalogger_loadtest")
+
+# Time spent inside the export builders, per call, for the current process.
+_builder_timings: Dict[str, List[float]] = defaultdict(list)
+
+
+# -------------------------------------------------
+# INSTRUMENTATION
+# -------------------------------------------------
+def _timed(name: str, func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _builder_timings[name].append(time.perf_counter() - t0)
+
+    return wrapper
+
+
+def instrument_builders() -> None:
+    """
+    Time the PDF and ZIP builders. The app imports them from catalogger_core
+    on every run, so wrapping the module attributes is enough.
+    """
+    if getattr(catalogger_core.yaml_to_pdf_bytes, "__wrapped__", None) is None:
+        catalogger_core.yaml_to_pdf_bytes = _timed("yaml_to_pdf_bytes", catalogger_core.yaml_to_pdf_bytes)
+        catalogger_core.build_zip_bytes = _timed("build_zip_bytes", catalogger_core.build_zip_bytes)
+
+
+def make_figure(index: int, px: int) -> bytes:
+    """
+    A photo-like JPEG (gradient + noise, so it does not compress to nothing).
+    """
+    img = Image.linear_gradient("L").resize((px, px * 3 // 4)).convert("RGB")
+    noise = Image.effect_noise((px, px * 3 // 4), 40 + index).convert("RGB")
+    out = BytesIO()
+    Image.blend(img, noise, 0.5).save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+# -------------------------------------------------
+# ONE SIMULATED SESSION
+# -------------------------------------------------
+def run_session(
+    session_no: int, n_authors: int, n_figures: int, figure_px: int, trace_memory: bool = False
+) -> Dict[str, Any]:
+    """
+    Script a typical CataLogger session up to the download step and
+    record the latency of every rerun it triggers.
+
+    trace_memory adds the tracemalloc peak, but slows Python-heavy code
+    (e.g. the PDF build) several-fold, so latencies are then not comparable.
+    """
+    instrument_builders()
+    _builder_timings.clear()
+    if trace_memory:
+        tracemalloc.start()
+    steps: List[Dict[str, Any]] = []
+
+    def step(name: str, action: Callable[[], Any]) -> None:
+        t0 = time.perf_counter()
+        action()
+        steps.append({"step": name, "seconds": time.perf_counter() - t0})
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].message}")
+
+    figures = [(f"figure_{i}.jpg", make_figure(i, figure_px), "image/jpeg") for i in range(1, n_figures + 1)]
+
+    at = AppTest.from_file(str(APP_FILE), default_timeout=RERUN_TIMEOUT_S)
+    error = ""
+    try:
+        step("initial_load", at.run)
+        step("title", lambda: at.text_input[0].input(f"Load test resource {session_no}").run())
+        for i in range(n_authors):
+            if i:
+                step("add_author", lambda: next(b for b in at.button if b.label.startswith("➕")).click().run())
+            step("author_name", lambda: at.text_input(key=f"author_name_{i}").input(f"Author {i} {session_no}").run())
+            step("author_affiliation", lambda: at.text_input(key=f"author_aff_{i}").input("Test University").run())
+        step("access_url", lambda: next(t for t in at.text_input if t.label.startswith("Access link")).input(
+            "https://example.org/app").run())
+        step("description", lambda: at.text_area[0].input("A resource used for load testing. " * 20).run())
+        if figures:
+            step("upload_figures", lambda: at.file_uploader[0].set_value(figures).run())
+            for i in range(1, n_figures + 1):
+                at.text_input(key=f"fig_caption_{i}").input(f"Caption {i}")
+        step("submit", lambda: next(b for b in at.button if b.label.startswith("Submit")).click().run())
+        step("confirm_preview", lambda: next(b for b in at.button if b.label.startswith("✅")).click().run())
+        if not at.get("download_button"):
+            raise RuntimeError("download step not reached")
+        step("rerun_at_download", at.run)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "session": session_no,
+        "pid": os.getpid(),
+        "ok": not error,
+        "error": error,
+        "steps": steps,
+        "total_s": sum(s["seconds"] for s in steps),
+        "builders": {k: list(v) for k, v in _builder_timings.items()},
+        "peak_traced_bytes": peak,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+# -------------------------------------------------
+# LOAD RUN + REPORT
+# -------------------------------------------------
+def _stats(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"n": 0}
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "mean_s": round(statistics.fmean(ordered), 4),
+        "p50_s": round(ordered[len(ordered) // 2], 4),
+        "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max_s": round(ordered[-1], 4),
+    }
+
+
+def summarize(sessions: List[Dict[str, Any]], wall_s: float, parallel: int) -> Dict[str, Any]:
+    by_step: Dict[str, List[float]] = defaultdict(list)
+    builders: Dict[str, List[float]] = defaultdict(list)
+    for s in sessions:
+        for rec in s["steps"]:
+            by_step[rec["step"]].append(rec["seconds"])
+        for name, values in s["builders"].items():
+            builders[name].extend(values)
+
+    ok = [s for s in sessions if s["ok"]]
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sessions": len(sessions),
+        "failed": len(sessions) - len(ok),
+        "parallel": parallel,
+        "wall_s": round(wall_s, 3),
+        "sessions_per_min": round(60 * len(ok) / wall_s, 2) if wall_s else 0.0,
+        "session_total": _stats([s["total_s"] for s in ok]),
+        "reruns": {name: _stats(v) for name, v in by_step.items()},
+        "builders": {name: _stats(v) for name, v in builders.items()},
+        "peak_traced_bytes": max((s["peak_traced_bytes"] for s in sessions), default=0),
+        "max_rss_kib": max((s["max_rss_kib"] for s in sessions), default=0),
+        "errors": [{"session": s["session"], "error": s["error"]} for s in sessions if not s["ok"]],
+        "per_session": sessions,
+    }
+
+
+def run_load(
+    sessions: int = DEFAULT_SESSIONS,
+    parallel: int = DEFAULT_PARALLEL,
+    n_authors: int = DEFAULT_AUTHORS,
+    n_figures: int = DEFAULT_FIGURES,
+    figure_px: int = DEFAULT_FIGURE_PX,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run `sessions` simulated sessions, `parallel` at a time, each in its own
+    worker process (AppTest runs the app in-process, one session at a time).
+    """
+    t0 = time.perf_counter()
+    if parallel <= 1:
+        results = [run_session(i, n_authors, n_figures, figure_px, trace_memory) for i in range(sessions)]
+    else:
+        # AppTest swaps sys.modules["__main__"] for the app script, so workers
+        # must find run_session under its module name, not as __main__.run_session.
+        import catalogger_loadtest
+
+        session_fn = catalogger_loadtest.run_session
+        with ProcessPoolExecutor(max_workers=parallel) as pool:
+            futures = [pool.submit(session_fn, i, n_authors, n_figures, figure_px, trace_memory) for i in range(sessions)]
+            results = [f.result() for f in futures]
+    return summarize(results, time.perf_counter() - t0, parallel)
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Headless load/latency test of CataLogger (run from the app's working directory)."
+    )
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL)
+    parser.add_argument("--authors", type=int, default=DEFAULT_AUTHORS)
+    parser.add_argument("--figures", type=int, default=DEFAULT_FIGURES)
+    parser.add_argument("--figure-px", type=int, default=DEFAULT_FIGURE_PX)
+    parser.add_argument("--report", type=Path, default=REPORT_FILE)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Also record the tracemalloc peak (slows the run down)."
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=None,
+        help="PDF render processes of the app (CATALOGGER_PDF_WORKERS); 0 renders inline, "
+        "which is the only mode where the builder timings include yaml_to_pdf_bytes.",
+    )
+    args = parser.parse_args(argv)
+    if args.pdf_workers is not None:
+        # read by pdf_render_pool on import, i.e. before the first session starts
+        os.environ["CATALOGGER_PDF_WORKERS"] = str(args.pdf_workers)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    report = run_load(
+        args.sessions, args.parallel, args.authors, args.figures, args.figure_px, args.trace_memory
+    )
+    args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    logger.info(
+        "%d session(s), %d failed, %.1fs wall, %.2f sessions/min at parallel=%d",
+        report["sessions"], report["failed"], report["wall_s"], report["sessions_per_min"], report["parallel"],
+    )
+    for name, s in {**report["reruns"], **report["builders"]}.items():
+        if s["n"]:
+            logger.info("%-20s n=%-4d p50=%.3fs p95=%.3fs max=%.3fs", name, s["n"], s["p50_s"], s["p95_s"], s["max_s"])
+    logger.info("Peak traced memory %.1f MiB, max RSS %.1f MiB. Report: %s",
+                report["peak_traced_bytes"] / 2**20, report["max_rss_kib"] / 1024, args.report)
+    for e in report["errors"]:
+        logger.error("session %d: %s", e["session"], e["error"])
+    if report["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+
+from resource_model import Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+REPORT_FILE = Path("dedup_report.json")
+
+NUM_PERM = 64                 # MinHash signature length
+LSH_BANDS = 16                # 16 bands x 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+NEAR_DUP_THRESHOLD = 0.8      # estimated Jaccard of description/keyword shingles
+SHINGLE_SIZE = 3              # word n-grams of description_short
+MINHASH_SEED = 1
+MERSENNE_PRIME = (1 << 31) - 1  # keeps a * h + b inside uint64
+
+# Stems end in _<YYYYMMDD>_<HHMMSS> (CataLogger file names)
+TIMESTAMP_RE = re.compile(r"_(\d{8}_\d{6})$")
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "si"}
+IGNORED_TITLES = {"", "untitled resource"}
+IGNORED_DESCRIPTIONS = {"", "no description provided."}
+
+logger = logging.getLogger("dedup")
+
+
+# -------------------------------------------------
+# NORMALIZATION
+# -------------------------------------------------
+def tokens(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def normalize_title(title: str) -> str:
+    norm = " ".join(tokens(title))
+    return "" if norm in IGNORED_TITLES else norm
+
+
+def normalize_url(url: str) -> str:
+    """
+    Scheme, "www.", fragment, trailing slash and tracking parameters do not
+    make a different resource. Non-http(s) values ("#", placeholders) give "".
+    """
+    parts = urlsplit(str(url or "").strip())
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+        return ""
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in TRACKING_PARAMS and not k.startswith("utm_")
+    )
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def shingles(resource: Resource) -> Set[str]:
+    words = [] if resource.description_short.strip().lower() in IGNORED_DESCRIPTIONS else tokens(
+        resource.description_short
+    )
+    out = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(0, len(words) - SHINGLE_SIZE + 1))}
+    if 0 < len(words) < SHINGLE_SIZE:
+        out.add(" ".join(words))
+    out.update(f"kw:{' '.join(tokens(k))}" for k in resource.keywords)
+    return out
+
+
+def submission_time(resource: Resource) -> str:
+    """
+    Sortable submission time: from the CataLogger file name, else the file's mtime.
+    """
+    m = TIMESTAMP_RE.search(resource.file_stem)
+    if m:
+        return m.group(1)
+    try:
+        return time.strftime("%Y%m%d_%H%M%S", time.localtime(os.stat(resource.file_path).st_mtime))
+    except OSError:
+        return ""
+
+
+# -------------------------------------------------
+# MINHASH
+# -------------------------------------------------
+class MinHasher:
+    """
+    NUM_PERM universal hash functions h -> (a*h + b) mod p, applied to all
+    shingles of a resource at once with NumPy.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = MINHASH_SEED):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, items: Set[str]) -> Optional[np.ndarray]:
+        if not items:
+            return None
+        h = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in items),
+            dtype=np.uint64,
+            count=len(items),
+        ) % np.uint64(MERSENNE_PRIME)
+        return ((self.a * h + self.b) % np.uint64(MERSENNE_PRIME)).min(axis=1).astype(np.uint32)
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent: List[int] = []
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return False
+        self.parent[max(ri, rj)] = min(ri, rj)
+        return True
+
+
+# -------------------------------------------------
+# INDEX
+# -------------------------------------------------
+class DuplicateIndex:
+    """
+    Incremental duplicate finder: resources are added one at a time and
+    only their compact features are kept (no Resource objects).
+
+    - exact: normalized URL and normalized title -> first resource with it
+    - near:  MinHash signature banded into LSH buckets; only resources that
+             share a bucket are compared, so the cost stays ~linear in the
+             number of resources instead of all pairs.
+    Matches are merged with union-find into duplicate clusters.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = LSH_BANDS, threshold: float = NEAR_DUP_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.records: List[Dict[str, str]] = []
+        self.signatures: List[Optional[np.ndarray]] = []
+        self.exact: Dict[Tuple[str, str], int] = {}
+        self.buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self.uf = UnionFind()
+        self.reasons: List[Dict[str, Any]] = []
+
+    def _link(self, i: int, j: int, reason: str) -> None:
+        if self.uf.union(i, j):
+            self.reasons.append({"a": j, "b": i, "reason": reason})
+
+    def add(self, resource: Resource) -> None:
+        i = self.uf.add()
+        self.records.append(
+            {
+                "path": resource.file_path,
+                "key": resource.topic_page_id or resource.topic,
+                "title": resource.title,
+                "url": resource.url,
+                "submitted": submission_time(resource),
+            }
+        )
+
+        for kind, value in (("same URL", normalize_url(resource.url)), ("same title", normalize_title(resource.title))):
+            if not value:
+                continue
+            j = self.exact.setdefault((kind, value), i)
+            if j != i:
+                self._link(i, j, kind)
+
+        sig = self.hasher.signature(shingles(resource))
+        self.signatures.append(sig)
+        if sig is None:
+            return
+        checked: Set[int] = set()
+        for band, buckets in enumerate(self.buckets):
+            bucket = buckets[sig[band * self.rows:(band + 1) * self.rows].tobytes()]
+            for j in bucket:
+                if j in checked or self.uf.find(j) == self.uf.find(i):
+                    continue
+                checked.add(j)
+                similarity = float(np.mean(sig == self.signatures[j]))
+                if similarity >= self.threshold:
+                    self._link(i, j, f"similar description/keywords ({similarity:.2f})")
+            bucket.append(i)
+
+    def clusters(self) -> List[Dict[str, Any]]:
+        """
+        Duplicate clusters (2+ members), newest submission first.
+        """
+        members: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(self.records)):
+            members[self.uf.find(i)].append(i)
+        edges: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for r in self.reasons:
+            edges[self.uf.find(r["a"])].append(
+                {"a": self.records[r["a"]]["path"], "b": self.records[r["b"]]["path"], "reason": r["reason"]}
+            )
+
+        out = []
+        for root, ids in members.items():
+            if len(ids) < 2:
+                continue
+            recs = sorted((self.records[i] for i in ids), key=lambda r: r["submitted"], reverse=True)
+            out.append({"members": recs, "matches": edges[root]})
+        out.sort(key=lambda c: c["members"][0]["path"])
+        return out
+
+
+def find_duplicates(resources: Iterable[Resource], **kwargs: Any) -> List[Dict[str, Any]]:
+    index = DuplicateIndex(**kwargs)
+    for res in resources:
+        index.add(res)
+    return index.clusters()
+
+
+def collapse_plan(clusters: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Files to drop so each page keeps only the newest record of a URL.
+
+    Only records with the same normalized URL as the kept newest record are
+    dropped. Title-only and near-duplicate matches are reported but never
+    collapsed: clusters are transitive (A~B and B~C puts A and C together
+    even if they are unrelated), and a generic title is shared by
+    different resources. Duplicates on different pages (e.g. the same app
+    submitted for the English and the German catalogue) are also kept.
+    """
+    drop: Set[str] = set()
+    for cluster in clusters:
+        kept: Set[Tuple[str, str]] = set()
+        for rec in cluster["members"]:   # newest first
+            url = normalize_url(rec["url"])
+            if not url:
+                continue
+            if (rec["key"], url) in kept:
+                drop.add(rec["path"])
+            kept.add((rec["key"], url))
+    return drop
+
+
+def write_report(clusters: List[Dict[str, Any]], dropped: Set[str], n_resources: int, path: Path = REPORT_FILE) -> None:
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resources": n_resources,
+        "clusters": clusters,
+        "dropped": sorted(dropped),
+    }
+    Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    # Imported here: generate_docs pulls in pandas and sets up the output tree.
+    from generate_docs import RESOURCES_DIR, load_resource_file
+
+    parser = argparse.ArgumentParser(description="Report duplicate resource submissions.")
+    parser.add_argument("--resources", type=Path, default=RESOURCES_DIR)
+    parser.add_argument("--threshold", type=float, default=NEAR_DUP_THRESHOLD)
+    parser.add_argument("--report", type=Path, default=REPORT_FILE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    t0 = time.perf_counter()
+    index = DuplicateIndex(threshold=args.threshold)
+    for yaml_file in sorted(args.resources.rglob("*.yaml")):
+        loaded = load_resource_file(yaml_file)
+        if loaded is not None:
+            index.add(loaded[1])
+    clusters = index.clusters()
+    dropped = collapse_plan(clusters)
+    write_report(clusters, dropped, len(index.records), args.report)
+
+    logger.info(
+        "%d resources, %d duplicate cluster(s), %d file(s) would be collapsed (%.2fs). Report: %s",
+        len(index.records), len(clusters), len(dropped), time.perf_counter() - t0, args.report,
+    )
+
+
+if __name__ == "__main__":
+    main()
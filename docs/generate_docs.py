@@ -2,8 +2,31 @@ import pandas as pd
 from pathlib import Path
 import yaml
 import re
+import shutil
 import unicodedata
-from typing import Any, Dict, List, Optional  # <-- only change: added Optional
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple  # <-- only change: added Optional
+
+from asset_store import figure_file_index, load_manifest, resolve_figure_urls
+from build_profile import BuildProfiler
+from resource_model import PLACEHOLDER, Author, Figure, Resource, as_bool, slugify
+from resource_schema import decode_resource
+from tag_pages import (
+    AFFILIATIONS,
+    AUTHORS,
+    KEYWORDS,
+    KIND_TITLES,
+    TagIndex,
+    overview_body,
+    person_key,
+    tag_key,
+    tag_page_body,
+)
 
 # -------------------------------------------------
 # CONFIGURATION
@@ -18,6 +41,36 @@ OUTPUT_DOCS_DIR.mkdir(exist_ok=True)
 # This marker must also exist in your markdown templates in contents/
 INJECTION_MARKER = "<!--INJECT_RESOURCE_LIST_HERE-->"
 
+# Per-resource detail pages (--resource-pages mode)
+RESOURCE_PAGES_DIR = OUTPUT_DOCS_DIR / "resources"
+DEFAULT_PAGE_SIZE = 10          # resource cards per numbered topic page
+PAGINATED_PAGE_RE = re.compile(r"_p\d+\.md$")   # <page_id>_p<N>.md
+CARD_DESCRIPTION_CHARS = 280    # description shortened on cards
+CARD_COVER_WIDTH = 240          # px, cover thumbnail on cards
+
+# page_id/topic -> resource files, for the bounded-memory --streaming build
+RESOURCE_INDEX_FILE = Path(".resource_index.json")
+
+# Precomputed navigation for the Just-the-Docs includes in _includes/
+NAV_DATA_FILE = Path("_data") / "nav_tree.json"
+# Hand-written pages that are not in the spreadsheet but belong in the nav
+NAV_STATIC_PAGES = [
+    {"id": "index", "title": "Welcome", "url": "/", "nav_order": 1},
+]
+
+# Written when running with --profile
+PROFILE_REPORT_FILE = Path("build_profile.json")
+
+# --tag-pages mode: keyword / author / affiliation pages under OUTPUT_DOCS_DIR/<kind>/,
+# linked from the resource detail tables
+TAG_LINKS = False
+TAG_PAGE_LAYOUT = "home"
+
+# --languages mode: one output tree per lang_code, OUTPUT_DOCS_DIR/<lang>/
+MAX_LANGUAGE_WORKERS = os.cpu_count() or 1
+
+logger = logging.getLogger("generate_docs")
+
 
 # -------------------------------------------------
 # HELPER FUNCTIONS
@@ -56,245 +109,194 @@ def safe_code(x: Any) -> str:
         return str(x).zfill(2)
 
 
-def as_bool(x: Any) -> bool:
+# -------------------------------------------------
+# IMAGE / COVER HELPERS
+# -------------------------------------------------
+def infer_figure_url(resource: Resource, fig: Figure) -> Optional[str]:
     """
-    Robust boolean cast for YAML/string values.
-    Accepts True, "true", "yes", "y", "1", "on".
+    Build the URL for a specific figure of this resource.
+    Uses the same naming convention as the ZIP export.
+
+    /assets/resources/<stem>/<stem>_fig<ID>.<ext>
+
+    If the build already resolved the figure (resolve_figure_urls), that
+    result wins: a hashed /assets/store/... URL, or None for a broken reference.
     """
-    if isinstance(x, bool):
-        return x
-    if x is None:
-        return False
-    return str(x).strip().lower() in {"true", "yes", "y", "1", "on"}
+    if fig.resolved:
+        return fig.url
 
+    base_name = resource.file_stem
+    if not base_name or not fig.id or not fig.ext:
+        return None
 
-def as_int(x: Any, default: int = 0) -> int:
-    try:
-        return int(x)
-    except (ValueError, TypeError):
-        return default
+    return f"/assets/resources/{base_name}/{base_name}_fig{fig.id}{fig.ext}"
 
 
-def as_list(x: Any) -> List[str]:
+def infer_cover_url(resource: Resource) -> Optional[str]:
     """
-    Normalize a YAML field to a list of strings.
-
-    - list -> list of str
-    - str  -> [str] if not empty
-    - None/"" -> []
+    URL of the cover figure picked at load time (if any).
     """
-    if isinstance(x, list):
-        return [str(v).strip() for v in x if str(v).strip()]
-    if x is None:
-        return []
-    s = str(x).strip()
-    if not s:
-        return []
-    return [s]
-
-
-def slugify(text: str) -> str:
-    text = (text or "").strip().lower()
-    text = unicodedata.normalize("NFKD", text)
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    return text.strip("-") or "resource"
+    if resource.cover is None:
+        return None
+    return infer_figure_url(resource, resource.cover)
 
 
 # -------------------------------------------------
-# IMAGE / COVER HELPERS
+# RESOURCE LOADING (YAML FROM STREAMLIT APP)
 # -------------------------------------------------
-def pick_cover_figure(figures: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+def load_resource_file(yaml_file: Path) -> Optional[Tuple[str, Resource]]:
     """
-    Decide which figure to use as the cover image for a resource.
+    Load and normalize one YAML resource file.
 
-    Priority:
-    1. First figure with 'is_cover: true' (set in CataLogger).
-    2. Otherwise, the first figure in the list.
+    Returns (key, resource) where key is the "topic_page_id" (if present) or
+    the "topic" (which should match the page title), or None if the file
+    cannot be used.
     """
-    if not figures:
+    try:
+        with open(yaml_file, "r", encoding="utf-8") as f:
+            data, errors = decode_resource(f)
+    except OSError as e:
+        logger.error("Error loading %s: %s", yaml_file.name, e)
         return None
 
-    # 1) explicit cover flag from CataLogger
-    for fig in figures:
-        if fig.get("is_cover"):
-            return fig
-
-    # 2) fallback: first figure
-    return figures[0]
-
-
-def infer_figure_url(resource: Dict[str, Any], fig: Dict[str, Any]) -> Optional[str]:
-    """
-    Build the URL for a specific figure of this resource.
-    Uses the same naming convention as the ZIP export.
-
-    /assets/resources/<stem>/<stem>_fig<ID>.<ext>
-    """
-    base_name = resource.get("_file_stem")
-    if not base_name:
+    # Decoding already checked and coerced every field; report what was wrong
+    # instead of silently defaulting it.
+    for err in errors:
+        logger.warning("%s: %s", yaml_file.name, err)
+    if data is None:
+        logger.error("Error loading %s: not a valid resource file.", yaml_file.name)
         return None
 
-    fig_id = fig.get("id")
-    orig = fig.get("original_filename") or ""
-    ext = Path(orig).suffix.lower()  # keep original extension
+    resource = Resource.from_dict(data, yaml_file)
 
-    if not fig_id or not ext:
+    # Prefer explicit ID-based mapping if available
+    if resource.topic_page_id:
+        key = resource.topic_page_id
+    elif resource.topic:
+        key = resource.topic
+    else:
+        logger.warning(
+            "Resource %s missing 'topic_page_id' and 'topic'. Skipping.", yaml_file.name
+        )
         return None
 
-    return f"/assets/resources/{base_name}/{base_name}_fig{fig_id}{ext}"
+    return key, resource
 
 
-def infer_cover_url(resource: Dict[str, Any]) -> Optional[str]:
+def load_all_resources(resources_dir: Path) -> Dict[str, List[Resource]]:
     """
-    Wrapper around pick_cover_figure + infer_figure_url.
+    Load all YAML resource files and group them by the "topic_page_id" (if present)
+    or by "topic" (which should match the page title).
     """
-    figures = resource.get("figures") or []
-    if not figures:
-        return None
+    resource_data: Dict[str, List[Resource]] = {}
 
-    cover_fig = pick_cover_figure(figures)
-    if not cover_fig:
-        return None
+    for yaml_file in resources_dir.rglob("*.yaml"):
+        loaded = load_resource_file(yaml_file)
+        if loaded is None:
+            continue
+        key, data = loaded
+        resource_data.setdefault(key, []).append(data)
 
-    return infer_figure_url(resource, cover_fig)
+    return resource_data
 
 
 # -------------------------------------------------
-# RESOURCE LOADING (YAML FROM STREAMLIT APP)
+# RESOURCE INDEX (STREAMING BUILD)
 # -------------------------------------------------
-def load_all_resources(resources_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+def build_resource_index(
+    resources_dir: Path, index_path: Path = RESOURCE_INDEX_FILE
+) -> Dict[str, Dict[str, Any]]:
     """
-    Load all YAML resource files and group them by the "topic_page_id" (if present)
-    or by "topic" (which should match the page title).
+    Compact on-disk index: resource file -> {key, resource_id, stem, mtime_ns, size}.
 
-    Supports:
-    - New CataLogger format (item_id, authors[], fit_for, Streamlit metadata, etc.)
-    - Older format with author / author_institute fields.
+    Files whose mtime and size are unchanged since the last run are not
+    parsed again; new or changed files are parsed once and released
+    immediately, so the index costs one resource worth of memory to build.
     """
-    resource_data: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        previous = json.loads(index_path.read_text(encoding="utf-8")).get("files", {})
+    except (FileNotFoundError, ValueError):
+        previous = {}
 
+    files: Dict[str, Dict[str, Any]] = {}
     for yaml_file in resources_dir.rglob("*.yaml"):
-        try:
-            with open(yaml_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-        except Exception as e:
-            print(f"Error loading {yaml_file.name}: {e}")
+        path = yaml_file.as_posix()
+        st = yaml_file.stat()
+        old = previous.get(path)
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            files[path] = old
             continue
 
-        # --- Common core fields (with fallbacks) ---
-        title = (data.get("title") or yaml_file.stem).strip()
-        topic = str(data.get("topic") or "").strip()
-        topic_page_id = str(data.get("topic_page_id") or "").strip()  # optional, future use
-
-        # remember where this YAML came from + its figures
-        data["_file_stem"] = yaml_file.stem
-        data["figures"] = data.get("figures") or []  # list of {id, original_filename, ..., is_cover}
-
-        # Prefer explicit ID-based mapping if available
-        if topic_page_id:
-            key = topic_page_id
-        elif topic:
-            key = topic
-        else:
-            print(
-                f"Warning: Resource {yaml_file.name} missing 'topic_page_id' "
-                f"and 'topic'. Skipping."
-            )
+        loaded = load_resource_file(yaml_file)
+        if loaded is None:
             continue
+        key, resource = loaded
+        files[path] = {
+            "key": key,
+            "resource_id": resource.resource_id,
+            "stem": yaml_file.stem,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        }
 
-        # --- Normalize lists/booleans from CataLogger ---
-        data["keywords"] = as_list(data.get("keywords"))
-        data["fit_for"] = as_list(data.get("fit_for"))
+    index_path.write_text(json.dumps({"version": 1, "files": files}), encoding="utf-8")
+    return files
 
-        # references: ensure list of strings
-        refs = data.get("references", [])
-        if isinstance(refs, list):
-            data["references"] = [str(r).strip() for r in refs if str(r).strip()]
-        elif refs:
-            data["references"] = [str(refs).strip()]
-        else:
-            data["references"] = []
-
-        # --- Authors normalization ---
-        # New format: authors: [ {name, affiliation}, ... ]
-        authors = data.get("authors")
-        if isinstance(authors, list) and authors:
-            normalized_authors = []
-            for a in authors:
-                if not isinstance(a, dict):
-                    continue
-                name = (a.get("name") or "").strip()
-                aff = (a.get("affiliation") or "").strip()
-                if not name:
-                    continue
-                if not aff:
-                    aff = "TO_BE_FILLED_BY_COURSE_MANAGER"
-                normalized_authors.append({"name": name, "affiliation": aff})
-            data["authors"] = normalized_authors
-        else:
-            # Fallback: older single-author fields
-            author_name = (data.get("author") or "").strip()
-            author_inst = (data.get("author_institute") or "").strip()
-            if author_name:
-                data["authors"] = [{"name": author_name, "affiliation": author_inst or "N/A"}]
-            else:
-                data["authors"] = []
 
-        # --- item_id / resource_id alignment ---
-        item_id = (data.get("item_id") or "").strip()
-        if item_id and not item_id.startswith("TO_BE_FILLED_BY_COURSE_MANAGER"):
-            resource_id = item_id
-        else:
-            resource_id = slugify(title)
-        data["resource_id"] = resource_id
+def group_index(index: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    key (page_id / topic) -> resource file paths.
+    """
+    groups: Dict[str, List[str]] = {}
+    for path, entry in index.items():
+        groups.setdefault(entry["key"], []).append(path)
+    return groups
 
-        # Store under key
-        resource_data.setdefault(key, []).append(data)
 
-    return resource_data
+def iter_indexed_resources(paths: Iterable[str]) -> Iterator[Resource]:
+    """
+    Load resources one file at a time.
+    """
+    for path in paths:
+        loaded = load_resource_file(Path(path))
+        if loaded is not None:
+            yield loaded[1]
 
 
 # -------------------------------------------------
 # RESOURCE → MARKDOWN
 # -------------------------------------------------
-def format_authors_for_table(authors: List[Dict[str, str]]) -> str:
+def format_authors_for_table(authors: Iterable[Author]) -> str:
     """
-    Convert list of {name, affiliation} into a single string:
+    Convert authors into a single string:
     'Name1 (Aff1); Name2 (Aff2)' or 'N/A' if empty.
     """
-    if not authors:
-        return "N/A"
-    chunks = []
-    for a in authors:
-        name = (a.get("name") or "").strip()
-        aff = (a.get("affiliation") or "").strip()
-        if name and aff:
-            chunks.append(f"{name} ({aff})")
-        elif name:
-            chunks.append(name)
+    chunks = [f"{a.name} ({a.affiliation})" if a.affiliation else a.name for a in authors]
     return "; ".join(chunks) if chunks else "N/A"
 
 
-def format_resource_markdown(resource: Dict[str, Any]) -> str:
+def format_resource_markdown(resource: Resource) -> str:
     """
     Format a single resource block as markdown, compatible with
     the YAML generated by the CataLogger Streamlit app.
     """
-    title = resource.get("title", "Untitled Resource")
-    resource_type = resource.get("resource_type", "N/A")
-    time_required = resource.get("time_required", "N/A")
-    date_released = resource.get("date_released", "N/A")
-    description_short = resource.get("description_short", "No description provided.")
-    url = resource.get("url", "#")
-
-    keywords = as_list(resource.get("keywords"))
-    fit_for = as_list(resource.get("fit_for"))
-    authors = resource.get("authors", [])
-    authors_str = format_authors_for_table(authors)
+    title = resource.title
+    resource_type = resource.resource_type
+    time_required = resource.time_required
+    date_released = resource.date_released
+    description_short = resource.description_short
+    url = resource.url
+
+    keywords = resource.keywords
+    fit_for = resource.fit_for
+    if TAG_LINKS:
+        authors_str = format_authors_linked(resource.authors)
+        keywords = tuple(f"[{k}]({tag_url(KEYWORDS, tag_key(k))})" if tag_key(k) else k for k in keywords)
+    else:
+        authors_str = format_authors_for_table(resource.authors)
 
-    figures = resource.get("figures") or []
-    cover_fig = pick_cover_figure(figures) if figures else None
+    figures = resource.figures
+    cover_fig = resource.cover
 
     cover_url = infer_cover_url(resource)
 
@@ -333,26 +335,26 @@ def format_resource_markdown(resource: Dict[str, Any]) -> str:
     md += f"| **Author(s)** | {authors_str} |\n"
     md += f"| **Keywords** | {', '.join(keywords) if keywords else '—'} |\n"
     md += f"| **Fit For** | {', '.join(fit_for) if fit_for else '—'} |\n"
-    md += f"| **Prerequisites** | {resource.get('prerequisites', 'None specified.')} |\n"
+    md += f"| **Prerequisites** | {resource.prerequisites} |\n"
 
-    refs = resource.get("references", [])
+    refs = resource.references
     if refs:
         ref_text = "<br>".join(refs)
         md += f"| **References** | {ref_text} |\n"
 
     # --- Extra table only for Streamlit apps (CataLogger metadata) ---
-    if str(resource_type).lower().startswith("streamlit"):
-        multipage_app = as_bool(resource.get("multipage_app", False))
-        num_pages = as_int(resource.get("num_pages", 0))
+    if resource_type.lower().startswith("streamlit"):
+        multipage_app = resource.multipage_app
+        num_pages = resource.num_pages
 
-        interactive_plots = as_bool(resource.get("interactive_plots", False))
-        num_interactive_plots = as_int(resource.get("num_interactive_plots", 0))
+        interactive_plots = resource.interactive_plots
+        num_interactive_plots = resource.num_interactive_plots
 
-        assessments_included = as_bool(resource.get("assessments_included", False))
-        num_assessment_questions = as_int(resource.get("num_assessment_questions", 0))
+        assessments_included = resource.assessments_included
+        num_assessment_questions = resource.num_assessment_questions
 
-        videos_included = as_bool(resource.get("videos_included", False))
-        num_videos = as_int(resource.get("num_videos", 0))
+        videos_included = resource.videos_included
+        num_videos = resource.num_videos
 
         md += "\n### Streamlit app details\n\n"
         md += "| Detail | Value |\n"
@@ -367,11 +369,11 @@ def format_resource_markdown(resource: Dict[str, Any]) -> str:
         md += f"| Number of videos | {num_videos if videos_included and num_videos > 0 else '—'} |\n"
 
     # --- Images section for remaining figures ---
-    other_figs: List[Dict[str, Any]] = []
+    other_figs: Tuple[Figure, ...] = ()
     if figures:
-        if cover_fig is not None and cover_fig.get("id") is not None:
-            cover_id = cover_fig.get("id")
-            other_figs = [f for f in figures if f.get("id") != cover_id]
+        if cover_fig is not None and cover_fig.id is not None:
+            cover_id = cover_fig.id
+            other_figs = tuple(f for f in figures if f.id != cover_id)
         else:
             other_figs = figures
 
@@ -382,9 +384,9 @@ def format_resource_markdown(resource: Dict[str, Any]) -> str:
             if not url_fig:
                 continue
 
-            fid = fig.get("id")
-            fcap = (fig.get("caption") or "").strip()
-            ftype = (fig.get("type") or "").strip()
+            fid = fig.id
+            fcap = fig.caption
+            ftype = fig.type
 
             alt = fcap or f"Image {fid} for {title}"
             md += f"![{alt}]({url_fig})\n\n"
@@ -397,11 +399,132 @@ def format_resource_markdown(resource: Dict[str, Any]) -> str:
             if caption_parts:
                 md += "*" + " ".join(caption_parts) + "*\n\n"
 
+    # --- Related resources (--related build stage) ---
+    if resource.related:
+        md += "\n### Related resources\n\n"
+        for rel_title, rel_page_id, rel_slug in resource.related:
+            md += f"- [{rel_title}]({related_url(rel_title, rel_page_id, rel_slug)})\n"
+        md += "\n"
+
     md += "\n---\n\n"
     return md
 
 
 
+# -------------------------------------------------
+# TAG AND AUTHOR PAGES
+# -------------------------------------------------
+def set_tag_links(enabled: bool) -> None:
+    global TAG_LINKS
+    TAG_LINKS = enabled
+
+
+def tag_page_path(kind: str, key: str) -> Path:
+    return OUTPUT_DOCS_DIR / kind / f"{key}.md"
+
+
+def tag_url(kind: str, key: str) -> str:
+    return site_url(tag_page_path(kind, key))
+
+
+def format_authors_linked(authors: Iterable[Author]) -> str:
+    """
+    format_authors_for_table with every name and affiliation linked to its page.
+    """
+    chunks = []
+    for a in authors:
+        name = f"[{a.name}]({tag_url(AUTHORS, person_key(a.name))})" if person_key(a.name) else a.name
+        if a.affiliation in (PLACEHOLDER, "N/A") or not person_key(a.affiliation):
+            aff = a.affiliation
+        else:
+            aff = f"[{a.affiliation}]({tag_url(AFFILIATIONS, person_key(a.affiliation))})"
+        chunks.append(f"{name} ({aff})" if aff else name)
+    return "; ".join(chunks) if chunks else "N/A"
+
+
+def render_tag_pages(tag_index: TagIndex) -> List[Tuple[Path, str]]:
+    """
+    One page per keyword / author / affiliation plus an overview per kind,
+    straight from the inverted index (no further pass over resources).
+    """
+    out: List[Tuple[Path, str]] = []
+    for kind in (KEYWORDS, AUTHORS, AFFILIATIONS):
+        overview = tag_page_path(kind, "index")
+        for key, entry in tag_index.entries(kind):
+            fm = {"title": entry.label, "layout": TAG_PAGE_LAYOUT, "nav_exclude": True}
+            body = tag_page_body(kind, entry, related_url, site_url(overview))
+            out.append((tag_page_path(kind, key), frontmatter_text(fm) + body))
+        fm = {"title": f"{KIND_TITLES[kind]}s", "layout": TAG_PAGE_LAYOUT, "nav_exclude": True}
+        body = overview_body(kind, tag_index, lambda key, kind=kind: tag_url(kind, key))
+        out.append((overview, frontmatter_text(fm) + body))
+    return out
+
+
+def write_tag_pages(tag_index: TagIndex) -> int:
+    for kind in (KEYWORDS, AUTHORS, AFFILIATIONS):
+        (OUTPUT_DOCS_DIR / kind).mkdir(parents=True, exist_ok=True)
+    pages = render_tag_pages(tag_index)
+    for out_path, text in pages:
+        out_path.write_text(text, encoding="utf-8")
+    return len(pages)
+
+
+# -------------------------------------------------
+# RELATED RESOURCES
+# -------------------------------------------------
+def heading_anchor(title: str) -> str:
+    """
+    The id kramdown (GFM) gives a "## title" heading.
+    """
+    return re.sub(r"[^\w\- ]", "", title.strip().lower()).replace(" ", "-")
+
+
+def related_url(title: str, page_id: str, slug: str) -> str:
+    """
+    Link to a related resource: its detail page in --resource-pages mode,
+    otherwise its section on the topic page.
+    """
+    if slug:
+        return site_url(RESOURCE_PAGES_DIR / f"{slug}.md")
+    return site_url(topic_page_path(page_id)) + "#" + heading_anchor(title)
+
+
+def compute_related_links(
+    resources: Iterable[Resource], df: pd.DataFrame, k: int, slugs: Dict[str, str]
+) -> Dict[str, Tuple[Tuple[str, str, str], ...]]:
+    """
+    file stem -> (title, page_id, slug) of its k most similar resources.
+
+    Only resources that land on a page are considered, and recommendations
+    stay within the language of that page. Features are extracted while
+    iterating, so this works on the streaming build's lazy iterator too.
+    """
+    from related import related_resources, resource_terms
+
+    page_ids = set(df["page_id"])
+    page_id_by_title = dict(zip(df["title"], df["page_id"]))
+    lang_by_page = dict(zip(df["page_id"], df["lang_code"].replace("", "en")))
+
+    entries: Dict[str, List[Tuple[str, str, str]]] = {}
+    docs: Dict[str, List[List[str]]] = {}
+    for res in resources:
+        key = res.topic_page_id or res.topic
+        page_id = key if key in page_ids else page_id_by_title.get(key)
+        if page_id is None:
+            continue
+        lang = lang_by_page[page_id]
+        entries.setdefault(lang, []).append((res.file_stem, res.title, page_id))
+        docs.setdefault(lang, []).append(resource_terms(res))
+
+    links: Dict[str, Tuple[Tuple[str, str, str], ...]] = {}
+    for lang, lang_entries in entries.items():
+        for (stem, _, _), neighbours in zip(lang_entries, related_resources(docs[lang], k)):
+            links[stem] = tuple(
+                (lang_entries[j][1], lang_entries[j][2], slugs.get(lang_entries[j][0], "")) for j, _ in neighbours
+            )
+    return links
+
+
 # -------------------------------------------------
 # CONTENT PATH RECONSTRUCTION
 # -------------------------------------------------
@@ -440,109 +563,894 @@ def build_content_path(row: pd.Series) -> Path:
 
 
 # -------------------------------------------------
-# MAIN EXECUTION
+# PAGE RENDERING
 # -------------------------------------------------
-def main() -> None:
-    # 1. Load spreadsheet
-    df = pd.read_excel(DATA_FILE, dtype=str).fillna("")
-    all_resources = load_all_resources(RESOURCES_DIR)
+def build_frontmatter(
+    row: pd.Series,
+    title_by_page_id: Dict[str, str],
+    parent_by_page_id: Dict[str, str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Jekyll / Just-the-Docs front matter for one spreadsheet row.
+    Returns None if display_order is invalid (the page is skipped).
+    """
+    page_id = row["page_id"]
+    parent_id = row["parent_id"]
+    title = row["title"]
+    layout = (row.get("layout") or "home") or "home"
 
-    # Precompute title and parent lookups by page_id
-    title_by_page_id: Dict[str, str] = dict(zip(df["page_id"], df["title"]))
-    parent_by_page_id: Dict[str, str] = dict(zip(df["page_id"], df["parent_id"]))
+    # nav_order from display_order
+    try:
+        nav_order = int(row["display_order"])
+    except (ValueError, TypeError):
+        logger.warning("display_order invalid for %s (%s). Skipping.", page_id, title)
+        return None
 
-    print(f"Loaded {len(df)} pages from {DATA_FILE}")
-    print(f"Loaded {sum(len(v) for v in all_resources.values())} resources.")
+    has_children = as_bool(row.get("has_children", ""))
 
-    for _, row in df.iterrows():
-        page_id = row["page_id"]
-        parent_id = row["parent_id"]
-        title = row["title"]
-        layout = (row.get("layout") or "home") or "home"
-        lang_code = (row.get("lang_code") or "en") or "en"
+    frontmatter: Dict[str, Any] = {
+        "title": title,
+        "layout": layout,
+        "nav_order": nav_order,
+        "has_children": has_children,
+        "page_id": page_id,  # key into _data/nav_tree.json
+    }
+
+    # JTD parent / grand_parent resolved by title from page_id
+    if parent_id:
+        parent_title = title_by_page_id.get(parent_id)
+        if parent_title:
+            frontmatter["parent"] = parent_title
+
+            # optional grand_parent
+            gp_id = parent_by_page_id.get(parent_id, "")
+            if gp_id:
+                gp_title = title_by_page_id.get(gp_id)
+                if gp_title:
+                    frontmatter["grand_parent"] = gp_title
+
+    return frontmatter
+
+
+def frontmatter_text(frontmatter: Dict[str, Any]) -> str:
+    return "---\n" + yaml.safe_dump(frontmatter, sort_keys=False) + "---\n\n"
+
+
+def meta_comments_for(row: pd.Series) -> str:
+    """
+    Internal metadata as HTML comments (safe for JTD).
+    """
+    lang_code = (row.get("lang_code") or "en") or "en"
+    return (
+        f"<!-- page_id: {row['page_id']} -->\n"
+        f"<!-- parent_id: {row['parent_id']} -->\n"
+        f"<!-- lang_code: {lang_code} -->\n\n"
+    )
+
+
+def load_base_content(row: pd.Series) -> str:
+    """
+    Base markdown for a page from the contents/ tree (or a placeholder).
+    """
+    content_path = build_content_path(row)
+    try:
+        return content_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.info(
+            "Base content not found at %s. Using placeholder for %s.", content_path, row["page_id"]
+        )
+        return f"# {row['title']}\n\nNo introductory content yet.\n\n{INJECTION_MARKER}\n"
+
+
+def resources_for_page(
+    row: pd.Series, all_resources: Dict[str, List[Resource]]
+) -> List[Resource]:
+    """
+    Resources attached to this page, in stable order by resource title.
+    Prefer page_id-based mapping; fallback to title (= topic).
+    """
+    resources_for_topic = all_resources.get(row["page_id"], [])
+    if not resources_for_topic:
+        resources_for_topic = all_resources.get(row["title"], [])
+    return sorted(resources_for_topic, key=lambda r: r.title.lower())
+
+
+def inject_resource_list(existing_body: str, resources_list_md: str, row: pd.Series) -> str:
+    """
+    Inject the resource list at the marker (or append it at the end).
+    """
+    if INJECTION_MARKER in existing_body:
+        before_marker, _, after_marker = existing_body.partition(INJECTION_MARKER)
+        return (
+            before_marker
+            + INJECTION_MARKER
+            + "\n\n"
+            + resources_list_md
+            + after_marker
+        )
+    logger.info(
+        "Marker not found in %s, appended resources at end.", build_content_path(row).name
+    )
+    return existing_body + "\n\n" + resources_list_md
+
+
+def render_page(
+    row: pd.Series,
+    all_resources: Dict[str, List[Resource]],
+    title_by_page_id: Dict[str, str],
+    parent_by_page_id: Dict[str, str],
+) -> Optional[str]:
+    """
+    Render the final Jekyll page text (front matter + body) for one spreadsheet row,
+    with every resource inlined in full.
+    Returns None if the row cannot be rendered (invalid display_order).
+    """
+    frontmatter = build_frontmatter(row, title_by_page_id, parent_by_page_id)
+    if frontmatter is None:
+        return None
+
+    title = row["title"]
+    resources_for_topic = resources_for_page(row, all_resources)
 
-        # nav_order from display_order
+    resources_list_md = f"## Interactive Resources ({title})\n\n"
+    if resources_for_topic:
+        for res in resources_for_topic:
+            resources_list_md += format_resource_markdown(res)
+    else:
+        resources_list_md += "No resources submitted for this topic yet.\n\n"
+
+    final_body = inject_resource_list(load_base_content(row), resources_list_md, row)
+    return frontmatter_text(frontmatter) + meta_comments_for(row) + final_body
+
+
+# -------------------------------------------------
+# PAGINATED TOPIC PAGES + RESOURCE DETAIL PAGES
+# -------------------------------------------------
+def site_url(out_path: Path) -> str:
+    """
+    Site-relative URL of a generated markdown file, wrapped for Jekyll's baseurl.
+    """
+    return "{{ '/" + out_path.with_suffix(".html").as_posix() + "' | relative_url }}"
+
+
+def clear_generated_pages() -> None:
+    """
+    Remove the generated folders (resource, keyword, author and affiliation
+    pages) and the numbered topic pages of the previous build, so pages of
+    removed resources or tags, or of a run with other flags, are not left
+    behind for Jekyll to publish.
+    """
+    for kind in (RESOURCE_PAGES_DIR.name, KEYWORDS, AUTHORS, AFFILIATIONS):
+        shutil.rmtree(OUTPUT_DOCS_DIR / kind, ignore_errors=True)
+    for stale in OUTPUT_DOCS_DIR.glob("*_p*.md"):
+        if PAGINATED_PAGE_RE.search(stale.name):
+            stale.unlink()
+
+
+def topic_page_path(page_id: str, page_no: int = 1) -> Path:
+    """
+    Page 1 keeps the plain <page_id>.md name; later pages get a _p<N> suffix.
+    """
+    if page_no <= 1:
+        return OUTPUT_DOCS_DIR / f"{page_id}.md"
+    return OUTPUT_DOCS_DIR / f"{page_id}_p{page_no}.md"
+
+
+def resource_page_path(resource: Resource) -> Path:
+    return RESOURCE_PAGES_DIR / f"{resource.page_slug}.md"
+
+
+def compute_page_slugs(stems_and_ids: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Map each resource file stem to a unique detail-page slug based on its
+    resource_id. Colliding resource_ids (e.g. two submissions with the same
+    title) get -2, -3, ... in order of their source file name, so slugs are stable.
+    """
+    seen: Dict[str, int] = {}
+    slugs: Dict[str, str] = {}
+    for stem, resource_id in sorted(stems_and_ids):
+        base = slugify(str(resource_id or stem))
+        n = seen.get(base, 0) + 1
+        seen[base] = n
+        slugs[stem] = base if n == 1 else f"{base}-{n}"
+    return slugs
+
+
+def assign_resource_page_slugs(all_resources: Dict[str, List[Resource]]) -> None:
+    every = [r for group in all_resources.values() for r in group]
+    slugs = compute_page_slugs((r.file_stem, r.resource_id) for r in every)
+    for res in every:
+        res.page_slug = slugs[res.file_stem]
+
+
+def format_resource_card(resource: Resource) -> str:
+    """
+    Compact summary of a resource for topic pages: title linking to the
+    detail page, type/time line, small cover and a shortened description.
+    """
+    title = resource.title
+    resource_type = resource.resource_type
+    time_required = resource.time_required
+    description_short = resource.description_short.strip()
+    if len(description_short) > CARD_DESCRIPTION_CHARS:
+        description_short = description_short[:CARD_DESCRIPTION_CHARS].rsplit(" ", 1)[0] + " …"
+
+    detail_url = site_url(resource_page_path(resource))
+    cover_url = infer_cover_url(resource)
+
+    md = f"### [{title}]({detail_url})\n\n"
+    md += f"**Type:** {resource_type} | **Time:** {time_required}\n\n"
+    if cover_url:
+        md += f"![{title}]({cover_url}){{: width=\"{CARD_COVER_WIDTH}\" loading=\"lazy\"}}\n\n"
+    if description_short:
+        md += f"{description_short}\n\n"
+    md += f"[Details]({detail_url}) · [**Launch**]({resource.url})\n\n"
+    return md
+
+
+def format_pager(page_id: str, page_no: int, n_pages: int) -> str:
+    if n_pages <= 1:
+        return ""
+    parts = []
+    if page_no > 1:
+        parts.append(f"[← Previous]({site_url(topic_page_path(page_id, page_no - 1))})")
+    parts.append(f"Page {page_no} of {n_pages}")
+    if page_no < n_pages:
+        parts.append(f"[Next →]({site_url(topic_page_path(page_id, page_no + 1))})")
+    return " | ".join(parts) + "\n\n"
+
+
+def render_paginated_pages(
+    row: pd.Series,
+    all_resources: Dict[str, List[Resource]],
+    title_by_page_id: Dict[str, str],
+    parent_by_page_id: Dict[str, str],
+    page_size: int,
+) -> List[Tuple[Path, str]]:
+    """
+    Render a topic as numbered pages of at most page_size resource cards.
+
+    Page 1 is the regular navigation page with the base content; pages 2..N
+    are excluded from the navigation and only reachable through the pager.
+    The detail page of every listed resource is returned alongside.
+    """
+    frontmatter = build_frontmatter(row, title_by_page_id, parent_by_page_id)
+    if frontmatter is None:
+        return []
+
+    page_id = row["page_id"]
+    title = row["title"]
+    resources_for_topic = resources_for_page(row, all_resources)
+    chunks = [
+        resources_for_topic[i:i + page_size]
+        for i in range(0, len(resources_for_topic), page_size)
+    ] or [[]]
+    n_pages = len(chunks)
+
+    out: List[Tuple[Path, str]] = []
+    for page_no, chunk in enumerate(chunks, start=1):
+        pager = format_pager(page_id, page_no, n_pages)
+        resources_list_md = f"## Interactive Resources ({title})\n\n"
+        if chunk:
+            resources_list_md += pager
+            for res in chunk:
+                resources_list_md += format_resource_card(res)
+            resources_list_md += pager
+        else:
+            resources_list_md += "No resources submitted for this topic yet.\n\n"
+
+        if page_no == 1:
+            fm = frontmatter
+            body = inject_resource_list(load_base_content(row), resources_list_md, row)
+        else:
+            fm = {
+                "title": f"{title} (page {page_no})",
+                "layout": frontmatter["layout"],
+                "nav_exclude": True,
+            }
+            body = f"# {title}\n\n" + resources_list_md
+
+        out.append(
+            (topic_page_path(page_id, page_no), frontmatter_text(fm) + meta_comments_for(row) + body)
+        )
+        out.extend(
+            (resource_page_path(res), render_resource_detail_page(res, row, page_no))
+            for res in chunk
+        )
+    return out
+
+
+def render_resource_detail_page(resource: Resource, row: pd.Series, page_no: int = 1) -> str:
+    """
+    Standalone page with the full resource block (cover, tables, gallery),
+    linking back to the numbered topic page that lists it.
+    """
+    fm = {
+        "title": resource.title,
+        "layout": (row.get("layout") or "home") or "home",
+        "nav_exclude": True,
+    }
+    back_link = f"[← {row['title']}]({site_url(topic_page_path(row['page_id'], page_no))})\n\n"
+    meta = (
+        f"<!-- resource_id: {resource.resource_id} -->\n"
+        f"<!-- topic_page_id: {row['page_id']} -->\n\n"
+    )
+    return frontmatter_text(fm) + meta + back_link + format_resource_markdown(resource)
+
+
+# -------------------------------------------------
+# NAVIGATION DATA
+# -------------------------------------------------
+def page_url(page_id: str) -> str:
+    """
+    Site-relative URL (without baseurl) of a generated topic page.
+    """
+    return "/" + topic_page_path(page_id).with_suffix(".html").as_posix()
+
+
+def build_nav_tree(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Precompute the navigation once so the site does not have to.
+
+    Just-the-Docs otherwise derives parent / grand_parent / children by
+    scanning every page while rendering each page (quadratic in pages).
+    Returns:
+      roots: nested [{id, title, url, children: [...]}] ordered by display_order
+      pages: flat {page_id: {title, url, parent, ancestors, children}} for
+             O(1) lookups from breadcrumbs / head_nav / children_nav
+    """
+    pages: Dict[str, Dict[str, Any]] = {}
+    order: Dict[str, Tuple[int, str]] = {}
+
+    for static in NAV_STATIC_PAGES:
+        pages[static["id"]] = {"title": static["title"], "url": static["url"], "parent": ""}
+        order[static["id"]] = (static["nav_order"], static["title"].lower())
+
+    for page_id, parent_id, title, display_order in zip(
+        df["page_id"], df["parent_id"], df["title"], df["display_order"]
+    ):
         try:
-            nav_order = int(row["display_order"])
+            nav_order = int(display_order)
         except (ValueError, TypeError):
-            print(f"Warning: display_order invalid for {page_id} ({title}). Skipping.")
-            continue
+            continue  # skipped by the page generator as well
+        pages[page_id] = {"title": title, "url": page_url(page_id), "parent": parent_id}
+        order[page_id] = (nav_order, str(title).lower())
+
+    children: Dict[str, List[str]] = {}
+    for page_id, info in pages.items():
+        parent = info["parent"] if info["parent"] in pages else ""
+        info["parent"] = parent
+        children.setdefault(parent, []).append(page_id)
+    for ids in children.values():
+        ids.sort(key=lambda pid: order[pid])
+
+    def _ancestors(page_id: str) -> List[str]:
+        chain = []
+        parent = pages[page_id]["parent"]
+        while parent and parent not in chain:
+            chain.append(parent)
+            parent = pages[parent]["parent"]
+        return chain[::-1]
+
+    for page_id, info in pages.items():
+        info["children"] = children.get(page_id, [])
+        info["ancestors"] = _ancestors(page_id)
+
+    def _node(page_id: str) -> Dict[str, Any]:
+        return {
+            "id": page_id,
+            "title": pages[page_id]["title"],
+            "url": pages[page_id]["url"],
+            "children": [_node(c) for c in children.get(page_id, [])],
+        }
 
-        has_children = as_bool(row.get("has_children", ""))
+    return {"roots": [_node(pid) for pid in children.get("", [])], "pages": pages}
 
-        # --- Jekyll / Just-the-Docs front matter ---
-        frontmatter: Dict[str, Any] = {
-            "title": title,
-            "layout": layout,
-            "nav_order": nav_order,
-            "has_children": has_children,
-        }
 
-        # JTD parent / grand_parent resolved by title from page_id
-        if parent_id:
-            parent_title = title_by_page_id.get(parent_id)
-            if parent_title:
-                frontmatter["parent"] = parent_title
-
-                # optional grand_parent
-                gp_id = parent_by_page_id.get(parent_id, "")
-                if gp_id:
-                    gp_title = title_by_page_id.get(gp_id)
-                    if gp_title:
-                        frontmatter["grand_parent"] = gp_title
-
-        fm_text = "---\n" + yaml.safe_dump(frontmatter, sort_keys=False) + "---\n\n"
-
-        # Internal metadata as HTML comments (safe for JTD)
-        meta_comments = (
-            f"<!-- page_id: {page_id} -->\n"
-            f"<!-- parent_id: {parent_id} -->\n"
-            f"<!-- lang_code: {lang_code} -->\n\n"
+def write_nav_data(nav_tree: Dict[str, Any], path: Path = NAV_DATA_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(nav_tree, indent=1, ensure_ascii=False), encoding="utf-8")
+
+
+# -------------------------------------------------
+# MULTI-LANGUAGE BUILD
+# -------------------------------------------------
+def set_output_root(root: Path) -> None:
+    """
+    Point all generated paths and URLs at another output tree.
+    Only used inside language workers, which render one language at a time.
+    """
+    global OUTPUT_DOCS_DIR, RESOURCE_PAGES_DIR
+    OUTPUT_DOCS_DIR = Path(root)
+    RESOURCE_PAGES_DIR = OUTPUT_DOCS_DIR / "resources"
+
+
+# Parsed once in the parent and handed to each worker process once, via the
+# pool initializer, instead of once per language task.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_language_worker(
+    df: pd.DataFrame,
+    all_resources: Dict[str, List[Resource]],
+    resource_pages: bool,
+    page_size: int,
+    log_level: int,
+    tag_pages: bool = False,
+) -> None:
+    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+    set_tag_links(tag_pages)
+    _worker_state.update(
+        df=df,
+        all_resources=all_resources,
+        title_by_page_id=dict(zip(df["page_id"], df["title"])),
+        parent_by_page_id=dict(zip(df["page_id"], df["parent_id"])),
+        resource_pages=resource_pages,
+        page_size=page_size,
+    )
+
+
+def build_language(lang: str, out_root: Path) -> Dict[str, Any]:
+    """
+    Render all pages of one language into out_root/<lang>/.
+    Returns per-language stats plus the navigation tree of that language.
+    """
+    wall0 = time.perf_counter()
+    cpu0 = time.process_time()
+
+    df = _worker_state["df"]
+    all_resources = _worker_state["all_resources"]
+    lang_df = df[df["lang_code"].replace("", "en") == lang]
+
+    set_output_root(Path(out_root) / lang)
+    OUTPUT_DOCS_DIR.mkdir(parents=True, exist_ok=True)
+    clear_generated_pages()
+    if _worker_state["resource_pages"]:
+        RESOURCE_PAGES_DIR.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    n_resources = 0
+    tag_index = TagIndex() if TAG_LINKS else None
+    for _, row in lang_df.iterrows():
+        page_resources = resources_for_page(row, all_resources)
+        n_resources += len(page_resources)
+        if _worker_state["resource_pages"]:
+            outputs = render_paginated_pages(
+                row, all_resources, _worker_state["title_by_page_id"],
+                _worker_state["parent_by_page_id"], _worker_state["page_size"],
+            )
+        else:
+            page_text = render_page(
+                row, all_resources, _worker_state["title_by_page_id"], _worker_state["parent_by_page_id"]
+            )
+            outputs = [(topic_page_path(row["page_id"]), page_text)] if page_text else []
+        for out_path, page_text in outputs:
+            out_path.write_text(page_text, encoding="utf-8")
+        written += len(outputs)
+        if tag_index is not None and outputs:
+            for res in page_resources:
+                tag_index.add(res, row["page_id"], res.page_slug)
+
+    if tag_index is not None:
+        written += write_tag_pages(tag_index)
+
+    return {
+        "lang": lang,
+        "output_dir": OUTPUT_DOCS_DIR.as_posix(),
+        "pages_in_spreadsheet": len(lang_df),
+        "resources": n_resources,
+        "pages_written": written,
+        "wall_s": round(time.perf_counter() - wall0, 6),
+        "cpu_s": round(time.process_time() - cpu0, 6),
+        "nav_tree": build_nav_tree(lang_df),
+    }
+
+
+def merge_nav_trees(trees: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One nav_tree.json for all languages. Page ids are unique across
+    languages (they carry the lang suffix); shared static pages are kept once.
+    """
+    merged: Dict[str, Any] = {"roots": [], "pages": {}}
+    for tree in trees:
+        for root in tree["roots"]:
+            if root["id"] not in merged["pages"]:
+                merged["roots"].append(root)
+        for page_id, page in tree["pages"].items():
+            merged["pages"].setdefault(page_id, page)
+    return merged
+
+
+def build_languages(
+    df: pd.DataFrame,
+    all_resources: Dict[str, List[Resource]],
+    languages: List[str],
+    resource_pages: bool,
+    page_size: int,
+    workers: int,
+    out_root: Path = OUTPUT_DOCS_DIR,
+    tag_pages: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Render each language concurrently in its own process, all sharing the
+    resource set parsed once by the caller.
+    """
+    initargs = (df, all_resources, resource_pages, page_size, logger.getEffectiveLevel(), tag_pages)
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(languages))),
+        initializer=_init_language_worker,
+        initargs=initargs,
+    ) as pool:
+        futures = {pool.submit(build_language, lang, out_root): lang for lang in languages}
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    return sorted(results, key=lambda r: languages.index(r["lang"]))
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def report_broken_figures(broken: List[Dict[str, Any]], profiler: BuildProfiler) -> None:
+    for b in broken:
+        logger.warning(
+            "Broken figure reference %s in %s (expected %s)", b["figure_id"], b["resource"], b["expected"]
         )
+    profiler.count("broken_figures", len(broken))
 
-        # 2. Load base content from contents/ tree
-        content_path = build_content_path(row)
-        try:
-            existing_body = content_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            print(f"Base content not found at {content_path}. Using placeholder for {page_id}.")
-            existing_body = f"# {title}\n\nNo introductory content yet.\n\n{INJECTION_MARKER}\n"
 
-        # 3. Gather resources for this page
-        # Prefer page_id-based mapping; fallback to title (= topic)
-        resources_for_topic = all_resources.get(page_id, [])
-        if not resources_for_topic:
-            resources_for_topic = all_resources.get(title, [])
+def run_link_stage(resources: Iterable[Resource], profiler: BuildProfiler) -> None:
+    # Optional dependency (aiohttp), only needed for this stage.
+    from link_checker import REPORT_FILE, run_link_check, write_report
 
-        resources_list_md = f"## Interactive Resources ({title})\n\n"
-        if resources_for_topic:
-            # stable order by resource title
-            resources_for_topic = sorted(
-                resources_for_topic, key=lambda r: str(r.get("title", "")).lower()
+    with profiler.stage("link_check"):
+        link_report = run_link_check(resources)
+    write_report(link_report, REPORT_FILE)
+    logger.info(
+        "Link check: %d URLs, %d broken (report: %s)",
+        link_report["urls"], link_report["broken_count"], REPORT_FILE,
+    )
+    for source, problems in link_report["broken"].items():
+        for problem in problems:
+            logger.warning(
+                "Broken link in %s: %s (%s)",
+                source, problem["url"], problem["status"] or problem["error"],
             )
-            for res in resources_for_topic:
-                resources_list_md += format_resource_markdown(res)
+
+
+def run_dedup_stage(resources: Iterable[Resource], profiler: BuildProfiler, collapse: bool) -> Set[str]:
+    """
+    Report duplicate submissions; with collapse, return the files to leave
+    out of the build (older duplicates on the same page).
+    """
+    from dedup import REPORT_FILE as DEDUP_REPORT_FILE, DuplicateIndex, collapse_plan, write_report
+
+    with profiler.stage("dedup"):
+        dup_index = DuplicateIndex()
+        for res in resources:
+            dup_index.add(res)
+        clusters = dup_index.clusters()
+        dropped = collapse_plan(clusters) if collapse else set()
+    write_report(clusters, dropped, len(dup_index.records), DEDUP_REPORT_FILE)
+    for cluster in clusters:
+        logger.warning(
+            "Possible duplicates: %s (%s)",
+            ", ".join(m["path"] for m in cluster["members"]),
+            "; ".join(sorted({e["reason"] for e in cluster["matches"]})),
+        )
+    logger.info(
+        "Dedup: %d cluster(s), %d older duplicate(s) collapsed (report: %s)",
+        len(clusters), len(dropped), DEDUP_REPORT_FILE,
+    )
+    profiler.count("duplicate_clusters", len(clusters))
+    return dropped
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate the Jekyll catalogue pages.")
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity (per-page messages are logged at DEBUG).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time and tracemalloc peak per stage and write a JSON report.",
+    )
+    parser.add_argument(
+        "--profile-report",
+        type=Path,
+        default=PROFILE_REPORT_FILE,
+        help=f"Where to write the profile report (default: {PROFILE_REPORT_FILE}).",
+    )
+    parser.add_argument(
+        "--top-n", type=int, default=10, help="Number of slowest pages listed in the report."
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        default=None,
+        help="Also dump cProfile stats to this file (implies --profile).",
+    )
+    parser.add_argument(
+        "--resource-pages",
+        action="store_true",
+        help="Write one detail page per resource and show compact cards on paginated topic pages.",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Resource cards per topic page in --resource-pages mode (default: {DEFAULT_PAGE_SIZE}).",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Bounded-memory build: index resources on disk and load one page's resources at a time.",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help="Check every resource URL (cached, concurrent) and write link_report.json.",
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=["report", "collapse"],
+        default=None,
+        help="Report duplicate submissions (dedup_report.json); 'collapse' also drops older submissions of the same URL on a page.",
+    )
+    parser.add_argument(
+        "--related",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Add a 'Related resources' block with the K most similar resources (TF-IDF) to each resource.",
+    )
+    parser.add_argument(
+        "--tag-pages",
+        action="store_true",
+        help="Write keyword, author and affiliation pages and link them from the resource tables.",
+    )
+    parser.add_argument(
+        "--languages",
+        default=None,
+        help="Comma-separated lang_codes (or 'all') to build in parallel, each into docs/<lang>/.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_LANGUAGE_WORKERS,
+        help=f"Worker processes for --languages and --backend html (default: {MAX_LANGUAGE_WORKERS}).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["jekyll", "html"],
+        default="jekyll",
+        help="'html' also renders the pages to a static site in _site_html/ (no Jekyll needed).",
+    )
+    return parser.parse_args(argv)
+
+
+def build_pages(
+    df: pd.DataFrame,
+    args: argparse.Namespace,
+    profiler: BuildProfiler,
+    all_resources: Optional[Dict[str, List[Resource]]],
+    index: Dict[str, Dict[str, Any]],
+    manifest: Dict[str, Dict[str, Any]],
+    figure_files: Tuple[Set[str], Set[str]],
+    title_by_page_id: Dict[str, str],
+    parent_by_page_id: Dict[str, str],
+    related_links: Optional[Dict[str, Tuple[Tuple[str, str, str], ...]]] = None,
+) -> None:
+    """
+    Single-tree build: every spreadsheet row into OUTPUT_DOCS_DIR.
+    """
+    related_links = related_links or {}
+    groups = group_index(index) if args.streaming else {}
+    page_slugs: Dict[str, str] = {}
+    clear_generated_pages()
+    if args.resource_pages:
+        RESOURCE_PAGES_DIR.mkdir(parents=True, exist_ok=True)
+        if args.streaming:
+            page_slugs = compute_page_slugs((e["stem"], e["resource_id"]) for e in index.values())
         else:
-            resources_list_md += "No resources submitted for this topic yet.\n\n"
+            assign_resource_page_slugs(all_resources)
+
+    # Filled while the pages are written, so tag pages cost no extra pass
+    tag_index = TagIndex() if args.tag_pages else None
+
+    written = 0
+    for _, row in df.iterrows():
+        page_id = row["page_id"]
+        t0 = time.perf_counter()
+
+        if args.streaming:
+            # Load just this page's resources; they are released after writing.
+            with profiler.stage("resource_load"):
+                paths = groups.get(page_id) or groups.get(row["title"]) or []
+                page_resources = {page_id: list(iter_indexed_resources(paths))}
+                report_broken_figures(
+                    resolve_figure_urls(page_resources, manifest, file_index=figure_files), profiler
+                )
+                for res in page_resources[page_id]:
+                    res.page_slug = page_slugs.get(res.file_stem, "")
+                    res.related = related_links.get(res.file_stem, ())
+        else:
+            page_resources = all_resources
+
+        # 2. Render page text
+        with profiler.stage("render"):
+            if args.resource_pages:
+                outputs = render_paginated_pages(
+                    row, page_resources, title_by_page_id, parent_by_page_id, args.page_size
+                )
+            else:
+                page_text = render_page(row, page_resources, title_by_page_id, parent_by_page_id)
+                outputs = [(topic_page_path(page_id), page_text)] if page_text else []
+        if not outputs:
+            continue
+
+        # 3. Write final Jekyll page(s)
+        with profiler.stage("write"):
+            for out_path, page_text in outputs:
+                out_path.write_text(page_text, encoding="utf-8")
+                logger.debug("Wrote %s", out_path)
+        if tag_index is not None:
+            for res in resources_for_page(row, page_resources):
+                tag_index.add(res, page_id, res.page_slug)
+        profiler.record_page(page_id, time.perf_counter() - t0)
+        written += len(outputs)
+        del outputs, page_resources
+
+    if tag_index is not None:
+        with profiler.stage("tag_pages"):
+            n_tag_pages = write_tag_pages(tag_index)
+        logger.info("Wrote %d keyword/author pages (%d tags).", n_tag_pages, len(tag_index))
+        written += n_tag_pages
+
+    logger.info("Wrote %d pages to %s", written, OUTPUT_DOCS_DIR)
+    profiler.count("pages_written", written)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(asctime)s %(levelname)-7s %(name)s: %(message)s",
+    )
+
+    if args.languages and args.streaming:
+        raise SystemExit("--languages shares one parsed resource set and cannot be combined with --streaming")
+    if args.resource_pages and args.page_size < 1:
+        raise SystemExit("--page-size must be at least 1")
+
+    set_tag_links(args.tag_pages)
+
+    profiler = BuildProfiler(enabled=args.profile or bool(args.cprofile), cprofile_path=args.cprofile)
+    profiler.start()
+
+    # 1. Load spreadsheet + resources
+    with profiler.stage("spreadsheet"):
+        df = pd.read_excel(DATA_FILE, dtype=str).fillna("")
+    logger.info("Loaded %d pages from %s", len(df), DATA_FILE)
+    profiler.count("pages_in_spreadsheet", len(df))
 
-        # 4. Inject resource list at marker (or append at the end)
-        if INJECTION_MARKER in existing_body:
-            before_marker, _, after_marker = existing_body.partition(INJECTION_MARKER)
-            final_body = (
-                before_marker
-                + INJECTION_MARKER
-                + "\n\n"
-                + resources_list_md
-                + after_marker
+    manifest = load_manifest()
+    figure_files = figure_file_index()
+
+    if args.streaming:
+        # Only the index is kept for the whole run; resources are loaded per page.
+        with profiler.stage("resource_index"):
+            index = build_resource_index(RESOURCES_DIR)
+        all_resources = None
+        n_resources = len(index)
+        logger.info("Indexed %d resources in %s (streaming build).", n_resources, RESOURCE_INDEX_FILE)
+    else:
+        with profiler.stage("resource_load"):
+            all_resources = load_all_resources(RESOURCES_DIR)
+        # Resolve figure references against the content-addressed store in one pass
+        with profiler.stage("figures"):
+            report_broken_figures(
+                resolve_figure_urls(all_resources, manifest, file_index=figure_files), profiler
+            )
+        n_resources = sum(len(v) for v in all_resources.values())
+        logger.info("Loaded %d resources.", n_resources)
+    profiler.count("resources", n_resources)
+
+    # Precompute title and parent lookups by page_id
+    title_by_page_id: Dict[str, str] = dict(zip(df["page_id"], df["title"]))
+    parent_by_page_id: Dict[str, str] = dict(zip(df["page_id"], df["parent_id"]))
+
+    if args.dedup:
+        if args.streaming:
+            dropped = run_dedup_stage(iter_indexed_resources(index), profiler, args.dedup == "collapse")
+            index = {path: entry for path, entry in index.items() if path not in dropped}
+        else:
+            dropped = run_dedup_stage(
+                (r for group in all_resources.values() for r in group), profiler, args.dedup == "collapse"
             )
+            for key in list(all_resources) if dropped else []:
+                kept = [r for r in all_resources[key] if r.file_path not in dropped]
+                if kept:
+                    all_resources[key] = kept
+                else:
+                    del all_resources[key]
+
+    related_links: Dict[str, Tuple[Tuple[str, str, str], ...]] = {}
+    if args.related > 0:
+        with profiler.stage("related"):
+            if args.streaming:
+                entries = [(e["stem"], e["resource_id"]) for e in index.values()]
+                related_resources_iter = iter_indexed_resources(index)
+            else:
+                every = [r for group in all_resources.values() for r in group]
+                entries = [(r.file_stem, r.resource_id) for r in every]
+                related_resources_iter = iter(every)
+            slugs = compute_page_slugs(entries) if args.resource_pages else {}
+            related_links = compute_related_links(related_resources_iter, df, args.related, slugs)
+            if not args.streaming:
+                for res in every:
+                    res.related = related_links.get(res.file_stem, ())
+        logger.info("Related resources computed for %d resources.", len(related_links))
+
+    if args.check_links:
+        if args.streaming:
+            link_resources = iter_indexed_resources(index)
+        else:
+            link_resources = (r for group in all_resources.values() for r in group)
+        run_link_stage(link_resources, profiler)
+
+    if args.languages:
+        available = list(dict.fromkeys(code or "en" for code in df["lang_code"]))
+        if args.languages == "all":
+            languages = available
         else:
-            final_body = existing_body + "\n\n" + resources_list_md
-            print(f"Note: marker not found in {content_path.name}, appended resources at end.")
+            languages = [code.strip() for code in args.languages.split(",") if code.strip()]
+            for code in languages:
+                if code not in available:
+                    logger.warning("No pages with lang_code '%s' in %s.", code, DATA_FILE)
+        if args.resource_pages:
+            assign_resource_page_slugs(all_resources)
+
+        with profiler.stage("languages"):
+            results = build_languages(
+                df, all_resources, languages, args.resource_pages, args.page_size, args.workers,
+                tag_pages=args.tag_pages,
+            )
+        for r in results:
+            logger.info(
+                "[%s] %d pages (%d resources) -> %s in %.2fs wall / %.2fs CPU",
+                r["lang"], r["pages_written"], r["resources"], r["output_dir"], r["wall_s"], r["cpu_s"],
+            )
+            profiler.count(f"pages_written_{r['lang']}", r["pages_written"])
+        with profiler.stage("nav"):
+            write_nav_data(merge_nav_trees([r.pop("nav_tree") for r in results]))
+        logger.info("Wrote navigation data to %s", NAV_DATA_FILE)
+    else:
+        with profiler.stage("nav"):
+            write_nav_data(build_nav_tree(df))
+        logger.info("Wrote navigation data to %s", NAV_DATA_FILE)
+        build_pages(
+            df, args, profiler, all_resources, index if args.streaming else {},
+            manifest, figure_files, title_by_page_id, parent_by_page_id, related_links,
+        )
+
+    if args.backend == "html":
+        from html_backend import HTML_SITE_DIR, build_site
+
+        with profiler.stage("html"):
+            summary = build_site(HTML_SITE_DIR, workers=args.workers)
+        profiler.count("html_pages", summary["pages"])
 
-        # 5. Write final Jekyll page
-        out_path = OUTPUT_DOCS_DIR / f"{page_id}.md"
-        out_path.write_text(fm_text + meta_comments + final_body, encoding="utf-8")
-        print(f"✅ Wrote {out_path}")
+    profiler.stop()
+    if profiler.enabled:
+        profiler.write_report(args.profile_report, top_n=args.top_n)
+        for line in profiler.summary_lines(top_n=args.top_n):
+            logger.info("profile: %s", line)
+        logger.info("Profile report written to %s", args.profile_report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from generate_docs import DATA_FILE, NAV_DATA_FILE, build_nav_tree, heading_anchor
+from site_html import breadcrumb_html, markdown_to_html, nav_html, render_document, split_front_matter
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+HTML_SITE_DIR = Path("_site_html")       # static site written by the HTML backend
+JEKYLL_SITE_DIR = Path("_site")
+SITE_TITLE = "iNUX Interactive Documents"
+
+# Copied verbatim (figures, logos, css)
+STATIC_DIRS = ("assets",)
+# Never rendered: base content (merged into docs/ by the generator), build output, tooling
+EXCLUDED_DIRS = {"contents", "vendor", "node_modules", "spool", HTML_SITE_DIR.name, JEKYLL_SITE_DIR.name}
+
+MAX_RENDER_WORKERS = os.cpu_count() or 1
+PAGES_PER_TASK = 32                     # pages per worker task; amortizes IPC per page
+BENCHMARK_REPORT_FILE = Path("html_benchmark.json")
+
+logger = logging.getLogger("html_backend")
+
+
+# -------------------------------------------------
+# SOURCES
+# -------------------------------------------------
+def collect_pages(root: Path = Path(".")) -> List[Path]:
+    """
+    Every markdown file Jekyll would render: files with front matter,
+    outside _-prefixed, hidden and excluded folders.
+    """
+    pages: List[Path] = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(("_", ".")) and d not in EXCLUDED_DIRS)
+        for name in sorted(files):
+            if not name.endswith(".md"):
+                continue
+            path = Path(current) / name
+            with path.open("rb") as fh:
+                if fh.read(4) == b"---\n":
+                    pages.append(path.relative_to(root))
+    return pages
+
+
+def load_nav_tree(nav_file: Path = NAV_DATA_FILE) -> Dict[str, Any]:
+    """
+    The navigation model generate_docs wrote for the Jekyll includes;
+    rebuilt from the spreadsheet if it is missing.
+    """
+    try:
+        return json.loads(nav_file.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return build_nav_tree(pd.read_excel(DATA_FILE, dtype=str).fillna(""))
+
+
+def html_path(source: Path) -> Path:
+    return source.with_suffix(".html")
+
+
+# -------------------------------------------------
+# RENDERING (worker processes)
+# -------------------------------------------------
+# Set once per worker by the pool initializer
+_render_state: Dict[str, Any] = {}
+
+
+def _init_render_worker(nav_tree: Dict[str, Any], out_dir: Path, baseurl: str, site_title: str) -> None:
+    _render_state.update(
+        nav_tree=nav_tree,
+        out_dir=Path(out_dir),
+        baseurl=baseurl,
+        site_title=site_title,
+        id_by_url={info["url"]: page_id for page_id, info in nav_tree["pages"].items()},
+    )
+
+
+def render_file(source: Path) -> str:
+    """
+    One source page to a complete HTML document, using the worker's
+    shared navigation model.
+    """
+    state = _render_state
+    front_matter, body = split_front_matter(source.read_text(encoding="utf-8"))
+    url = "/" if source.name == "index.md" and source.parent == Path(".") else "/" + html_path(source).as_posix()
+    page_id = state["id_by_url"].get(url, "")
+    return render_document(
+        title=str(front_matter.get("title") or source.stem),
+        content_html=markdown_to_html(body, state["baseurl"], slugify=heading_anchor),
+        nav=nav_html(state["nav_tree"], page_id, state["baseurl"]),
+        breadcrumb=breadcrumb_html(state["nav_tree"], page_id, state["baseurl"]),
+        site_title=state["site_title"],
+        baseurl=state["baseurl"],
+        lang=str(front_matter.get("lang") or "en"),
+    )
+
+
+def render_batch(sources: List[Path]) -> List[Tuple[str, float]]:
+    """
+    Render and write a batch of pages; returns (source, seconds) per page.
+    """
+    timings = []
+    for source in sources:
+        t0 = time.perf_counter()
+        target = _render_state["out_dir"] / html_path(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(render_file(source), encoding="utf-8")
+        timings.append((source.as_posix(), time.perf_counter() - t0))
+    return timings
+
+
+# -------------------------------------------------
+# SITE BUILD
+# -------------------------------------------------
+def copy_static(out_dir: Path, dirs: Tuple[str, ...] = STATIC_DIRS) -> int:
+    """
+    Copy static folders into the site; files whose size and mtime already
+    match are skipped, so repeated builds only copy what changed.
+    """
+    copied = 0
+    for folder in dirs:
+        for current, _, files in os.walk(folder):
+            for name in files:
+                source = Path(current) / name
+                target = out_dir / source
+                st = source.stat()
+                try:
+                    tst = target.stat()
+                    if tst.st_size == st.st_size and tst.st_mtime_ns == st.st_mtime_ns:
+                        continue
+                except FileNotFoundError:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
+                copied += 1
+    return copied
+
+
+def build_site(
+    out_dir: Path = HTML_SITE_DIR,
+    baseurl: str = "",
+    workers: int = MAX_RENDER_WORKERS,
+    nav_tree: Optional[Dict[str, Any]] = None,
+    site_title: str = SITE_TITLE,
+) -> Dict[str, Any]:
+    """
+    Render every page into out_dir as static HTML (no Ruby, no theme fetch).
+    Pages are rendered in batches on a process pool; each worker receives
+    the navigation model once, through the pool initializer.
+    Returns a summary with page count and timings.
+    """
+    t0 = time.perf_counter()
+    nav_tree = nav_tree if nav_tree is not None else load_nav_tree()
+    sources = collect_pages()
+    batches = [sources[i:i + PAGES_PER_TASK] for i in range(0, len(sources), PAGES_PER_TASK)]
+    init_args = (nav_tree, out_dir, baseurl, site_title)
+
+    timings: List[Tuple[str, float]] = []
+    if workers <= 1 or len(batches) <= 1:
+        _init_render_worker(*init_args)
+        for batch in batches:
+            timings.extend(render_batch(batch))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)), initializer=_init_render_worker, initargs=init_args
+        ) as pool:
+            for batch_timings in pool.map(render_batch, batches):
+                timings.extend(batch_timings)
+    render_s = time.perf_counter() - t0
+
+    static_files = copy_static(out_dir)
+    summary = {
+        "backend": "html",
+        "pages": len(timings),
+        "static_files_copied": static_files,
+        "workers": workers,
+        "render_s": round(render_s, 3),
+        "wall_s": round(time.perf_counter() - t0, 3),
+        "slowest_pages": [
+            {"source": s, "ms": round(1000 * t, 2)} for s, t in sorted(timings, key=lambda x: -x[1])[:5]
+        ],
+    }
+    logger.info(
+        "Rendered %d pages to %s in %.2fs (%d static files copied).",
+        summary["pages"], out_dir, summary["wall_s"], static_files,
+    )
+    return summary
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+def time_jekyll(out_dir: Path = JEKYLL_SITE_DIR) -> Dict[str, Any]:
+    """
+    Time `bundle exec jekyll build` on the same tree, if Ruby is available.
+    """
+    if shutil.which("bundle") is None:
+        return {"backend": "jekyll", "skipped": "bundle not found on PATH"}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        ["bundle", "exec", "jekyll", "build", "--destination", str(out_dir)], capture_output=True, text=True
+    )
+    result: Dict[str, Any] = {"backend": "jekyll", "wall_s": round(time.perf_counter() - t0, 3)}
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        result["error"] = lines[-1] if lines else f"exit code {proc.returncode}"
+    return result
+
+
+def benchmark(
+    repeat: int, workers: int, baseurl: str, with_jekyll: bool, out_dir: Path = HTML_SITE_DIR
+) -> Dict[str, Any]:
+    """
+    Build the same inputs repeat times with the HTML backend into out_dir
+    (and once with Jekyll) and report wall times. Static files are copied
+    fresh each run.
+    """
+    runs = []
+    for _ in range(repeat):
+        shutil.rmtree(out_dir, ignore_errors=True)
+        runs.append(build_site(out_dir, baseurl, workers))
+    walls = [r["wall_s"] for r in runs]
+    report: Dict[str, Any] = {
+        "pages": runs[-1]["pages"],
+        "html": {"workers": workers, "runs_s": walls, "best_s": min(walls)},
+    }
+    if with_jekyll:
+        report["jekyll"] = time_jekyll()
+        if "error" not in report["jekyll"] and "wall_s" in report["jekyll"] and min(walls) > 0:
+            report["speedup"] = round(report["jekyll"]["wall_s"] / min(walls), 1)
+    return report
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Render the generated pages to a static HTML site without Jekyll (run generate_docs.py first)."
+    )
+    parser.add_argument("--output", type=Path, default=HTML_SITE_DIR, help=f"Site folder (default: {HTML_SITE_DIR}).")
+    parser.add_argument("--baseurl", default="", help="URL prefix the site is served under, e.g. /iNUXCatalogue.")
+    parser.add_argument(
+        "--workers", type=int, default=MAX_RENDER_WORKERS, help=f"Render processes (default: {MAX_RENDER_WORKERS})."
+    )
+    parser.add_argument(
+        "--benchmark", type=int, default=0, metavar="N",
+        help=f"Build N times and compare with `jekyll build`; writes {BENCHMARK_REPORT_FILE}.",
+    )
+    parser.add_argument("--no-jekyll", action="store_true", help="With --benchmark, skip the Jekyll run.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    if args.benchmark > 0:
+        report = benchmark(args.benchmark, args.workers, args.baseurl, not args.no_jekyll, args.output)
+        BENCHMARK_REPORT_FILE.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info("HTML backend: best %.2fs over %d run(s), %d pages.",
+                    report["html"]["best_s"], args.benchmark, report["pages"])
+        if "jekyll" in report:
+            jekyll = report["jekyll"]
+            if "speedup" in report:
+                logger.info("Jekyll: %.2fs (%sx slower).", jekyll["wall_s"], report["speedup"])
+            else:
+                logger.warning("Jekyll not timed: %s", jekyll.get("skipped") or jekyll.get("error"))
+        return
+
+    build_site(args.output, args.baseurl, args.workers)
+
+
+if __name__ == "__main__":
+    main()
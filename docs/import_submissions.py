@@ -0,0 +1,304 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+RESOURCES_DIR = Path("assets/resources")                 # <stem>/<stem>.yaml + <stem>_fig<N>.<ext>
+IMPORT_REGISTRY = RESOURCES_DIR / ".imported.json"       # sha256 of every imported ZIP
+POLICY_FILE = Path("assets/web_layout/import_policy.yaml")
+
+PLACEHOLDER = "TO_BE_FILLED_BY_COURSE_MANAGER"
+CHUNK_SIZE = 1 << 20
+MAX_WORKERS = min(8, (os.cpu_count() or 2) * 2)   # extraction is mostly I/O + zlib (GIL released)
+
+FIGURE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+REQUIRED_FIELDS = ("title", "url", "resource_type")
+
+logger = logging.getLogger("import_submissions")
+
+
+class SubmissionError(Exception):
+    """A submission ZIP that cannot be imported as-is."""
+
+
+# -------------------------------------------------
+# POLICY
+# -------------------------------------------------
+def load_policy(path: Path = POLICY_FILE) -> Dict[str, Any]:
+    """
+    Course-manager defaults for TO_BE_FILLED_BY_COURSE_MANAGER fields, e.g.
+
+        fields:
+          item_id: "{stem}"
+          date_released: "{today}"
+        author_affiliation: "University of ..."
+
+    Values may use {stem}, {today}, {title_slug} and {lang}.
+    """
+    try:
+        return yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    except FileNotFoundError:
+        logger.warning("No policy file at %s; placeholders are left as they are.", path)
+        return {}
+
+
+def fill_placeholders(yaml_text: str, policy: Dict[str, Any], context: Dict[str, str]) -> str:
+    """
+    Replace `key: TO_BE_FILLED_BY_COURSE_MANAGER` lines using the policy.
+    Works on the text, so the CataLogger template comments survive.
+    """
+    fields = {k: str(v).format(**context) for k, v in (policy.get("fields") or {}).items()}
+    affiliation = policy.get("author_affiliation")
+    if affiliation:
+        fields.setdefault("affiliation", str(affiliation).format(**context))
+
+    def _sub(m: re.Match) -> str:
+        value = fields.get(m.group("key"))
+        if value is None:
+            return m.group(0)
+        # quoted, so a value like "Dept. of Physics: Optics" or "#1" stays one string
+        return f"{m.group('lead')}{m.group('key')}: {json.dumps(value, ensure_ascii=False)}{m.group('rest')}"
+
+    pattern = re.compile(
+        rf"^(?P<lead>\s*(?:-\s+)?)(?P<key>\w+):\s*{PLACEHOLDER}(?P<rest>[ \t]*(?:#.*)?)$",
+        re.MULTILINE,
+    )
+    return pattern.sub(_sub, yaml_text)
+
+
+# -------------------------------------------------
+# VALIDATION
+# -------------------------------------------------
+def validate_submission(data: Dict[str, Any], figure_ids: List[int]) -> List[str]:
+    errors = []
+    if not isinstance(data, dict):
+        return ["YAML is not a mapping"]
+    for field in REQUIRED_FIELDS:
+        if not str(data.get(field) or "").strip():
+            errors.append(f"missing '{field}'")
+    if not (str(data.get("topic") or "").strip() or str(data.get("topic_page_id") or "").strip()):
+        errors.append("missing 'topic' / 'topic_page_id'")
+
+    declared = {
+        int(f.get("id")) for f in (data.get("figures") or [])
+        if isinstance(f, dict) and str(f.get("id", "")).isdigit()
+    }
+    for fid in sorted(declared - set(figure_ids)):
+        errors.append(f"figure {fid} declared in YAML but missing from ZIP")
+    for fid in sorted(set(figure_ids) - declared):
+        errors.append(f"figure file {fid} in ZIP but not declared in YAML")
+    return errors
+
+
+# -------------------------------------------------
+# IMPORT OF ONE ZIP
+# -------------------------------------------------
+def hash_zip(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _plan_members(zf: zipfile.ZipFile) -> Dict[str, Any]:
+    """
+    Find the YAML and its figures using the CataLogger naming convention:
+    <stem>.yaml and <stem>_fig<N>.<ext>. Directory parts inside the ZIP are ignored.
+    """
+    yaml_members = [
+        m for m in zf.infolist()
+        if not m.is_dir() and Path(m.filename).suffix.lower() in (".yaml", ".yml")
+    ]
+    if len(yaml_members) != 1:
+        raise SubmissionError(f"expected exactly one YAML file, found {len(yaml_members)}")
+    yaml_member = yaml_members[0]
+    stem = Path(yaml_member.filename).stem
+
+    fig_re = re.compile(rf"^{re.escape(stem)}_fig(\d+)(\.[A-Za-z0-9]+)$")
+    figures = {}
+    for m in zf.infolist():
+        name = Path(m.filename).name
+        match = fig_re.match(name)
+        if match and match.group(2).lower() in FIGURE_EXTENSIONS and not m.is_dir():
+            figures[int(match.group(1))] = (m, f"{stem}_fig{match.group(1)}{match.group(2).lower()}")
+    return {"stem": stem, "yaml": yaml_member, "figures": figures}
+
+
+def import_zip(
+    zip_path: Path,
+    resources_dir: Path,
+    policy: Dict[str, Any],
+    digest: str,
+) -> Dict[str, Any]:
+    """
+    Extract one submission into resources_dir/<stem>/.
+
+    Figures are streamed member by member (never the whole archive in
+    memory) into a temporary folder that is renamed into place only once
+    everything validated.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        plan = _plan_members(zf)
+        stem = plan["stem"]
+        target = Path(resources_dir) / stem
+        if target.exists():
+            raise SubmissionError(f"{target} already exists")
+
+        yaml_text = zf.read(plan["yaml"]).decode("utf-8")
+        try:
+            data = yaml.safe_load(yaml_text) or {}
+        except yaml.YAMLError as e:
+            raise SubmissionError(f"invalid YAML: {e}") from e
+
+        errors = validate_submission(data, list(plan["figures"]))
+        if errors:
+            raise SubmissionError("; ".join(errors))
+
+        lang = stem.split("_")[1] if stem.count("_") >= 1 else ""
+        context = {
+            "stem": stem,
+            "today": date.today().isoformat(),
+            "title_slug": re.sub(r"[^a-z0-9]+", "-", str(data.get("title", "")).lower()).strip("-"),
+            "lang": lang,
+        }
+        yaml_text = fill_placeholders(yaml_text, policy, context)
+        try:
+            filled = yaml.safe_load(yaml_text) or {}
+        except yaml.YAMLError as e:
+            raise SubmissionError(f"invalid YAML after filling placeholders: {e}") from e
+        errors = validate_submission(filled, list(plan["figures"]))
+        if errors:
+            raise SubmissionError("after filling placeholders: " + "; ".join(errors))
+
+        Path(resources_dir).mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".import-{stem}-", dir=resources_dir))
+        try:
+            (staging / f"{stem}.yaml").write_text(yaml_text, encoding="utf-8")
+            for member, out_name in plan["figures"].values():
+                with zf.open(member) as src, open(staging / out_name, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    return {
+        "zip": str(zip_path),
+        "sha256": digest,
+        "stem": stem,
+        "figures": len(plan["figures"]),
+        "placeholders_left": yaml_text.count(PLACEHOLDER),
+    }
+
+
+# -------------------------------------------------
+# BULK IMPORT
+# -------------------------------------------------
+def load_registry(path: Path = IMPORT_REGISTRY) -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def save_registry(registry: Dict[str, Dict[str, Any]], path: Path = IMPORT_REGISTRY) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(registry, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def import_directory(
+    zip_dir: Path,
+    resources_dir: Path = RESOURCES_DIR,
+    policy: Optional[Dict[str, Any]] = None,
+    registry_path: Path = IMPORT_REGISTRY,
+    workers: int = MAX_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Import every *.zip in zip_dir in parallel, skipping archives whose hash
+    is already in the registry. Returns imported / skipped / failed lists.
+    """
+    policy = policy or {}
+    registry = load_registry(registry_path)
+    zips = sorted(Path(zip_dir).glob("*.zip"))
+    result: Dict[str, List[Any]] = {"imported": [], "skipped": [], "failed": []}
+
+    def _one(zip_path: Path) -> Dict[str, Any]:
+        digest = hash_zip(zip_path)
+        if digest in registry:
+            return {"zip": str(zip_path), "sha256": digest, "skipped": True}
+        return import_zip(zip_path, resources_dir, policy, digest)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_one, z): z for z in zips}
+        for fut in as_completed(futures):
+            zip_path = futures[fut]
+            try:
+                info = fut.result()
+            except (SubmissionError, zipfile.BadZipFile, UnicodeDecodeError, OSError) as e:
+                logger.error("Rejected %s: %s", zip_path.name, e)
+                result["failed"].append({"zip": str(zip_path), "error": str(e)})
+                continue
+            if info.get("skipped"):
+                logger.debug("Already imported: %s", zip_path.name)
+                result["skipped"].append(info)
+                continue
+            registry[info["sha256"]] = {"zip": zip_path.name, "stem": info["stem"]}
+            result["imported"].append(info)
+            logger.info(
+                "Imported %s -> %s/ (%d figure(s), %d placeholder(s) left)",
+                zip_path.name, info["stem"], info["figures"], info["placeholders_left"],
+            )
+
+    save_registry(registry, registry_path)
+    return result
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-import CataLogger submission ZIPs.")
+    parser.add_argument("zip_dir", type=Path, help="Directory containing submission ZIPs.")
+    parser.add_argument("--policy", type=Path, default=POLICY_FILE)
+    parser.add_argument("--resources", type=Path, default=RESOURCES_DIR)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(asctime)s %(levelname)-7s %(name)s: %(message)s",
+    )
+
+    result = import_directory(
+        args.zip_dir,
+        resources_dir=args.resources,
+        policy=load_policy(args.policy),
+        registry_path=args.resources / IMPORT_REGISTRY.name,
+        workers=args.workers,
+    )
+    logger.info(
+        "Done: %d imported, %d already imported, %d rejected.",
+        len(result["imported"]), len(result["skipped"]), len(result["failed"]),
+    )
+    if result["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
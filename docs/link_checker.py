@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from resource_model import Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+CACHE_FILE = Path(".link_cache.json")     # results of previous runs
+REPORT_FILE = Path("link_report.json")    # broken links keyed by resource file
+
+CACHE_TTL_S = 7 * 24 * 3600     # re-check a link at most once a week
+MAX_CONNECTIONS = 50            # size of the shared connection pool
+MAX_PER_HOST = 4                # be polite to Binder / Streamlit / YouTube
+TIMEOUT_S = 15.0                # total timeout per request
+RETRIES = 2                     # extra attempts on timeouts / 429 / 5xx
+RETRY_BACKOFF_S = 0.5           # doubled after every failed attempt
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Some hosts refuse HEAD; fall back to a (streamed, unread) GET for these.
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+USER_AGENT = "iNUX-catalogue-linkcheck/1.0"
+
+logger = logging.getLogger("link_checker")
+
+
+# -------------------------------------------------
+# RESULT CACHE
+# -------------------------------------------------
+class LinkCache:
+    """
+    JSON-backed cache of link results.
+
+    Each entry keeps the last status plus the ETag / Last-Modified validators,
+    so stale entries can be revalidated with a cheap conditional request.
+    """
+
+    def __init__(self, path: Optional[Path] = CACHE_FILE, ttl: float = CACHE_TTL_S):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path and self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable link cache %s: %s", self.path, e)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def is_fresh(self, entry: Optional[Dict[str, Any]], now: float) -> bool:
+        # Broken links are always re-checked; only good results are trusted for the TTL.
+        return bool(entry) and entry.get("ok") and now - entry.get("checked_at", 0) < self.ttl
+
+    def put(self, url: str, entry: Dict[str, Any]) -> None:
+        self.entries[url] = entry
+
+    def save(self) -> None:
+        if self.path:
+            self.path.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding="utf-8")
+
+
+# -------------------------------------------------
+# CHECKING
+# -------------------------------------------------
+def is_checkable(url: str) -> bool:
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+
+async def _request_status(
+    session: aiohttp.ClientSession, method: str, url: str, headers: Dict[str, str]
+) -> aiohttp.ClientResponse:
+    async with session.request(method, url, headers=headers, allow_redirects=True) as resp:
+        # Never read the body; status + validators are all we need.
+        return resp
+
+
+async def check_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    cached: Optional[Dict[str, Any]] = None,
+    retries: int = RETRIES,
+    backoff: float = RETRY_BACKOFF_S,
+) -> Dict[str, Any]:
+    """
+    Check one URL and return a cache entry:
+    {ok, status, error, checked_at, etag, last_modified}, plus
+    revalidated=True when the server answered 304 Not Modified.
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if cached and cached.get("ok"):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    status: Optional[int] = None
+    error = ""
+    resp = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            resp = await _request_status(session, "HEAD", url, headers)
+            if resp.status in HEAD_FALLBACK_STATUSES:
+                resp = await _request_status(session, "GET", url, headers)
+            status, error = resp.status, ""
+            if status not in RETRY_STATUSES:
+                break
+        except asyncio.TimeoutError:
+            status, error, resp = None, "timeout", None
+        except aiohttp.ClientError as e:
+            status, error, resp = None, f"{type(e).__name__}: {e}", None
+
+    now = time.time()
+    if status == 304 and cached:
+        # Unchanged since the last successful check.
+        return {**cached, "checked_at": now, "revalidated": True}
+
+    return {
+        "ok": status is not None and status < 400,
+        "status": status,
+        "error": error,
+        "checked_at": now,
+        "etag": resp.headers.get("ETag", "") if resp is not None else "",
+        "last_modified": resp.headers.get("Last-Modified", "") if resp is not None else "",
+    }
+
+
+async def check_urls(
+    urls: Iterable[str],
+    cache: LinkCache,
+    max_connections: int = MAX_CONNECTIONS,
+    max_per_host: int = MAX_PER_HOST,
+    timeout: float = TIMEOUT_S,
+    retries: int = RETRIES,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Check many URLs concurrently over one bounded connection pool.
+
+    Fresh cache entries are returned without a request; stale ones are
+    revalidated. The global and per-host limits are enforced by semaphores
+    before a request starts, so the per-request timeout only counts time
+    spent on the wire, not time queued behind other requests to the host.
+    """
+    now = time.time()
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: List[str] = []
+
+    for url in dict.fromkeys(urls):
+        if not is_checkable(url):
+            results[url] = {"ok": False, "status": None, "error": "invalid URL", "checked_at": now}
+            continue
+        entry = cache.get(url)
+        if cache.is_fresh(entry, now):
+            results[url] = {**entry, "cached": True}
+        else:
+            pending.append(url)
+
+    if pending:
+        connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_per_host)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            slots = asyncio.Semaphore(max_connections)
+            host_slots: Dict[str, asyncio.Semaphore] = {}
+
+            async def check_when_free(url: str) -> Dict[str, Any]:
+                host = host_slots.setdefault(urlsplit(url).netloc.lower(), asyncio.Semaphore(max_per_host))
+                async with host, slots:
+                    return await check_url(session, url, cache.get(url), retries=retries)
+
+            checked = await asyncio.gather(*(check_when_free(url) for url in pending))
+        for url, result in zip(pending, checked):
+            # like "cached", "revalidated" describes this run, not the link
+            cache.put(url, {k: v for k, v in result.items() if k != "revalidated"})
+            results[url] = result
+
+    return results
+
+
+# -------------------------------------------------
+# RESOURCE INTEGRATION
+# -------------------------------------------------
+def collect_links(resources: Iterable[Resource]) -> Dict[str, List[str]]:
+    """
+    Map each resource URL to the resource files that reference it.
+    Only the URL and file name are kept, so resources can be streamed in.
+    """
+    links: Dict[str, List[str]] = {}
+    for res in resources:
+        links.setdefault(res.url.strip(), []).append(res.file_path)
+    return links
+
+
+def run_link_check(
+    resources: Iterable[Resource],
+    cache_path: Optional[Path] = CACHE_FILE,
+    ttl: float = CACHE_TTL_S,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Check every resource URL and return a report of broken links keyed by
+    resource file. The cache is updated in place.
+    """
+    cache = LinkCache(cache_path, ttl)
+    links = collect_links(resources)
+
+    t0 = time.perf_counter()
+    results = asyncio.run(check_urls(links.keys(), cache, **kwargs))
+    elapsed = time.perf_counter() - t0
+    cache.save()
+
+    broken: Dict[str, List[Dict[str, Any]]] = {}
+    for url, result in results.items():
+        if result.get("ok"):
+            continue
+        for source in links[url]:
+            broken.setdefault(source, []).append(
+                {"url": url, "status": result.get("status"), "error": result.get("error", "")}
+            )
+
+    return {
+        "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "urls": len(results),
+        "from_cache": sum(1 for r in results.values() if r.get("cached")),
+        "revalidated": sum(1 for r in results.values() if r.get("revalidated")),
+        "seconds": round(elapsed, 3),
+        "broken_count": sum(len(v) for v in broken.values()),
+        "broken": dict(sorted(broken.items())),
+    }
+
+
+def write_report(report: Dict[str, Any], path: Path = REPORT_FILE) -> None:
+    Path(path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    from generate_docs import RESOURCES_DIR, load_all_resources
+
+    parser = argparse.ArgumentParser(description="Check all resource URLs in the catalogue.")
+    parser.add_argument("--resources", type=Path, default=RESOURCES_DIR)
+    parser.add_argument("--report", type=Path, default=REPORT_FILE)
+    parser.add_argument("--cache", type=Path, default=CACHE_FILE)
+    parser.add_argument("--ttl", type=float, default=CACHE_TTL_S, help="Cache TTL in seconds.")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS)
+    parser.add_argument("--max-per-host", type=int, default=MAX_PER_HOST)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_S)
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    all_resources = load_all_resources(args.resources)
+    report = run_link_check(
+        (r for group in all_resources.values() for r in group),
+        cache_path=args.cache,
+        ttl=args.ttl,
+        max_connections=args.max_connections,
+        max_per_host=args.max_per_host,
+        timeout=args.timeout,
+        retries=args.retries,
+    )
+    write_report(report, args.report)
+    logger.info(
+        "Checked %d URLs in %.1fs (%d cached, %d revalidated): %d broken link(s). Report: %s",
+        report["urls"], report["seconds"], report["from_cache"], report["revalidated"],
+        report["broken_count"], args.report,
+    )
+
+
+if __name__ == "__main__":
+    main()
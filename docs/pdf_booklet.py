@@ -0,0 +1,400 @@
+import argparse
+import logging
+import os
+import time
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from PIL import Image as PILImage, ImageOps
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import (
+    BaseDocTemplate,
+    Flowable,
+    Frame,
+    Image,
+    PageBreak,
+    PageTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    TableStyle,
+)
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from asset_store import figure_file_index, load_manifest, resolve_figure_urls
+from generate_docs import (
+    DATA_FILE,
+    NAV_STATIC_PAGES,
+    RESOURCES_DIR,
+    build_nav_tree,
+    build_resource_index,
+    format_authors_for_table,
+    group_index,
+    iter_indexed_resources,
+)
+from resource_model import Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+OUTPUT_FILE = Path("inux_catalogue_booklet.pdf")
+BOOKLET_TITLE = "iNUX Interactive Resources Catalogue"
+
+PAGE_MARGIN = 20 * mm
+FIGURE_MAX_W = 160 * mm       # same box as the single-resource sheet
+FIGURE_MAX_H = 90 * mm
+FIGURE_MAX_PX = 1200          # figures are downscaled to this (longest side) before embedding
+FIGURE_JPEG_QUALITY = 80
+TOC_LEVELS = 3                # catalogue levels listed in the table of contents
+EXIF_ORIENTATION = 0x0112
+
+logger = logging.getLogger("pdf_booklet")
+
+
+# -------------------------------------------------
+# STYLES (built once per process)
+# -------------------------------------------------
+@lru_cache(maxsize=None)
+def booklet_styles() -> Dict[str, ParagraphStyle]:
+    base = getSampleStyleSheet()
+    styles = {
+        "cover_title": ParagraphStyle("BookletCover", parent=base["Title"], fontSize=26, leading=32),
+        "cover_sub": ParagraphStyle("BookletCoverSub", parent=base["Normal"], fontSize=13, leading=18,
+                                    alignment=1, textColor=colors.HexColor("#555555")),
+        "toc_title": ParagraphStyle("BookletTocTitle", parent=base["Heading1"], spaceAfter=12),
+        "body": ParagraphStyle("BookletBody", parent=base["Normal"], fontSize=9.5, leading=12.5, spaceAfter=3),
+        "meta": ParagraphStyle("BookletMeta", parent=base["Normal"], fontSize=8.5, leading=11,
+                               textColor=colors.HexColor("#444444"), spaceAfter=3),
+        "resource": ParagraphStyle("BookletResource", parent=base["Heading4"], fontSize=11, leading=14,
+                                   spaceBefore=8, spaceAfter=3, textColor=colors.HexColor("#1f4e79")),
+        "caption": ParagraphStyle("BookletCaption", parent=base["Normal"], fontSize=8, leading=10,
+                                  alignment=1, textColor=colors.HexColor("#555555")),
+        "empty": ParagraphStyle("BookletEmpty", parent=base["Italic"], fontSize=9, textColor=colors.grey),
+    }
+    # Catalogue levels 0..3 -> Heading1..Heading4
+    for level in range(4):
+        styles[f"h{level}"] = ParagraphStyle(
+            f"BookletH{level}", parent=base[f"Heading{level + 1}"], keepWithNext=1
+        )
+    return styles
+
+
+@lru_cache(maxsize=None)
+def toc_level_styles() -> Tuple[ParagraphStyle, ...]:
+    return tuple(
+        ParagraphStyle(
+            f"BookletTOC{level}", fontName="Helvetica-Bold" if level == 0 else "Helvetica",
+            fontSize=11 - level, leading=14 - level, leftIndent=8 * mm * level,
+            firstLineIndent=0, spaceBefore=4 if level == 0 else 0,
+        )
+        for level in range(TOC_LEVELS)
+    )
+
+
+FIGURE_TABLE_STYLE = TableStyle(
+    [
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]
+)
+
+
+# -------------------------------------------------
+# DOCUMENT
+# -------------------------------------------------
+class BookletDocTemplate(BaseDocTemplate):
+    """
+    A4 template that records where every section starts, adds PDF
+    bookmarks (outline), reports TOC entries and draws page numbers.
+    """
+
+    def __init__(self, target: Any, title: str, toc: Optional[TableOfContents] = None):
+        super().__init__(
+            target, pagesize=A4, title=title, author="iNUX",
+            leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN,
+            topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN,
+        )
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="body")
+        self.addPageTemplates([PageTemplate(id="page", frames=[frame], onPage=self._draw_footer)])
+        self.section_pages: Dict[str, int] = {}
+        self.toc = toc
+
+    def _draw_footer(self, canvas, doc) -> None:
+        if doc.page == 1:
+            return
+        canvas.saveState()
+        canvas.setFont("Helvetica", 8)
+        canvas.drawCentredString(A4[0] / 2.0, 12 * mm, str(doc.page))
+        canvas.restoreState()
+
+    def afterFlowable(self, flowable: Flowable) -> None:
+        mark = getattr(flowable, "_booklet_mark", None)
+        if mark is None:
+            return
+        key, title, level, in_toc = mark
+        self.section_pages[key] = self.page
+        self.canv.bookmarkPage(key)
+        self.canv.addOutlineEntry(title, key, level=level, closed=level >= 1)
+        if in_toc and self.toc is not None:
+            self.toc.addEntry(level, escape(title), self.page, key)
+
+
+class SectionStream(list):
+    """
+    Story for BaseDocTemplate.build() that is filled one section at a time
+    as build() consumes it, so only the current section is held in memory.
+    """
+
+    def __init__(self, sections: Iterator[List[Flowable]]):
+        super().__init__()
+        self._sections = iter(sections)
+
+    def __len__(self) -> int:
+        while not super().__len__():
+            section = next(self._sections, None)
+            if section is None:
+                break
+            self.extend(section)
+        return super().__len__()
+
+
+def marked(flowable: Flowable, key: str, title: str, level: int, in_toc: bool = False) -> Flowable:
+    flowable._booklet_mark = (key, title, level, in_toc)
+    return flowable
+
+
+# -------------------------------------------------
+# CONTENT
+# -------------------------------------------------
+def figure_path(fig: Any) -> Optional[Path]:
+    # fig.url is site-relative (/assets/store/... or /assets/resources/...)
+    return Path(fig.url.lstrip("/")) if fig.url else None
+
+
+def fit_box(width_px: int, height_px: int) -> Tuple[float, float]:
+    scale = min(FIGURE_MAX_W / width_px, FIGURE_MAX_H / height_px)
+    return width_px * scale, height_px * scale
+
+
+def downscaled_figure(path: Path) -> BytesIO:
+    """
+    Decode, shrink to FIGURE_MAX_PX and re-encode, so the booklet embeds a
+    print-sized image instead of the original upload.
+    """
+    img = PILImage.open(path)
+    img.draft("RGB", (FIGURE_MAX_PX, FIGURE_MAX_PX))
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail((FIGURE_MAX_PX, FIGURE_MAX_PX))
+    out = BytesIO()
+    if img.mode in ("RGBA", "LA", "P"):
+        img.save(out, format="PNG", optimize=True)
+    else:
+        img.convert("RGB").save(out, format="JPEG", quality=FIGURE_JPEG_QUALITY, optimize=True)
+    out.seek(0)
+    return out
+
+
+def figure_flowables(resource: Resource, layout_only: bool) -> List[Flowable]:
+    """
+    One boxed figure + caption per figure. With layout_only the image is a
+    spacer of the same size (its header is read, the pixels are not), which
+    is all the table-of-contents pass needs.
+    """
+    styles = booklet_styles()
+    out: List[Flowable] = []
+    for n, fig in enumerate(resource.figures, start=1):
+        path = figure_path(fig)
+        if path is None or not path.exists():
+            continue
+        try:
+            with PILImage.open(path) as probe:
+                w, h = probe.size
+                if probe.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):  # rotated by 90 degrees
+                    w, h = h, w
+            draw_w, draw_h = fit_box(w, h)
+            img: Flowable = Spacer(draw_w, draw_h) if layout_only else Image(downscaled_figure(path), draw_w, draw_h)
+        except OSError as e:
+            logger.warning("Skipping unreadable figure %s: %s", path, e)
+            continue
+        caption = escape(fig.caption or f"Figure {n}") + (f" ({escape(fig.type)})" if fig.type else "")
+        table = Table([[img], [Paragraph(caption, styles["caption"])]], colWidths=[FIGURE_MAX_W + 8])
+        table.setStyle(FIGURE_TABLE_STYLE)
+        out += [table, Spacer(1, 6)]
+    return out
+
+
+def resource_flowables(resource: Resource, level: int, layout_only: bool) -> List[Flowable]:
+    styles = booklet_styles()
+    key = f"res-{resource.file_stem}"
+    out: List[Flowable] = [
+        marked(Paragraph(escape(resource.title), styles["resource"]), key, resource.title, level),
+        Paragraph(
+            f"<b>Type:</b> {escape(resource.resource_type)} &nbsp; <b>Time:</b> {escape(resource.time_required)}"
+            f" &nbsp; <b>Released:</b> {escape(resource.date_released)}",
+            styles["meta"],
+        ),
+        Paragraph(f"<b>Author(s):</b> {escape(format_authors_for_table(resource.authors))}", styles["meta"]),
+    ]
+    if resource.keywords:
+        out.append(Paragraph(f"<b>Keywords:</b> {escape(', '.join(resource.keywords))}", styles["meta"]))
+    out.append(Paragraph(escape(resource.description_short), styles["body"]))
+    url = escape(resource.url)
+    out.append(Paragraph(f'<b>Access:</b> <link href="{url}" color="blue">{url}</link>', styles["meta"]))
+    out += figure_flowables(resource, layout_only)
+    return out
+
+
+def walk(nodes: List[Dict[str, Any]], level: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+    for node in nodes:
+        yield node, level
+        yield from walk(node["children"], level + 1)
+
+
+def find_subtree(roots: List[Dict[str, Any]], page_id: str) -> List[Dict[str, Any]]:
+    for node, _ in walk(roots):
+        if node["id"] == page_id:
+            return [node]
+    raise SystemExit(f"page_id {page_id!r} not found in {DATA_FILE}")
+
+
+def iter_sections(
+    roots: List[Dict[str, Any]],
+    groups: Dict[str, List[str]],
+    manifest: Dict[str, Dict[str, Any]],
+    file_index: Any,
+    toc: TableOfContents,
+    subtitle: str,
+    layout_only: bool,
+) -> Iterator[List[Flowable]]:
+    """
+    Cover + TOC, then one flowable list per catalogue page. Each page's
+    resources are loaded from disk when its section is reached and dropped
+    after it has been laid out.
+    """
+    styles = booklet_styles()
+    yield [
+        Spacer(1, 60 * mm),
+        Paragraph(escape(BOOKLET_TITLE), styles["cover_title"]),
+        Spacer(1, 6 * mm),
+        Paragraph(escape(subtitle), styles["cover_sub"]),
+        Paragraph(date.today().isoformat(), styles["cover_sub"]),
+        PageBreak(),
+        Paragraph("Contents", styles["toc_title"]),
+        toc,
+        PageBreak(),
+    ]
+
+    first = True
+    for node, level in walk(roots):
+        flowables: List[Flowable] = []
+        if level == 0 and not first:
+            flowables.append(PageBreak())
+        first = False
+        flowables.append(
+            marked(
+                Paragraph(escape(node["title"]), styles[f"h{min(level, 3)}"]),
+                node["id"], node["title"], level, in_toc=level < TOC_LEVELS,
+            )
+        )
+
+        paths = groups.get(node["id"]) or groups.get(node["title"]) or []
+        page_resources = {node["id"]: sorted(iter_indexed_resources(paths), key=lambda r: r.title.lower())}
+        resolve_figure_urls(page_resources, manifest, file_index=file_index)
+        for res in page_resources[node["id"]]:
+            flowables += resource_flowables(res, level + 1, layout_only)
+        if not paths and not node["children"]:
+            flowables.append(Paragraph("No resources submitted for this topic yet.", styles["empty"]))
+        yield flowables
+
+
+# -------------------------------------------------
+# BOOKLET
+# -------------------------------------------------
+def build_booklet(
+    output: Path = OUTPUT_FILE,
+    root_page_id: Optional[str] = None,
+    lang: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Two streamed passes, as multiBuild() does for a story held in memory:
+    the first lays everything out (figures as spacers of the final size)
+    and collects the TOC entries with their pages, the second writes the
+    PDF showing them. The first pass shows the same entries with page 0,
+    so the TOC has the same length in both passes.
+    """
+    df = pd.read_excel(DATA_FILE, dtype=str).fillna("")
+    if lang:
+        df = df[df["lang_code"].replace("", "en") == lang]
+    static_ids = {p["id"] for p in NAV_STATIC_PAGES}
+    roots = [n for n in build_nav_tree(df)["roots"] if n["id"] not in static_ids]
+    if root_page_id:
+        roots = find_subtree(roots, root_page_id)
+    subtitle = roots[0]["title"] if root_page_id else "Complete catalogue"
+
+    groups = group_index(build_resource_index(RESOURCES_DIR))
+    manifest = load_manifest()
+    file_index = figure_file_index()
+    toc_nodes = [(node, level) for node, level in walk(roots) if level < TOC_LEVELS]
+
+    toc = TableOfContents(levelStyles=list(toc_level_styles()), dotsMinLevel=0)
+    toc.addEntries([(level, escape(node["title"]), 0, node["id"]) for node, level in toc_nodes])
+
+    def _pass(target: Any, layout_only: bool) -> BookletDocTemplate:
+        # shows the entries collected so far and starts collecting anew
+        toc.beforeBuild()
+        doc = BookletDocTemplate(target, BOOKLET_TITLE, toc)
+        doc.build(SectionStream(iter_sections(roots, groups, manifest, file_index, toc, subtitle, layout_only)))
+        return doc
+
+    t0 = time.perf_counter()
+    layout = _pass(os.devnull, layout_only=True)
+    t1 = time.perf_counter()
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    final = _pass(str(output), layout_only=False)
+    t2 = time.perf_counter()
+
+    if not toc.isSatisfied():
+        logger.warning("Page numbers moved between passes; the table of contents may be off.")
+    return {
+        "output": str(output),
+        "pages": final.page,
+        "sections": len(toc_nodes),
+        "layout_s": round(t1 - t0, 3),
+        "render_s": round(t2 - t1, 3),
+        "bytes": Path(output).stat().st_size,
+    }
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render the catalogue (or a subtree) into one PDF booklet.")
+    parser.add_argument("--root", default=None, help="page_id of the category subtree to export (default: all).")
+    parser.add_argument("--lang", default=None, help="Only pages with this lang_code.")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    stats = build_booklet(args.output, args.root, args.lang)
+    logger.info(
+        "Wrote %s: %d pages, %d sections, %.0f KiB (layout %.1fs, render %.1fs)",
+        stats["output"], stats["pages"], stats["sections"], stats["bytes"] / 1024,
+        stats["layout_s"], stats["render_s"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Sequence, Tuple
+
+from catalogger_core import yaml_to_pdf_bytes
+from worker_pool import WorkerPool
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+# Render processes; 0 renders inline in the calling thread (old behaviour)
+MAX_WORKERS = int(os.environ.get("CATALOGGER_PDF_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+RENDER_TIMEOUT_S = float(os.environ.get("CATALOGGER_PDF_TIMEOUT_S", 90))
+RESULT_CACHE_ENTRIES = 16        # finished PDFs kept for identical requests from other sessions
+INITIAL_ESTIMATE_S = 2.0         # progress estimate before any render has finished
+
+logger = logging.getLogger("pdf_render_pool")
+
+PdfResult = Tuple[bytes, Dict[str, float]]
+
+
+class FigureBytes:
+    """
+    A figure with the interface of a Streamlit upload (.name, .getvalue()),
+    small enough to pickle into a worker process.
+    """
+
+    __slots__ = ("name", "data")
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self.data = data
+
+    def getvalue(self) -> bytes:
+        return self.data
+
+
+def render_key(yaml_text: str, language_label: str, figures: Sequence[Tuple[str, bytes]]) -> str:
+    """
+    Content key of a PDF: equal inputs give the same PDF, whoever asks.
+    """
+    h = hashlib.sha256()
+    for part in (yaml_text, language_label):
+        h.update(part.encode("utf-8") + b"\0")
+    for name, data in figures:
+        h.update(name.encode("utf-8") + b"\0" + hashlib.sha256(data).digest())
+    return h.hexdigest()
+
+
+def render_pdf(yaml_text: str, language_label: str, figures: Sequence[Tuple[str, bytes]]) -> PdfResult:
+    """
+    One PDF and its stage timings; runs in a worker process.
+    """
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    pdf = yaml_to_pdf_bytes(yaml_text, language_label, [FigureBytes(n, d) for n, d in figures], timings=timings)
+    timings["total"] = time.perf_counter() - t0
+    return pdf, timings
+
+
+# -------------------------------------------------
+# SHARED POOL
+# -------------------------------------------------
+class PdfRenderPool:
+    """
+    Bounded process pool for ReportLab renders, shared by all sessions of
+    a server process, so a heavy PDF no longer holds the GIL of the
+    Streamlit process.
+
+    Requests are deduplicated by content key: a request for a PDF that is
+    already being rendered gets the same future, and recently finished
+    PDFs are answered from a small cache. A request that times out keeps
+    rendering in the background; its result still lands in the cache.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, cache_entries: int = RESULT_CACHE_ENTRIES):
+        self.max_workers = max_workers
+        self.cache_entries = cache_entries
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._done: "OrderedDict[str, PdfResult]" = OrderedDict()
+        self._avg_s = INITIAL_ESTIMATE_S
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = WorkerPool(max_workers=self.max_workers)
+        return self._pool
+
+    def submit(
+        self, key: str, yaml_text: str, language_label: str, figures: Sequence[Tuple[str, bytes]]
+    ) -> "Future[PdfResult]":
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                future: Future = Future()
+                future.set_result(self._done[key])
+                return future
+            if key in self._in_flight:
+                return self._in_flight[key]
+
+            if self.max_workers <= 0:
+                # rendered inline below, outside the lock; identical requests wait on this future
+                future = Future()
+            else:
+                try:
+                    future = self._executor().submit(render_pdf, yaml_text, language_label, list(figures))
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a fresh pool
+                    logger.warning("PDF render pool was broken; restarting it.")
+                    self._pool = None
+                    future = self._executor().submit(render_pdf, yaml_text, language_label, list(figures))
+            self._in_flight[key] = future
+        future.add_done_callback(lambda f, key=key: self._finished(key, f))
+
+        if self.max_workers <= 0:
+            try:
+                future.set_result(render_pdf(yaml_text, language_label, figures))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+
+    def _finished(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                if isinstance(future.exception(), BrokenProcessPool):
+                    self._pool = None
+                return
+            result = future.result()
+            self._done[key] = result
+            while len(self._done) > self.cache_entries:
+                self._done.popitem(last=False)
+            # running average, for the progress estimate
+            self._avg_s = 0.8 * self._avg_s + 0.2 * result[1].get("total", self._avg_s)
+
+    def expected_seconds(self) -> float:
+        """
+        Rough time for the next render: recent average, scaled by the
+        renders queued ahead of it.
+        """
+        queued = max(0, len(self._in_flight) - self.max_workers)
+        return self._avg_s * (1 + queued / max(1, self.max_workers))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import logging
+import mimetypes
+import re
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import generate_docs
+from asset_store import figure_file_index, load_manifest, resolve_figure_urls
+from generate_docs import (
+    CONTENTS_DIR,
+    DATA_FILE,
+    RESOURCES_DIR,
+    build_content_path,
+    build_nav_tree,
+    heading_anchor,
+    load_all_resources,
+    render_page,
+    resources_for_page,
+)
+from site_html import breadcrumb_html, markdown_to_html, nav_html, render_document, split_front_matter
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4001
+CACHE_PAGES = 256             # rendered pages kept in the LRU
+POLL_INTERVAL_S = 0.5         # how often inputs are checked for changes
+SSE_HEARTBEAT_S = 15
+
+STATIC_ROOTS = ("assets",)    # served as-is from the working directory
+PAGE_URL_RE = re.compile(r"^/docs/(?P<page_id>[^/]+)\.html$")
+
+RELOAD_SCRIPT = """<script>
+new EventSource("/__events").onmessage = function (e) { if (e.data === "reload") location.reload(); };
+</script>"""
+
+logger = logging.getLogger("preview_server")
+
+
+# -------------------------------------------------
+# IN-MEMORY STATE
+# -------------------------------------------------
+def stat_key(path: Path) -> Tuple[int, int]:
+    try:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+    except FileNotFoundError:
+        return 0, 0
+
+
+def tree_fingerprint(root: Path, pattern: str) -> str:
+    h = hashlib.sha1()
+    for path in sorted(root.rglob(pattern)):
+        h.update(f"{path.as_posix()}:{stat_key(path)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class PreviewState:
+    """
+    Page table, parsed resources and navigation, kept in memory and reloaded
+    only for the inputs that changed. Rendered pages live in an LRU keyed by
+    a hash of everything that went into them.
+    """
+
+    def __init__(self, cache_pages: int = CACHE_PAGES):
+        self.lock = threading.RLock()
+        self.changed = threading.Condition(self.lock)
+        self.version = 0
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_pages = cache_pages
+        self.hits = 0
+        self.misses = 0
+        self.fingerprints: Dict[str, str] = {}
+        self.df: Optional[pd.DataFrame] = None
+        self.rows: Dict[str, pd.Series] = {}
+        self.all_resources: Dict[str, List[Any]] = {}
+        self.refresh()
+
+    # --- loading -----------------------------------------------------------
+    def _fingerprints(self) -> Dict[str, str]:
+        return {
+            "pages": str(stat_key(Path(DATA_FILE))),
+            "resources": tree_fingerprint(RESOURCES_DIR, "*.yaml"),
+            "contents": tree_fingerprint(CONTENTS_DIR, "*.md"),
+        }
+
+    def _load_pages(self) -> None:
+        df = pd.read_excel(DATA_FILE, dtype=str).fillna("")
+        self.df = df
+        self.rows = {row["page_id"]: row for _, row in df.iterrows()}
+        self.title_by_page_id = dict(zip(df["page_id"], df["title"]))
+        self.parent_by_page_id = dict(zip(df["page_id"], df["parent_id"]))
+        self.nav_tree = build_nav_tree(df)
+
+    def _load_resources(self) -> None:
+        all_resources = load_all_resources(RESOURCES_DIR)
+        resolve_figure_urls(all_resources, load_manifest(), file_index=figure_file_index())
+        self.all_resources = all_resources
+
+    def refresh(self) -> bool:
+        """
+        Reload whatever changed on disk; returns True if anything did.
+        """
+        current = self._fingerprints()
+        if current == self.fingerprints:
+            return False
+        t0 = time.perf_counter()
+        with self.lock:
+            if current["pages"] != self.fingerprints.get("pages"):
+                self._load_pages()
+            if current["resources"] != self.fingerprints.get("resources"):
+                self._load_resources()
+            changed = [k for k in current if current[k] != self.fingerprints.get(k)]
+            self.fingerprints = current
+            self.version += 1
+            self.changed.notify_all()
+        logger.info("Inputs changed (%s); reloaded in %.0f ms.", ", ".join(changed), 1000 * (time.perf_counter() - t0))
+        return True
+
+    # --- rendering ---------------------------------------------------------
+    def input_hash(self, row: pd.Series) -> str:
+        """
+        Everything a topic page depends on: its spreadsheet row, its base
+        content file, the files of its resources, and the navigation.
+        """
+        h = hashlib.sha1()
+        h.update(repr(tuple(row.items())).encode("utf-8"))
+        h.update(str(stat_key(build_content_path(row))).encode("utf-8"))
+        for res in resources_for_page(row, self.all_resources):
+            h.update(f"{res.file_path}:{stat_key(Path(res.file_path))}".encode("utf-8"))
+        h.update(self.fingerprints["pages"].encode("utf-8"))
+        return h.hexdigest()
+
+    def render(self, page_id: str) -> Optional[str]:
+        with self.lock:
+            row = self.rows.get(page_id)
+            if row is None:
+                return None
+            key = self.input_hash(row)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+            t0 = time.perf_counter()
+            page_text = render_page(row, self.all_resources, self.title_by_page_id, self.parent_by_page_id)
+            if page_text is None:
+                return None
+            front_matter, body = split_front_matter(page_text)
+            document = render_document(
+                title=str(front_matter.get("title") or row["title"]),
+                content_html=markdown_to_html(body, slugify=heading_anchor),
+                nav=nav_html(self.nav_tree, page_id),
+                breadcrumb=breadcrumb_html(self.nav_tree, page_id),
+                head_extra=RELOAD_SCRIPT,
+                lang=row.get("lang_code") or "en",
+            )
+            self.cache[key] = document
+            if len(self.cache) > self.cache_pages:
+                self.cache.popitem(last=False)
+            logger.debug("Rendered %s in %.1f ms", page_id, 1000 * (time.perf_counter() - t0))
+            return document
+
+    def index_page(self) -> str:
+        with self.lock:
+            body = "<h1>Preview</h1><p>Pick a page in the navigation.</p>"
+            body += f"<p>{len(self.rows)} pages, cache {len(self.cache)}/{self.cache_pages} " \
+                    f"({self.hits} hits, {self.misses} misses).</p>"
+            return render_document("Preview", body, nav_html(self.nav_tree), head_extra=RELOAD_SCRIPT)
+
+    def watch(self, interval: float = POLL_INTERVAL_S) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Reload failed; keeping the previous state.")
+
+
+# -------------------------------------------------
+# HTTP
+# -------------------------------------------------
+class PreviewHandler(BaseHTTPRequestHandler):
+    state: PreviewState  # set on the class by make_server()
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        logger.debug("%s " + fmt, self.address_string(), *args)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if path == "/__events":
+            return self._events()
+        if path in ("/", "/index.html"):
+            return self._send(HTTPStatus.OK, self.state.index_page().encode("utf-8"), "text/html; charset=utf-8")
+
+        m = PAGE_URL_RE.match(path)
+        if m:
+            document = self.state.render(m.group("page_id"))
+            if document is None:
+                return self._send(HTTPStatus.NOT_FOUND, b"Unknown page", "text/plain")
+            return self._send(HTTPStatus.OK, document.encode("utf-8"), "text/html; charset=utf-8")
+
+        static = Path(path.lstrip("/"))
+        if static.parts and static.parts[0] in STATIC_ROOTS and ".." not in static.parts and static.is_file():
+            content_type = mimetypes.guess_type(static.name)[0] or "application/octet-stream"
+            return self._send(HTTPStatus.OK, static.read_bytes(), content_type)
+        self._send(HTTPStatus.NOT_FOUND, b"Not found", "text/plain")
+
+    def _events(self) -> None:
+        """
+        Server-sent events: "reload" whenever the inputs change.
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        state = self.state
+        with state.lock:
+            seen = state.version
+        try:
+            while True:
+                with state.changed:
+                    state.changed.wait_for(lambda: state.version != seen, timeout=SSE_HEARTBEAT_S)
+                    version = state.version
+                if version != seen:
+                    seen = version
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_server(host: str, port: int, state: PreviewState) -> ThreadingHTTPServer:
+    handler = type("BoundPreviewHandler", (PreviewHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Live preview of the catalogue pages (no Jekyll needed).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-pages", type=int, default=CACHE_PAGES)
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level), format="%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+    )
+    # Keep the generator's per-page info messages out of the preview log
+    generate_docs.logger.setLevel(max(logging.WARNING, getattr(logging, args.log_level)))
+
+    state = PreviewState(cache_pages=args.cache_pages)
+    threading.Thread(target=state.watch, name="input-watcher", daemon=True).start()
+
+    server = make_server(args.host, args.port, state)
+    logger.info("Preview at http://%s:%d/ (%d pages). Ctrl+C to stop.", args.host, args.port, len(state.rows))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from generate_docs import CONTENTS_DIR, DATA_FILE, INJECTION_MARKER, build_content_path
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+# page -> path + content hash as of the last applied run, for rename detection
+MANIFEST_FILE = CONTENTS_DIR / ".contents_manifest.json"
+ORPHAN_DIR = CONTENTS_DIR / "_orphaned"     # --move-orphans target
+
+CREATE = "create"
+RENAME = "rename"
+ORPHAN = "orphan"
+
+logger = logging.getLogger("reconcile_contents")
+
+
+# -------------------------------------------------
+# SNAPSHOT
+# -------------------------------------------------
+def snapshot(root: Path = CONTENTS_DIR) -> Tuple[Dict[str, Tuple[int, int]], Set[str]]:
+    """
+    One recursive scandir of the contents tree.
+    Returns ({file path: (size, mtime_ns)}, {directory path}), posix paths.
+    """
+    files: Dict[str, Tuple[int, int]] = {}
+    dirs: Set[str] = set()
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except FileNotFoundError:
+            continue
+        dirs.add(Path(current).as_posix())
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if Path(entry.path) != ORPHAN_DIR:
+                    stack.append(entry.path)
+            else:
+                st = entry.stat(follow_symlinks=False)
+                files[Path(entry.path).as_posix()] = (st.st_size, st.st_mtime_ns)
+    return files, dirs
+
+
+def file_hash(path: str) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> Dict[str, Dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")).get("pages", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(pages: Dict[str, Dict[str, Any]], path: Path = MANIFEST_FILE) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps({"version": 1, "pages": pages}, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def code_signature(path: str) -> Tuple[str, ...]:
+    """
+    The NN_ code of every folder below contents/, which survives a title change:
+    contents/04_basic_hydrogeology/06_regional_flow/06_regional_flow.md -> ("04", "06")
+    """
+    return tuple(part.split("_", 1)[0] for part in Path(path).parts[1:-1])
+
+
+def title_signature(path: str) -> Tuple[str, ...]:
+    """
+    The title part of every folder below contents/, which survives a reorder:
+    contents/04_basic_hydrogeology/06_regional_flow/06_regional_flow.md
+    -> ("basic_hydrogeology", "regional_flow")
+    """
+    return tuple(part.split("_", 1)[1] if "_" in part else part for part in Path(path).parts[1:-1])
+
+
+# -------------------------------------------------
+# PLAN
+# -------------------------------------------------
+def desired_tree(df: pd.DataFrame) -> Dict[str, Dict[str, str]]:
+    """
+    contents path -> {page_id, title} of the first row that uses it
+    (language variants of a page share one base file).
+    """
+    desired: Dict[str, Dict[str, str]] = {}
+    for row in df.to_dict("records"):
+        path = build_content_path(row).as_posix()
+        desired.setdefault(path, {"page_id": row["page_id"], "title": row.get("title", "") or "Untitled Page"})
+    return desired
+
+
+def build_plan(
+    desired: Dict[str, Dict[str, str]],
+    files: Dict[str, Tuple[int, int]],
+    manifest: Dict[str, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Diff the desired tree against the snapshot.
+
+    A missing page file is matched to an orphaned markdown file, in order of
+    confidence: same folder titles (the codes were reordered), same content
+    hash as the page had at the last run, same path as at the last run, and
+    the only orphan with the same folder codes (only the titles changed).
+    Title and code matches must be unambiguous. Matched files are renamed,
+    unmatched pages get a placeholder, and the leftover markdown files are
+    reported as orphans.
+    """
+    missing = [p for p in sorted(desired) if p not in files]
+    orphans = {p for p in files if p.endswith(".md") and p not in desired}
+
+    # Orphans are hashed only if some manifest entry can use the hash.
+    by_hash: Dict[str, str] = {}
+    if any(desired[p]["page_id"] in manifest for p in missing):
+        for p in sorted(orphans):
+            by_hash.setdefault(file_hash(p), p)
+    by_code: Dict[Tuple[str, ...], List[str]] = {}
+    by_title: Dict[Tuple[str, ...], List[str]] = {}
+    for p in sorted(orphans):
+        by_code.setdefault(code_signature(p), []).append(p)
+        by_title.setdefault(title_signature(p), []).append(p)
+
+    def unique(candidates: List[str]) -> Optional[str]:
+        return candidates[0] if len(candidates) == 1 else None
+
+    # Title matches first, for all pages, so that a reorder (e.g. two codes
+    # swapped) is never taken for a title change of the other page.
+    matches: Dict[str, Tuple[str, str]] = {}
+    wanted_titles = [title_signature(p) for p in missing]
+    for path, title in zip(missing, wanted_titles):
+        source = unique(by_title.get(title, []))
+        if source and wanted_titles.count(title) == 1:
+            matches[path] = (source, "same folder titles")
+            orphans.discard(source)
+
+    plan: List[Dict[str, Any]] = []
+    for path in missing:
+        page = desired[path]
+        if path in matches:
+            source, reason = matches[path]
+        else:
+            previous = manifest.get(page["page_id"], {})
+            candidates = [
+                (by_hash.get(previous.get("sha256", "")), "same content"),
+                (previous.get("path"), "previous path"),
+                (unique([p for p in by_code.get(code_signature(path), []) if p in orphans]), "same folder codes"),
+            ]
+            source, reason = next(((p, r) for p, r in candidates if p in orphans), (None, ""))
+            if source:
+                orphans.discard(source)
+        if source:
+            plan.append({"action": RENAME, "path": path, "source": source, "reason": reason, **page})
+        else:
+            plan.append({"action": CREATE, "path": path, **page})
+
+    plan.extend({"action": ORPHAN, "path": p} for p in sorted(orphans))
+    return plan
+
+
+# -------------------------------------------------
+# APPLY
+# -------------------------------------------------
+def placeholder_text(title: str) -> str:
+    # Same text as create_placeholders.py
+    return (
+        f"# {title}\n\n"
+        "Introductory content for this topic will be added here.\n\n"
+        f"{INJECTION_MARKER}\n"
+    )
+
+
+def apply_plan(plan: List[Dict[str, Any]], desired_dirs: Set[str], move_orphans: bool = False) -> None:
+    """
+    Execute a plan in batch: create every needed folder once, move renamed
+    files through temporary names (so swaps and chains are safe), write
+    placeholders, optionally park orphans, then drop folders left empty.
+    """
+    renames = [a for a in plan if a["action"] == RENAME]
+    creates = [a for a in plan if a["action"] == CREATE]
+    orphans = [a for a in plan if a["action"] == ORPHAN] if move_orphans else []
+
+    for folder in sorted({str(Path(a["path"]).parent) for a in renames + creates}):
+        Path(folder).mkdir(parents=True, exist_ok=True)
+
+    staged = []
+    for n, action in enumerate(renames):
+        tmp = Path(action["source"]).with_name(f".reconcile-{n}.tmp")
+        os.replace(action["source"], tmp)
+        staged.append((tmp, action))
+    vacated: Set[Path] = set()
+    for tmp, action in staged:
+        os.replace(tmp, action["path"])
+        old_dir, new_dir = Path(action["source"]).parent, Path(action["path"]).parent
+        if old_dir != new_dir and old_dir.as_posix() not in desired_dirs:
+            vacated.add(old_dir)
+            # images and notes next to the page move with it
+            for sibling in old_dir.iterdir():
+                if sibling.is_file() and sibling.suffix != ".md" and not (new_dir / sibling.name).exists():
+                    os.replace(sibling, new_dir / sibling.name)
+
+    for action in creates:
+        Path(action["path"]).write_text(placeholder_text(action["title"]), encoding="utf-8")
+
+    for action in orphans:
+        target = ORPHAN_DIR / Path(action["path"]).relative_to(CONTENTS_DIR)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(action["path"], target)
+        vacated.add(Path(action["path"]).parent)
+
+    # Remove folders that are empty now, deepest first
+    for folder in sorted(vacated, key=lambda p: len(p.parts), reverse=True):
+        while folder != CONTENTS_DIR and folder.as_posix() not in desired_dirs:
+            try:
+                folder.rmdir()
+            except OSError:
+                break
+            folder = folder.parent
+
+
+def manifest_for(desired: Dict[str, Dict[str, str]], previous: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Page -> path, size, mtime and hash; files unchanged since the last
+    manifest are not hashed again.
+    """
+    files, _ = snapshot()
+    pages: Dict[str, Dict[str, Any]] = {}
+    for path, page in desired.items():
+        if path not in files:
+            continue
+        size, mtime_ns = files[path]
+        old = previous.get(page["page_id"], {})
+        if old.get("path") == path and old.get("size") == size and old.get("mtime_ns") == mtime_ns:
+            pages[page["page_id"]] = old
+        else:
+            pages[page["page_id"]] = {"path": path, "size": size, "mtime_ns": mtime_ns, "sha256": file_hash(path)}
+    return pages
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Reconcile contents/ with pages.xlsx: plan (default) or apply create/rename/orphan actions."
+    )
+    parser.add_argument("--apply", action="store_true", help="Carry out the plan (default: only print it).")
+    parser.add_argument(
+        "--move-orphans", action="store_true", help=f"With --apply, move orphaned files into {ORPHAN_DIR}/."
+    )
+    parser.add_argument("--plan-json", type=Path, default=None, help="Also write the plan to this file.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    df = pd.read_excel(DATA_FILE, dtype=str).fillna("")
+    desired = desired_tree(df)
+    files, _ = snapshot()
+    manifest = load_manifest()
+    plan = build_plan(desired, files, manifest)
+
+    for action in plan:
+        if action["action"] == RENAME:
+            logger.info("RENAME %s -> %s (%s)", action["source"], action["path"], action["reason"])
+        elif action["action"] == CREATE:
+            logger.info("CREATE %s", action["path"])
+        else:
+            logger.warning("ORPHAN %s", action["path"])
+    counts = {kind: sum(a["action"] == kind for a in plan) for kind in (CREATE, RENAME, ORPHAN)}
+    logger.info(
+        "%d pages, %d files scanned: %d to create, %d to rename, %d orphaned.",
+        len(desired), len(files), counts[CREATE], counts[RENAME], counts[ORPHAN],
+    )
+    if args.plan_json:
+        args.plan_json.write_text(json.dumps(plan, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if not args.apply:
+        if any(counts.values()):
+            logger.info("Dry run; re-run with --apply to carry out the plan.")
+        return
+
+    desired_dirs = {Path(p).parent.as_posix() for p in desired}
+    desired_dirs |= {parent.as_posix() for p in desired for parent in Path(p).parents}
+    apply_plan(plan, desired_dirs, move_orphans=args.move_orphans)
+    save_manifest(manifest_for(desired, manifest))
+    logger.info("Plan applied; manifest written to %s", MANIFEST_FILE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from resource_model import Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+DEFAULT_TOP_K = 5
+BATCH_SIZE = 512              # rows of the similarity matrix held densely at once
+MIN_SCORE = 0.1               # cosine similarity below this is not "related"
+
+# Field weights: a shared keyword says more than a shared description word.
+FIELD_WEIGHTS = {"kw": 3.0, "fit": 1.0, "topic": 2.0, "desc": 1.0}
+
+STOPWORDS = frozenset(
+    """a an and are as at be by can for from how in into is it its of on or that the this to
+    using use used with which what you your we our their these those will about between""".split()
+)
+IGNORED_DESCRIPTIONS = {"", "no description provided."}
+
+logger = logging.getLogger("related")
+
+
+# -------------------------------------------------
+# FEATURES
+# -------------------------------------------------
+def _words(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return [w for w in re.findall(r"[a-z0-9]+", text.lower()) if len(w) > 1 and w not in STOPWORDS]
+
+
+def resource_terms(resource: Resource) -> List[str]:
+    """
+    Field-prefixed terms of one resource (keywords and fit_for as whole
+    phrases, topic and description as words).
+    """
+    terms = [f"kw:{' '.join(_words(k))}" for k in resource.keywords]
+    terms += [f"fit:{f.lower()}" for f in resource.fit_for]
+    terms += [f"topic:{w}" for w in _words(resource.topic)]
+    if resource.description_short.strip().lower() not in IGNORED_DESCRIPTIONS:
+        terms += [f"desc:{w}" for w in _words(resource.description_short)]
+    return terms
+
+
+def tfidf_matrix(docs: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+    """
+    L2-normalized TF-IDF matrix (documents x terms), log-scaled term
+    frequencies times the field weight of each term.
+    """
+    vocab: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    for terms in docs:
+        indices.extend(vocab.setdefault(t, len(vocab)) for t in terms)
+        indptr.append(len(indices))
+
+    n_docs, n_terms = len(docs), len(vocab)
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(n_docs, n_terms),
+    )
+    counts.sum_duplicates()
+
+    weights = np.empty(n_terms, dtype=np.float32)
+    for term, col in vocab.items():
+        weights[col] = FIELD_WEIGHTS[term.split(":", 1)[0]]
+    doc_freq = np.bincount(counts.indices, minlength=n_terms)
+    idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)).astype(np.float32) + 1.0
+
+    counts.data = np.log1p(counts.data)
+    tfidf = (counts @ sparse.diags(idf * weights)).tocsr()
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(tfidf).tocsr().astype(np.float32)
+
+
+# -------------------------------------------------
+# TOP-K
+# -------------------------------------------------
+def top_k_similar(
+    matrix: sparse.csr_matrix,
+    k: int = DEFAULT_TOP_K,
+    batch_size: int = BATCH_SIZE,
+    min_score: float = MIN_SCORE,
+) -> List[List[Tuple[int, float]]]:
+    """
+    For every row, the k most cosine-similar other rows (index, score),
+    best first.
+
+    Similarities are computed batch_size rows at a time as one sparse
+    matrix product; each batch is densified and reduced with argpartition,
+    so memory is batch_size x n and there is no loop over pairs.
+    """
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    result: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    if k <= 0:
+        return result
+
+    transposed = matrix.T.tocsr()
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        sims = (matrix[start:stop] @ transposed).toarray()
+        rows = np.arange(stop - start)
+        sims[rows, rows + start] = -1.0          # never recommend a resource to itself
+
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        keep = top_scores >= min_score
+        for r in range(stop - start):
+            mask = keep[r]
+            scores = top_scores[r][mask].astype(np.float64).round(4)
+            result[start + r] = list(zip(top[r][mask].tolist(), scores.tolist()))
+    return result
+
+
+def related_resources(
+    docs: Sequence[Sequence[str]],
+    k: int = DEFAULT_TOP_K,
+    batch_size: int = BATCH_SIZE,
+    min_score: float = MIN_SCORE,
+) -> List[List[Tuple[int, float]]]:
+    """
+    Top-k related documents for each document, from its term list.
+    """
+    if len(docs) < 2:
+        return [[] for _ in docs]
+    return top_k_similar(tfidf_matrix(docs), k, batch_size, min_score)
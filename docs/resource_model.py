@@ -0,0 +1,249 @@
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PLACEHOLDER = "TO_BE_FILLED_BY_COURSE_MANAGER"
+
+
+# -------------------------------------------------
+# COERCION HELPERS
+# -------------------------------------------------
+def as_bool(x: Any) -> bool:
+    """
+    Robust boolean cast for YAML/string values.
+    Accepts True, "true", "yes", "y", "1", "on".
+    """
+    if isinstance(x, bool):
+        return x
+    if x is None:
+        return False
+    return str(x).strip().lower() in {"true", "yes", "y", "1", "on"}
+
+
+def as_int(x: Any, default: int = 0) -> int:
+    try:
+        return int(x)
+    except (ValueError, TypeError):
+        return default
+
+
+def as_list(x: Any) -> List[str]:
+    """
+    Normalize a YAML field to a list of strings.
+
+    - list -> list of str
+    - str  -> [str] if not empty
+    - None/"" -> []
+    """
+    if isinstance(x, list):
+        return [str(v).strip() for v in x if str(v).strip()]
+    if x is None:
+        return []
+    s = str(x).strip()
+    if not s:
+        return []
+    return [s]
+
+
+def slugify(text: str) -> str:
+    text = (text or "").strip().lower()
+    text = unicodedata.normalize("NFKD", text)
+    text = text.encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z0-9]+", "-", text)
+    return text.strip("-") or "resource"
+
+
+def _text(data: Dict[str, Any], key: str, default: str) -> str:
+    """
+    Display text for a field: the default only if the key is absent,
+    otherwise the value as the templates have always printed it.
+    """
+    return str(data[key]) if key in data else default
+
+
+def _interned(values: List[str]) -> Tuple[str, ...]:
+    # Keywords, fit_for options etc. repeat across thousands of resources.
+    return tuple(sys.intern(v) for v in values)
+
+
+# -------------------------------------------------
+# MODEL
+# -------------------------------------------------
+class Author:
+    __slots__ = ("name", "affiliation")
+
+    def __init__(self, name: str, affiliation: str):
+        self.name = name
+        self.affiliation = sys.intern(affiliation)
+
+    def __repr__(self) -> str:
+        return f"Author({self.name!r}, {self.affiliation!r})"
+
+
+class Figure:
+    """
+    One figure of a resource. `url` is filled in by the build
+    (asset_store.resolve_figure_urls); `resolved` tells whether it was.
+    """
+
+    __slots__ = ("id", "original_filename", "ext", "type", "caption", "is_cover", "url", "resolved")
+
+    def __init__(self, fig_id: Any, original_filename: str, fig_type: str, caption: str, is_cover: bool):
+        self.id = fig_id
+        self.original_filename = original_filename
+        self.ext = Path(original_filename).suffix.lower()  # keep original extension
+        self.type = sys.intern(fig_type)
+        self.caption = caption
+        self.is_cover = is_cover
+        self.url: Optional[str] = None
+        self.resolved = False
+
+    @classmethod
+    def from_dict(cls, fig: Dict[str, Any]) -> "Figure":
+        return cls(
+            fig.get("id"),
+            str(fig.get("original_filename") or ""),
+            str(fig.get("type") or "").strip(),
+            str(fig.get("caption") or "").strip(),
+            as_bool(fig.get("is_cover")),
+        )
+
+    def __repr__(self) -> str:
+        return f"Figure({self.id!r}, {self.original_filename!r})"
+
+
+def pick_cover_figure(figures: List[Figure]) -> Optional[Figure]:
+    """
+    Decide which figure to use as the cover image for a resource.
+
+    Priority:
+    1. First figure with 'is_cover: true' (set in CataLogger).
+    2. Otherwise, the first figure in the list.
+    """
+    if not figures:
+        return None
+
+    # 1) explicit cover flag from CataLogger
+    for fig in figures:
+        if fig.is_cover:
+            return fig
+
+    # 2) fallback: first figure
+    return figures[0]
+
+
+class Resource:
+    """
+    A catalogue resource, normalized once at load time.
+
+    Every field is already in the form the renderers need (lists as
+    tuples, flags as bool, counts as int), so nothing on the render path
+    coerces again. Only the fields the site uses are kept; the raw YAML
+    dict is dropped after loading.
+    """
+
+    __slots__ = (
+        # identity / mapping
+        "title", "topic", "topic_page_id", "item_id", "resource_id",
+        "file_stem", "file_path", "page_slug",
+        # display fields
+        "resource_type", "url", "time_required", "date_released",
+        "description_short", "prerequisites",
+        "keywords", "fit_for", "references", "authors", "figures", "cover",
+        # (title, page_id, detail page slug) of similar resources, set by the build
+        "related",
+        # Streamlit app details
+        "multipage_app", "num_pages", "interactive_plots", "num_interactive_plots",
+        "assessments_included", "num_assessment_questions", "videos_included", "num_videos",
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], yaml_file: Path) -> "Resource":
+        """
+        Normalize one parsed YAML submission.
+
+        Supports:
+        - New CataLogger format (item_id, authors[], fit_for, Streamlit metadata, etc.)
+        - Older format with author / author_institute fields.
+        """
+        r = cls.__new__(cls)
+
+        # --- Common core fields (with fallbacks) ---
+        r.title = _text(data, "title", "Untitled Resource")
+        r.topic = sys.intern(str(data.get("topic") or "").strip())
+        r.topic_page_id = str(data.get("topic_page_id") or "").strip()  # optional, future use
+
+        # remember where this YAML came from
+        r.file_stem = yaml_file.stem
+        r.file_path = yaml_file.as_posix()
+        r.page_slug = ""
+
+        r.resource_type = sys.intern(_text(data, "resource_type", "N/A"))
+        r.url = _text(data, "url", "#")
+        r.time_required = sys.intern(_text(data, "time_required", "N/A"))
+        r.date_released = _text(data, "date_released", "N/A")
+        r.description_short = _text(data, "description_short", "No description provided.")
+        r.prerequisites = _text(data, "prerequisites", "None specified.")
+
+        # --- Normalize lists/booleans from CataLogger ---
+        r.keywords = _interned(as_list(data.get("keywords")))
+        r.fit_for = _interned(as_list(data.get("fit_for")))
+
+        # references: ensure list of strings
+        refs = data.get("references", [])
+        if isinstance(refs, list):
+            r.references = tuple(str(x).strip() for x in refs if str(x).strip())
+        elif refs:
+            r.references = (str(refs).strip(),)
+        else:
+            r.references = ()
+
+        # --- Authors normalization ---
+        # New format: authors: [ {name, affiliation}, ... ]
+        authors = data.get("authors")
+        if isinstance(authors, list) and authors:
+            normalized = []
+            for a in authors:
+                if not isinstance(a, dict):
+                    continue
+                name = (a.get("name") or "").strip()
+                aff = (a.get("affiliation") or "").strip()
+                if not name:
+                    continue
+                normalized.append(Author(name, aff or PLACEHOLDER))
+            r.authors = tuple(normalized)
+        else:
+            # Fallback: older single-author fields
+            author_name = (data.get("author") or "").strip()
+            author_inst = (data.get("author_institute") or "").strip()
+            r.authors = (Author(author_name, author_inst or "N/A"),) if author_name else ()
+
+        # --- Figures + cover (list of {id, original_filename, ..., is_cover}) ---
+        r.figures = tuple(Figure.from_dict(f) for f in (data.get("figures") or []) if isinstance(f, dict))
+        r.cover = pick_cover_figure(r.figures)
+        r.related = ()
+
+        # --- Streamlit app details ---
+        r.multipage_app = as_bool(data.get("multipage_app", False))
+        r.num_pages = as_int(data.get("num_pages", 0))
+        r.interactive_plots = as_bool(data.get("interactive_plots", False))
+        r.num_interactive_plots = as_int(data.get("num_interactive_plots", 0))
+        r.assessments_included = as_bool(data.get("assessments_included", False))
+        r.num_assessment_questions = as_int(data.get("num_assessment_questions", 0))
+        r.videos_included = as_bool(data.get("videos_included", False))
+        r.num_videos = as_int(data.get("num_videos", 0))
+
+        # --- item_id / resource_id alignment ---
+        r.item_id = str(data.get("item_id") or "").strip()
+        slug_title = str(data.get("title") or yaml_file.stem).strip()
+        if r.item_id and not r.item_id.startswith(PLACEHOLDER):
+            r.resource_id = r.item_id
+        else:
+            r.resource_id = slugify(slug_title)
+
+        return r
+
+    def __repr__(self) -> str:
+        return f"Resource({self.resource_id!r}, file={self.file_path!r})"
@@ -0,0 +1,328 @@
+import argparse
+import logging
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+
+import yaml
+
+from resource_model import PLACEHOLDER
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+RESOURCES_DIR = Path("assets/resources")
+
+# libyaml's loader is several times faster than the pure-Python one.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+RESOURCE_TYPES = ("Streamlit app", "Jupyter Notebook", "Video", "Dataset", "Other")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+URL_RE = re.compile(r"^https?://\S+$")
+TRUE_STRINGS = {"true", "yes", "y", "1", "on"}
+FALSE_STRINGS = {"false", "no", "n", "0", "off", ""}
+
+logger = logging.getLogger("resource_schema")
+
+
+class Field:
+    """
+    Declarative description of one YAML field.
+
+    kind: str | date | url | bool | int | list | records
+    item: nested schema for `records` (a list of mappings)
+    """
+
+    __slots__ = ("kind", "required", "choices", "item")
+
+    def __init__(
+        self,
+        kind: str,
+        required: bool = False,
+        choices: Optional[Tuple[str, ...]] = None,
+        item: Optional[Dict[str, "Field"]] = None,
+    ):
+        self.kind = kind
+        self.required = required
+        self.choices = choices
+        self.item = item
+
+
+class FieldError:
+    __slots__ = ("path", "message")
+
+    def __init__(self, path: str, message: str):
+        self.path = path
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"FieldError({self.path!r}, {self.message!r})"
+
+
+# -------------------------------------------------
+# SCHEMA
+# -------------------------------------------------
+AUTHOR_SCHEMA: Dict[str, Field] = {
+    "name": Field("str", required=True),
+    "affiliation": Field("str"),
+}
+
+FIGURE_SCHEMA: Dict[str, Field] = {
+    "id": Field("int", required=True),
+    "original_filename": Field("str", required=True),
+    "type": Field("str"),
+    "caption": Field("str"),
+    "is_cover": Field("bool"),
+}
+
+RESOURCE_SCHEMA: Dict[str, Field] = {
+    # catalog location header (CataLogger)
+    "catalog_category": Field("str"),
+    "catalog_subcategory": Field("str"),
+    "catalog_subsubcategory": Field("str"),
+    # identification / mapping
+    "item_id": Field("str"),
+    "topic": Field("str"),
+    "topic_page_id": Field("str"),
+    "title": Field("str", required=True),
+    # type and access
+    "resource_type": Field("str", required=True, choices=RESOURCE_TYPES),
+    "url": Field("url", required=True),
+    "date_released": Field("date"),
+    # content and metadata
+    "description_short": Field("str"),
+    "keywords": Field("list"),
+    "multipage_app": Field("bool"),
+    "num_pages": Field("int"),
+    "interactive_plots": Field("bool"),
+    "num_interactive_plots": Field("int"),
+    "assessments_included": Field("bool"),
+    "num_assessment_questions": Field("int"),
+    "videos_included": Field("bool"),
+    "num_videos": Field("int"),
+    # educational fit
+    "time_required": Field("str"),
+    "prerequisites": Field("str"),
+    "fit_for": Field("list"),
+    # authors and references
+    "authors": Field("records", item=AUTHOR_SCHEMA),
+    "author": Field("str"),               # older single-author format
+    "author_institute": Field("str"),
+    "references": Field("list"),
+    "image_url": Field("str"),
+    "figures": Field("records", item=FIGURE_SCHEMA),
+}
+
+# At least one of these must be set, or the resource cannot be placed on a page.
+RESOURCE_ANY_OF = (("topic_page_id", "topic"),)
+
+
+# -------------------------------------------------
+# COMPILATION
+# -------------------------------------------------
+Checker = Callable[[Any, str, List[FieldError]], Any]
+Validator = Callable[[Any, str, List[FieldError]], Optional[Dict[str, Any]]]
+
+
+def _type_name(value: Any) -> str:
+    return {dict: "mapping", list: "list"}.get(type(value), type(value).__name__)
+
+
+def _check_str(choices: Optional[Tuple[str, ...]]) -> Checker:
+    allowed = set(choices or ())
+
+    def check(value, path, errors):
+        if isinstance(value, (dict, list)):
+            errors.append(FieldError(path, f"expected text, got a {_type_name(value)}"))
+            return None
+        if allowed and value not in allowed and value != PLACEHOLDER:
+            errors.append(FieldError(path, f"{value!r} is not one of {', '.join(choices)}"))
+        return str(value)
+
+    return check
+
+
+def _check_date(value, path, errors):
+    if isinstance(value, date) or value == PLACEHOLDER:
+        return value
+    if not (isinstance(value, str) and DATE_RE.match(value.strip())):
+        errors.append(FieldError(path, f"expected a YYYY-MM-DD date, got {value!r}"))
+    return value
+
+
+def _check_url(value, path, errors):
+    if not (isinstance(value, str) and URL_RE.match(value.strip())):
+        errors.append(FieldError(path, f"expected an http(s) URL, got {value!r}"))
+    return value
+
+
+def _check_bool(value, path, errors):
+    if isinstance(value, bool):
+        return value
+    s = str(value).strip().lower()
+    if s in TRUE_STRINGS:
+        return True
+    if s not in FALSE_STRINGS:
+        errors.append(FieldError(path, f"expected true/false, got {value!r}"))
+    return False
+
+
+def _check_int(value, path, errors):
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    errors.append(FieldError(path, f"expected a non-negative whole number, got {value!r}"))
+    return 0
+
+
+def _check_list(value, path, errors):
+    if isinstance(value, dict):
+        errors.append(FieldError(path, "expected a list, got a mapping"))
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    out = []
+    for i, v in enumerate(value):
+        if isinstance(v, (dict, list)):
+            errors.append(FieldError(f"{path}[{i}]", f"expected text, got a {_type_name(v)}"))
+        elif str(v).strip():
+            out.append(str(v).strip())
+    return out
+
+
+def _check_records(item: Dict[str, Field]) -> Checker:
+    validate_item = compile_schema(item)
+
+    def check(value, path, errors):
+        if not isinstance(value, list):
+            errors.append(FieldError(path, f"expected a list, got a {_type_name(value)}"))
+            return []
+        out = []
+        for i, v in enumerate(value):
+            record = validate_item(v, f"{path}[{i}]", errors)
+            if record is not None:
+                out.append(record)
+        return out
+
+    return check
+
+
+def _checker(spec: Field) -> Checker:
+    if spec.kind == "str":
+        return _check_str(spec.choices)
+    if spec.kind == "records":
+        return _check_records(spec.item or {})
+    return {
+        "date": _check_date,
+        "url": _check_url,
+        "bool": _check_bool,
+        "int": _check_int,
+        "list": _check_list,
+    }[spec.kind]
+
+
+def compile_schema(
+    schema: Dict[str, Field], any_of: Tuple[Tuple[str, ...], ...] = ()
+) -> Validator:
+    """
+    Turn a declarative schema into one validating/coercing function.
+
+    Field lookups are resolved once here; the returned function then walks
+    each mapping once, checking and coercing every field in the same pass.
+    It returns the coerced mapping (None if the value is not a mapping at
+    all) and appends a FieldError per problem found.
+    """
+    compiled = [(key, spec.required, _checker(spec)) for key, spec in schema.items()]
+    known = frozenset(schema)
+
+    def validate(data: Any, prefix: str, errors: List[FieldError]) -> Optional[Dict[str, Any]]:
+        if not isinstance(data, dict):
+            errors.append(FieldError(prefix or "<document>", f"expected a mapping, got {_type_name(data)}"))
+            return None
+        dot = f"{prefix}." if prefix else ""
+        out: Dict[str, Any] = {}
+        for key, required, check in compiled:
+            if key not in data:
+                if required:
+                    errors.append(FieldError(dot + key, "required field is missing"))
+                continue
+            value = data[key]
+            if value is None or value == "":
+                if required:
+                    errors.append(FieldError(dot + key, "required field is empty"))
+                out[key] = value
+                continue
+            out[key] = check(value, dot + key, errors)
+        for keys in any_of:
+            if not any(out.get(k) for k in keys):
+                errors.append(FieldError(prefix or "<document>", f"one of {', '.join(keys)} is required"))
+        for key in data.keys() - known:
+            errors.append(FieldError(dot + str(key), "unknown field"))
+            out[key] = data[key]
+        return out
+
+    return validate
+
+
+_validate_resource = compile_schema(RESOURCE_SCHEMA, RESOURCE_ANY_OF)
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+def validate_resource(data: Any) -> Tuple[Optional[Dict[str, Any]], List[FieldError]]:
+    """
+    Validate and coerce one parsed resource mapping.
+    """
+    errors: List[FieldError] = []
+    return _validate_resource(data, "", errors), errors
+
+
+def decode_resource(source: Union[str, bytes, IO]) -> Tuple[Optional[Dict[str, Any]], List[FieldError]]:
+    """
+    Parse YAML text (or an open file) with the C loader and validate it.
+    Returns (None, errors) if the YAML cannot be parsed or is not a mapping.
+    """
+    try:
+        data = yaml.load(source, Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None)
+        where = f"line {mark.line + 1}" if mark else "<document>"
+        return None, [FieldError(where, str(getattr(e, "problem", None) or e))]
+    return validate_resource({} if data is None else data)
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Validate resource YAML files against the catalogue schema.")
+    parser.add_argument("paths", nargs="*", type=Path, help=f"YAML files or folders (default: {RESOURCES_DIR}).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    files: List[Path] = []
+    for path in args.paths or [RESOURCES_DIR]:
+        files.extend(sorted(path.rglob("*.yaml")) if path.is_dir() else [path])
+
+    invalid = 0
+    for yaml_file in files:
+        with open(yaml_file, "r", encoding="utf-8") as f:
+            _, errors = decode_resource(f)
+        for err in errors:
+            logger.error("%s: %s", yaml_file.as_posix(), err)
+        invalid += bool(errors)
+
+    logger.info("%d file(s) checked, %d with schema errors.", len(files), invalid)
+    if invalid:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
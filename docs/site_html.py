@@ -0,0 +1,157 @@
+import html
+import re
+import string
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import markdown
+import yaml
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+MARKDOWN_EXTENSIONS = ["tables", "fenced_code", "attr_list", "md_in_html", "toc", "sane_lists"]
+
+# {{ '/docs/x.html' | relative_url }} as written by generate_docs.site_url
+LIQUID_URL_RE = re.compile(r"\{\{\s*'([^']*)'\s*\|\s*(?:relative_url|absolute_url)\s*\}\}")
+FRONT_MATTER_RE = re.compile(r"\A---\n(.*?)\n---\n", re.DOTALL)
+
+PAGE_TEMPLATE = string.Template(
+    """<!DOCTYPE html>
+<html lang="$lang">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title · $site_title</title>
+<style>
+body { margin: 0; font: 16px/1.5 system-ui, -apple-system, "Segoe UI", sans-serif; color: #27262b; display: flex; }
+nav.side { width: 260px; min-height: 100vh; padding: 1rem; background: #f5f6fa; border-right: 1px solid #eeebee; box-sizing: border-box; font-size: 14px; flex-shrink: 0; }
+nav.side .site { display: block; font-weight: 600; font-size: 16px; margin-bottom: 1rem; color: #27262b; text-decoration: none; }
+nav.side ul { list-style: none; padding-left: 0.9rem; margin: 0; }
+nav.side > ul { padding-left: 0; }
+nav.side a { color: #5c5962; text-decoration: none; display: block; padding: 2px 0; }
+nav.side a.active { color: #7253ed; font-weight: 600; }
+main { padding: 1.5rem 2.5rem; max-width: 900px; min-width: 0; }
+a { color: #7253ed; }
+table { border-collapse: collapse; margin: 1rem 0; display: block; overflow-x: auto; }
+th, td { border: 1px solid #eeebee; padding: 0.4rem 0.7rem; text-align: left; vertical-align: top; }
+img { max-width: 100%; height: auto; }
+hr { border: 0; border-top: 1px solid #eeebee; margin: 2rem 0; }
+.breadcrumb { font-size: 13px; color: #5c5962; margin-bottom: 1rem; }
+</style>
+$head_extra
+</head>
+<body>
+<nav class="side"><a class="site" href="$home_url">$site_title</a>$nav</nav>
+<main>
+$breadcrumb
+$content
+</main>
+</body>
+</html>
+"""
+)
+
+_local = threading.local()
+
+
+# -------------------------------------------------
+# MARKDOWN → HTML
+# -------------------------------------------------
+def split_front_matter(text: str) -> Tuple[Dict[str, Any], str]:
+    m = FRONT_MATTER_RE.match(text)
+    if not m:
+        return {}, text
+    return yaml.safe_load(m.group(1)) or {}, text[m.end():]
+
+
+def resolve_liquid_urls(text: str, baseurl: str = "") -> str:
+    """
+    Replace the relative_url tags the generator writes with plain URLs,
+    the only Liquid the generated pages contain.
+    """
+    base = baseurl.rstrip("/")
+    return LIQUID_URL_RE.sub(lambda m: base + m.group(1), text)
+
+
+def _converter(slugify: Optional[Callable[[str], str]]) -> markdown.Markdown:
+    # Markdown instances are not thread-safe but are expensive to set up,
+    # so every thread keeps one per slugify function and resets it per page.
+    cache = getattr(_local, "converters", None)
+    if cache is None:
+        cache = _local.converters = {}
+    md = cache.get(slugify)
+    if md is None:
+        config = {"toc": {"slugify": (lambda value, sep: slugify(value))}} if slugify else {}
+        md = cache[slugify] = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, extension_configs=config)
+    return md.reset()
+
+
+def markdown_to_html(body: str, baseurl: str = "", slugify: Optional[Callable[[str], str]] = None) -> str:
+    """
+    Convert one generated page body (front matter already removed).
+    slugify gives headings the same ids the Jekyll build would.
+    """
+    return _converter(slugify).convert(resolve_liquid_urls(body, baseurl))
+
+
+# -------------------------------------------------
+# NAVIGATION + PAGE SHELL
+# -------------------------------------------------
+def nav_html(nav_tree: Dict[str, Any], current_id: str = "", baseurl: str = "") -> str:
+    """
+    Sidebar from generate_docs.build_nav_tree(); only the branch leading to
+    the current page is expanded, like the Just-the-Docs sidebar.
+    """
+    pages = nav_tree["pages"]
+    open_ids = set(pages.get(current_id, {}).get("ancestors", [])) | {current_id}
+    base = baseurl.rstrip("/")
+
+    def _items(nodes: List[Dict[str, Any]]) -> str:
+        parts = ["<ul>"]
+        for node in nodes:
+            cls = ' class="active"' if node["id"] == current_id else ""
+            parts.append(f'<li><a{cls} href="{html.escape(base + node["url"])}">{html.escape(node["title"])}</a>')
+            if node["children"] and node["id"] in open_ids:
+                parts.append(_items(node["children"]))
+            parts.append("</li>")
+        parts.append("</ul>")
+        return "".join(parts)
+
+    return _items(nav_tree["roots"])
+
+
+def breadcrumb_html(nav_tree: Dict[str, Any], current_id: str, baseurl: str = "") -> str:
+    pages = nav_tree["pages"]
+    if current_id not in pages:
+        return ""
+    base = baseurl.rstrip("/")
+    links = [
+        f'<a href="{html.escape(base + pages[pid]["url"])}">{html.escape(pages[pid]["title"])}</a>'
+        for pid in pages[current_id]["ancestors"]
+    ]
+    if not links:
+        return ""
+    return f'<div class="breadcrumb">{" / ".join(links)} / {html.escape(pages[current_id]["title"])}</div>'
+
+
+def render_document(
+    title: str,
+    content_html: str,
+    nav: str,
+    site_title: str = "iNUX Interactive Documents",
+    baseurl: str = "",
+    breadcrumb: str = "",
+    head_extra: str = "",
+    lang: str = "en",
+) -> str:
+    return PAGE_TEMPLATE.substitute(
+        title=html.escape(title),
+        site_title=html.escape(site_title),
+        home_url=html.escape(baseurl.rstrip("/") + "/"),
+        nav=nav,
+        breadcrumb=breadcrumb,
+        content=content_html,
+        head_extra=head_extra,
+        lang=html.escape(lang),
+    )
@@ -0,0 +1,254 @@
+import argparse
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asset_store
+from catalogger_core import build_zip_bytes, yaml_to_pdf_bytes
+from worker_pool import WorkerPool
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+SPOOL_DIR = Path(os.environ.get("CATALOGGER_SPOOL_DIR", "spool"))   # one folder per submission
+META_FILE = "meta.json"          # status + artifact paths of one submission
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)   # PDF rendering is CPU-bound
+
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+logger = logging.getLogger("submission_spool")
+
+
+class SpooledFigure:
+    """
+    A figure file in the spool with the interface of a Streamlit upload
+    (.name, .getvalue()), so the CataLogger PDF/ZIP builders accept it.
+    """
+
+    __slots__ = ("name", "path")
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = Path(path)
+
+    def getvalue(self) -> bytes:
+        return self.path.read_bytes()
+
+
+# -------------------------------------------------
+# SPOOL LAYOUT
+# -------------------------------------------------
+def read_meta(submission_dir: Path) -> Dict[str, Any]:
+    return json.loads((Path(submission_dir) / META_FILE).read_text(encoding="utf-8"))
+
+
+def write_meta(submission_dir: Path, meta: Dict[str, Any]) -> None:
+    # Write-then-rename, so a reader never sees a half-written status.
+    tmp = Path(submission_dir) / f".{META_FILE}.tmp"
+    tmp.write_text(json.dumps(meta, indent=1), encoding="utf-8")
+    os.replace(tmp, Path(submission_dir) / META_FILE)
+
+
+def spool_submission(
+    yaml_text: str,
+    filename: str,
+    base_name: str,
+    language_label: str,
+    figures: Sequence[Tuple[str, bytes]],
+    spool_dir: Path = SPOOL_DIR,
+) -> str:
+    """
+    Write one submission (YAML + raw figures) into the spool and return its id.
+
+    Only plain file writes happen here; the PDF, ZIP and figure store copies
+    are left to the worker. The folder is renamed into place once complete,
+    so workers never pick up a partial submission.
+    """
+    spool_dir = Path(spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    submission_id = f"{base_name}_{secrets.token_hex(4)}"
+    staging = spool_dir / f".incoming-{submission_id}"
+    staging.mkdir()
+
+    (staging / filename).write_text(yaml_text, encoding="utf-8")
+    fig_names = []
+    for i, (name, data) in enumerate(figures, start=1):
+        ext = Path(name).suffix.lower()
+        spooled = f"{base_name}_fig{i}{ext}"
+        (staging / spooled).write_bytes(data)
+        fig_names.append({"id": i, "original_filename": name, "file": spooled})
+
+    write_meta(
+        staging,
+        {
+            "id": submission_id,
+            "status": STATUS_QUEUED,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "filename": filename,
+            "base_name": base_name,
+            "language_label": language_label,
+            "figures": fig_names,
+            "artifacts": {},
+            "error": "",
+        },
+    )
+    os.replace(staging, spool_dir / submission_id)
+    return submission_id
+
+
+def submission_status(submission_id: str, spool_dir: Path = SPOOL_DIR) -> Dict[str, Any]:
+    return read_meta(Path(spool_dir) / submission_id)
+
+
+def pending_submissions(spool_dir: Path = SPOOL_DIR) -> List[str]:
+    """
+    Submissions that are queued, or were being processed when a worker died.
+    """
+    pending = []
+    if not Path(spool_dir).exists():
+        return pending
+    for entry in sorted(Path(spool_dir).iterdir()):
+        if entry.name.startswith(".") or not (entry / META_FILE).exists():
+            continue
+        if read_meta(entry)["status"] in (STATUS_QUEUED, STATUS_PROCESSING):
+            pending.append(entry.name)
+    return pending
+
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+def process_submission(submission_id: str, spool_dir: Path = SPOOL_DIR) -> Dict[str, Any]:
+    """
+    Render the PDF, build the ZIP and copy the figures into the
+    content-addressed store for one spooled submission, then mark it ready.
+    Runs in a worker process.
+    """
+    folder = Path(spool_dir) / submission_id
+    meta = read_meta(folder)
+    meta["status"] = STATUS_PROCESSING
+    write_meta(folder, meta)
+
+    t0 = time.perf_counter()
+    try:
+        yaml_text = (folder / meta["filename"]).read_text(encoding="utf-8")
+        figures = [SpooledFigure(f["original_filename"], folder / f["file"]) for f in meta["figures"]]
+
+        pdf_name = meta["filename"].replace(".yaml", ".pdf")
+        (folder / pdf_name).write_bytes(yaml_to_pdf_bytes(yaml_text, meta["language_label"], figures))
+        artifacts: Dict[str, Any] = {"pdf": pdf_name}
+
+        if figures:
+            zip_name = f"{meta['base_name']}.zip"
+            (folder / zip_name).write_bytes(
+                build_zip_bytes(meta["filename"], yaml_text, meta["base_name"], figures)
+            )
+            artifacts["zip"] = zip_name
+
+        stored = []
+        for f, fig in zip(meta["figures"], figures):
+            digest, path = asset_store.store_bytes(fig.getvalue(), Path(f["file"]).suffix)
+            stored.append({"id": f["id"], "hash": digest, "path": path.as_posix()})
+        artifacts["figures"] = stored
+
+        meta.update(status=STATUS_READY, artifacts=artifacts, error="")
+    except Exception as e:
+        logger.exception("Submission %s failed", submission_id)
+        meta.update(status=STATUS_FAILED, error=f"{type(e).__name__}: {e}")
+
+    meta["seconds"] = round(time.perf_counter() - t0, 3)
+    write_meta(folder, meta)
+    return meta
+
+
+class SpoolWorker:
+    """
+    Background pool that turns spooled submissions into artifacts.
+
+    submit() returns immediately; the Streamlit session only polls the
+    status in meta.json. On start, submissions left queued or half-done by
+    a previous process are picked up again.
+    """
+
+    def __init__(self, spool_dir: Path = SPOOL_DIR, max_workers: int = MAX_WORKERS):
+        self.spool_dir = Path(spool_dir)
+        self.pool = WorkerPool(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        for submission_id in pending_submissions(self.spool_dir):
+            self.submit(submission_id)
+
+    def submit(self, submission_id: str) -> Future:
+        """
+        Queue a submission; one that is already queued or running (e.g.
+        picked up on start) is not processed a second time.
+        """
+        with self._lock:
+            if submission_id in self._in_flight:
+                return self._in_flight[submission_id]
+            future = self.pool.submit(process_submission, submission_id, self.spool_dir)
+            self._in_flight[submission_id] = future
+        future.add_done_callback(lambda f, submission_id=submission_id: self._finished(submission_id, f))
+        return future
+
+    def _finished(self, submission_id: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(submission_id, None)
+        error = future.exception() if not future.cancelled() else None
+        if error is None:
+            return
+        # process_submission records its own failures; this is a crash of
+        # the job itself (e.g. a killed worker), which would stay "processing"
+        logger.error("Submission %s crashed: %s", submission_id, error)
+        folder = self.spool_dir / submission_id
+        try:
+            meta = read_meta(folder)
+            meta.update(status=STATUS_FAILED, error=f"{type(error).__name__}: {error}")
+            write_meta(folder, meta)
+        except (OSError, ValueError):
+            logger.exception("Could not record the failure of %s", submission_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait=wait)
+
+
+# -------------------------------------------------
+# MAIN EXECUTION
+# -------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Process or inspect the CataLogger submission spool.")
+    parser.add_argument("command", choices=["work", "status"])
+    parser.add_argument("--spool", type=Path, default=SPOOL_DIR)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    if args.command == "status":
+        for entry in sorted(args.spool.iterdir()) if args.spool.exists() else []:
+            if (entry / META_FILE).exists():
+                meta = read_meta(entry)
+                logger.info("%s: %s %s", meta["id"], meta["status"], meta.get("error", ""))
+        return
+
+    # Drain everything pending once (e.g. from cron, or after a crash).
+    pending = pending_submissions(args.spool)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(process_submission, pending, [args.spool] * len(pending)))
+    failed = [m for m in results if m["status"] == STATUS_FAILED]
+    logger.info("Processed %d submission(s), %d failed.", len(results), len(failed))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from resource_model import PLACEHOLDER, Resource
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+KEYWORDS = "tags"             # output folder names (OUTPUT_DOCS_DIR/<kind>/<key>.md)
+AUTHORS = "authors"
+AFFILIATIONS = "affiliations"
+KIND_TITLES = {KEYWORDS: "Keyword", AUTHORS: "Author", AFFILIATIONS: "Affiliation"}
+
+# Page names taken by the overview of each kind (<kind>/index.md)
+RESERVED_KEYS = {"index"}
+HASH_KEY_CHARS = 10           # hex digits of the key of non-ASCII tags
+
+# Endings that look plural but are not (class, campus, analysis)
+NON_PLURAL_ENDINGS = ("ss", "us", "is")
+
+
+# -------------------------------------------------
+# NORMALIZATION
+# -------------------------------------------------
+def _ascii_words(text: str) -> List[str]:
+    # casefold first, so "ß" becomes "ss" instead of being dropped
+    text = unicodedata.normalize("NFKD", str(text or "").casefold()).encode("ascii", "ignore").decode("ascii")
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def singular(word: str) -> str:
+    if len(word) <= 3 or word.endswith(NON_PLURAL_ENDINGS) or not word.endswith("s"):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes")):
+        return word[:-2]
+    return word[:-1]
+
+
+def _page_key(key: str, text: str) -> str:
+    """
+    A key usable as page slug. Text without ASCII letters or digits (e.g.
+    Hindi) gets a short hash of its normalized form instead of "", and keys
+    equal to a reserved name (the overview page) get the hash appended.
+    """
+    if key and key not in RESERVED_KEYS:
+        return key
+    norm = " ".join(unicodedata.normalize("NFKC", str(text or "")).casefold().split())
+    if not norm:
+        return ""
+    digest = hashlib.sha1(norm.encode("utf-8")).hexdigest()[:HASH_KEY_CHARS]
+    return f"{key}-{digest}" if key else f"u-{digest}"
+
+
+def tag_key(keyword: str) -> str:
+    """
+    "Aquifers", "aquifer" and "Aquifer " share one key (case, accents and
+    simple plural endings ignored); the key doubles as the page slug.
+    """
+    return _page_key("-".join(singular(w) for w in _ascii_words(keyword)), keyword)
+
+
+def person_key(name: str) -> str:
+    return _page_key("-".join(_ascii_words(name)), name)
+
+
+# -------------------------------------------------
+# INVERTED INDEX
+# -------------------------------------------------
+class TagEntry:
+    __slots__ = ("labels", "items")
+
+    def __init__(self):
+        self.labels: Counter = Counter()
+        # (title, page_id, detail page slug) of every resource with this tag
+        self.items: List[Tuple[str, str, str]] = []
+
+    @property
+    def label(self) -> str:
+        # the spelling most submissions used
+        return self.labels.most_common(1)[0][0]
+
+
+class TagIndex:
+    """
+    keyword / author / affiliation -> resources, filled in one pass over
+    the resources (each resource is visited once, each tag looked up in a
+    dict), instead of scanning every resource once per tag.
+    """
+
+    def __init__(self):
+        self.kinds: Dict[str, Dict[str, TagEntry]] = {KEYWORDS: {}, AUTHORS: {}, AFFILIATIONS: {}}
+
+    def add(self, resource: Resource, page_id: str, slug: str = "") -> None:
+        item = (resource.title, page_id, slug)
+        tags = [(KEYWORDS, tag_key(k), k) for k in resource.keywords]
+        for author in resource.authors:
+            tags.append((AUTHORS, person_key(author.name), author.name))
+            if author.affiliation not in (PLACEHOLDER, "N/A"):
+                tags.append((AFFILIATIONS, person_key(author.affiliation), author.affiliation))
+
+        seen = set()   # a tag listed twice on one resource (e.g. "Aquifer", "aquifers")
+        for kind, key, label in tags:
+            if not key or (kind, key) in seen:
+                continue
+            seen.add((kind, key))
+            entry = self.kinds[kind].get(key)
+            if entry is None:
+                entry = self.kinds[kind][key] = TagEntry()
+            entry.labels[label.strip()] += 1
+            entry.items.append(item)
+
+    def entries(self, kind: str) -> Iterator[Tuple[str, TagEntry]]:
+        return iter(sorted(self.kinds[kind].items(), key=lambda kv: kv[1].label.lower()))
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.kinds.values())
+
+
+# -------------------------------------------------
+# MARKDOWN
+# -------------------------------------------------
+def tag_page_body(
+    kind: str, entry: TagEntry, link: Callable[[str, str, str], str], overview_url: str
+) -> str:
+    md = f"# {KIND_TITLES[kind]}: {entry.label}\n\n"
+    md += f"[← All {KIND_TITLES[kind].lower()}s]({overview_url})\n\n"
+    md += f"{len(entry.items)} resource(s)\n\n"
+    for title, page_id, slug in sorted(entry.items, key=lambda i: (i[0].lower(), i[1], i[2])):
+        md += f"- [{title}]({link(title, page_id, slug)})\n"
+    return md + "\n"
+
+
+def overview_body(kind: str, index: TagIndex, page_link: Callable[[str], str]) -> str:
+    md = f"# {KIND_TITLES[kind]}s\n\n"
+    for key, entry in index.entries(kind):
+        md += f"- [{entry.label}]({page_link(key)}) ({len(entry.items)})\n"
+    return md + "\n"
@@ -0,0 +1,115 @@
+import os
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+MAX_FILE_MB = int(os.environ.get("CATALOGGER_MAX_FIGURE_MB", 15))        # per figure
+MAX_SESSION_MB = int(os.environ.get("CATALOGGER_MAX_UPLOAD_MB", 60))     # all figures of one submission
+MAX_FIGURES = 12
+MAX_PIXELS = 40_000_000          # width x height; a decoded RGBA image of this size is ~160 MB
+
+MB = 1024 * 1024
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (SOF0..SOF15 without DHT, JPG and DAC)
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+# -------------------------------------------------
+# IMAGE HEADERS
+# -------------------------------------------------
+def image_dimensions(fh: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    (width, height) of a PNG or JPEG from its header, without decoding it.
+    Reads a few bytes per JPEG segment (seeking over the rest) and leaves
+    the file position where it was. None if the header is not readable.
+    """
+    start = fh.tell()
+    try:
+        fh.seek(0)
+        head = fh.read(24)
+        if head.startswith(PNG_SIGNATURE) and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if not head.startswith(b"\xff\xd8"):
+            return None
+
+        fh.seek(2)
+        while True:
+            marker = fh.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            if marker[1] == 0xFF:                    # fill byte
+                fh.seek(-1, os.SEEK_CUR)
+                continue
+            if marker[1] in (0x01, *range(0xD0, 0xD8)):   # markers without a length
+                continue
+            length_bytes = fh.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack(">H", length_bytes)[0]
+            if marker[1] in JPEG_SOF_MARKERS:
+                frame = fh.read(5)
+                if len(frame) < 5:
+                    return None
+                height, width = struct.unpack(">HH", frame[1:5])
+                return width, height
+            fh.seek(length - 2, os.SEEK_CUR)
+    finally:
+        fh.seek(start)
+
+
+# -------------------------------------------------
+# GOVERNANCE
+# -------------------------------------------------
+def govern_uploads(
+    uploads: Sequence[Any], cache: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Any], List[Tuple[str, str]]]:
+    """
+    Check uploaded figures in order against the per-file size, pixel
+    count, file count and per-submission byte budget.
+
+    Returns (accepted, [(file name, reason)] of rejected files). With a
+    cache dict (e.g. in session_state) each upload is checked only once,
+    not on every rerun.
+    """
+    cache = {} if cache is None else cache
+    accepted: List[Any] = []
+    rejected: List[Tuple[str, str]] = []
+    budget = MAX_SESSION_MB * MB
+
+    for upload in uploads:
+        key = getattr(upload, "file_id", None) or f"{upload.name}:{upload.size}"
+        verdict = cache.get(key)
+        if verdict is None:
+            verdict = cache[key] = _check_upload(upload)
+        if isinstance(verdict, str):
+            rejected.append((upload.name, verdict))
+            continue
+        if len(accepted) >= MAX_FIGURES:
+            rejected.append((upload.name, f"only {MAX_FIGURES} figures can be attached to one resource"))
+            continue
+        if upload.size > budget:
+            rejected.append((upload.name, f"the figures together may not exceed {MAX_SESSION_MB} MB"))
+            continue
+        budget -= upload.size
+        accepted.append(upload)
+    return accepted, rejected
+
+
+def _check_upload(upload: Any):
+    """
+    True if the upload is accepted, else the reason for rejecting it.
+    """
+    if upload.size > MAX_FILE_MB * MB:
+        return f"the file is {upload.size / MB:.1f} MB; the limit is {MAX_FILE_MB} MB per figure"
+    dims = image_dimensions(upload)
+    if dims is None:
+        return "the file is not a readable PNG or JPEG image"
+    width, height = dims
+    if width * height > MAX_PIXELS:
+        return (
+            f"the image is {width} x {height} px ({width * height / 1e6:.0f} megapixels); "
+            f"please scale it below {MAX_PIXELS / 1e6:.0f} megapixels"
+        )
+    return True
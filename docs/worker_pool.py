@@ -0,0 +1,56 @@
+import multiprocessing
+import multiprocessing.util
+import sys
+import threading
+import types
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# -------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------
+# Forking a multithreaded server (Streamlit, WSGI) can deadlock the child on
+# a lock some other thread held; forkserver children start from a clean process.
+START_METHOD = "forkserver"
+
+_main_lock = threading.Lock()
+
+
+@contextmanager
+def plain_main() -> Iterator[None]:
+    """
+    Streamlit runs the app script as sys.modules["__main__"], and forkserver
+    or spawn children re-run __main__ from its file before they start, i.e.
+    would run the whole app. While worker processes are started, __main__
+    is an empty module instead.
+    """
+    with _main_lock:
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            if main is not None:
+                sys.modules["__main__"] = main
+
+
+class WorkerPool(ProcessPoolExecutor):
+    """
+    Process pool that is safe to create inside the Streamlit server: workers
+    come from a forkserver and never import the app script. Submitted
+    functions must live in an importable module (not in the app script).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, **kwargs: Any):
+        super().__init__(max_workers=max_workers, mp_context=multiprocessing.get_context(START_METHOD), **kwargs)
+        # A process that exits through multiprocessing (e.g. a pool worker
+        # hosting the app) joins its children before atexit handlers run;
+        # stop the workers first, while the call queue (finalized at
+        # priority 10) still feeds them, or that join waits forever.
+        multiprocessing.util.Finalize(self, self.shutdown, kwargs={"cancel_futures": True}, exitpriority=20)
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        # workers are started on demand, inside submit()
+        with plain_main():
+            return super().submit(fn, *args, **kwargs)